@@ -1,7 +1,14 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 
+from app.core.http_cache import (
+    PRIVATE_REVALIDATE,
+    etag_matches,
+    not_modified,
+    set_cache_headers,
+)
+from app.core.pagination import NEXT_CURSOR_HEADER
 from app.models.user import User
 from app.schemas.diary import DiaryCreate, DiaryResponse, DiaryUpdate
 from app.services.auth_service import get_current_user
@@ -10,6 +17,7 @@ from app.services.diary_service import (
     svc_delete_my_diary,
     svc_get_my_diary,
     svc_list_my_diaries,
+    svc_my_diaries_etag,
     svc_update_my_diary,
 )
 
@@ -39,28 +47,45 @@ async def create_diary(payload: DiaryCreate, current_user: CurrentUser):
     return to_response(diary)
 
 
+# 목록: offset 또는 cursor(keyset) 페이지네이션
+# 다음 페이지가 있으면 X-Next-Cursor 헤더로 커서를 내려줍니다.
+# ETag가 If-None-Match와 같으면 목록을 읽지 않고 304로 끝냅니다.
 @router.get("", response_model=list[DiaryResponse])
 async def list_my_diaries(
+    request: Request,
+    response: Response,
     current_user: CurrentUser,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="이전 응답의 X-Next-Cursor 값"),
 ):
-    diaries = await svc_list_my_diaries(
-        current_user=current_user, limit=limit, offset=offset
+    etag = await svc_my_diaries_etag(
+        current_user=current_user, limit=limit, offset=offset, cursor=cursor
+    )
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag, PRIVATE_REVALIDATE)
+
+    diaries, next_cursor = await svc_list_my_diaries(
+        current_user=current_user, limit=limit, offset=offset, cursor=cursor
     )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    set_cache_headers(response, etag, PRIVATE_REVALIDATE)
     return [to_response(d) for d in diaries]
 
 
 @router.get("/my", response_model=list[DiaryResponse])
 async def list_my_diaries_alias(
+    request: Request,
+    response: Response,
     current_user: CurrentUser,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="이전 응답의 X-Next-Cursor 값"),
 ):
-    diaries = await svc_list_my_diaries(
-        current_user=current_user, limit=limit, offset=offset
+    return await list_my_diaries(
+        request, response, current_user, limit=limit, offset=offset, cursor=cursor
     )
-    return [to_response(d) for d in diaries]
 
 
 @router.get("/{diary_id}", response_model=DiaryResponse)
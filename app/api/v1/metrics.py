@@ -0,0 +1,26 @@
+from fastapi import APIRouter
+
+from app.core.cache import catalog_cache
+from app.core.revocation import revocation_index
+from app.core.security import password_hash_pool
+from app.core.token_cache import token_cache
+from app.db.database import startup_timings
+from app.db.pool_metrics import pool_stats
+from app.db.routing import read_router
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+# 워커 프로세스 단위 운영 지표 (스키마 문서에는 노출하지 않음)
+# 인증이 없으므로 METRICS_ENABLED일 때만 앱에 등록됨 (app.main)
+@router.get("", include_in_schema=False)
+async def read_metrics():
+    return {
+        "password_hash_pool": password_hash_pool.stats(),
+        "token_cache": token_cache.stats(),
+        "revocation_index": revocation_index.stats(),
+        "catalog_cache": catalog_cache.stats(),
+        "db_pool": pool_stats(),
+        "db_startup_ms": startup_timings,
+        "db_routing": read_router.stats(),
+    }
@@ -1,7 +1,14 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 
+from app.core.http_cache import (
+    PRIVATE_REVALIDATE,
+    etag_matches,
+    not_modified,
+    set_cache_headers,
+)
+from app.core.pagination import NEXT_CURSOR_HEADER
 from app.models.user import User
 from app.schemas.bookmark import BookmarkResponse
 from app.schemas.quote import QuoteResponse
@@ -9,6 +16,7 @@ from app.services.auth_service import get_current_user
 from app.services.bookmark_service import (
     svc_add_bookmark,
     svc_list_my_bookmarks,
+    svc_my_bookmarks_etag,
     svc_remove_bookmark,
 )
 from app.services.quote_service import (
@@ -22,10 +30,12 @@ CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
 # 1) 랜덤 명언 (인증 필요)
+# 요청마다 다른 명언이 뽑히므로 ETag/304는 두지 않음 (공유 캐시 저장만 막음)
 @router.get("/random", response_model=QuoteResponse)
-async def get_random_quote(current_user: CurrentUser):
+async def get_random_quote(response: Response, current_user: CurrentUser):
     # 방법 A 적용: 서비스가 _current_user를 받으므로 위치 인자로 전달
     q = await svc_get_random_quote(current_user)
+    response.headers["Cache-Control"] = PRIVATE_REVALIDATE
     return QuoteResponse(id=q.id, content=q.content, author=q.author)
 
 
@@ -48,19 +58,32 @@ async def remove_bookmark(quote_id: int, current_user: CurrentUser):
     return
 
 
-# 4) 내 북마크 목록
+# 4) 내 북마크 목록 (offset 또는 cursor, 다음 페이지 커서는 X-Next-Cursor 헤더)
+# ETag가 If-None-Match와 같으면 목록을 읽지 않고 304로 끝냅니다.
 @router.get("/bookmarks", response_model=list[BookmarkResponse])
 async def list_my_bookmarks(
+    request: Request,
+    response: Response,
     current_user: CurrentUser,
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="이전 응답의 X-Next-Cursor 값"),
 ):
-    items = await svc_list_my_bookmarks(
-        current_user=current_user, limit=limit, offset=offset
+    etag = await svc_my_bookmarks_etag(
+        current_user=current_user, limit=limit, offset=offset, cursor=cursor
+    )
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag, PRIVATE_REVALIDATE)
+
+    items, next_cursor = await svc_list_my_bookmarks(
+        current_user=current_user, limit=limit, offset=offset, cursor=cursor
     )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    set_cache_headers(response, etag, PRIVATE_REVALIDATE)
     out: list[BookmarkResponse] = []
     for bm in items:
-        q = bm.quote  # prefetch_related("quote") 덕분에 N+1 방지
+        q = bm.quote  # select_related("quote") JOIN으로 함께 조회됨
         out.append(
             BookmarkResponse(
                 id=bm.id,
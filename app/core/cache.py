@@ -0,0 +1,298 @@
+# app/core/cache.py
+
+import importlib.util
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+
+from tortoise.models import Model
+
+from app.core.config import settings
+
+REDIS_AVAILABLE = importlib.util.find_spec("redis") is not None
+
+SUPPORTED_CACHE_BACKENDS = ("memory", "redis", "none")
+
+
+# ---------- 백엔드 ----------
+class CacheBackend(ABC):
+    """
+    바이트 값을 저장하는 최소 인터페이스. Redis 명령(GET/SET PX/INCR/DEL)과
+    같은 의미라서 redis.asyncio 클라이언트나 테스트용 가짜 객체로 바꿔 끼울 수 있습니다.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    @abstractmethod
+    async def set(
+        self, key: str, value: bytes, ttl: Optional[float] = None
+    ) -> None: ...
+
+    @abstractmethod
+    async def incr(self, key: str) -> int: ...
+
+    @abstractmethod
+    async def clear(self) -> None: ...
+
+    async def aclose(self) -> None:
+        """외부 연결을 가진 백엔드만 재정의 (앱 종료 시 호출)"""
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    프로세스 내 LRU + TTL. 워커 간 공유되지 않으므로 다른 프로세스(스크래퍼)의
+    버전 증가는 보이지 않고, 항목이 ttl 뒤 만료되면서 반영됩니다.
+    """
+
+    name = "memory"
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        # key → (value, 만료 시각 또는 None)
+        self._entries: "OrderedDict[str, Tuple[bytes, Optional[float]]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def incr(self, key: str) -> int:
+        value = int(await self.get(key) or 0) + 1
+        await self.set(key, str(value).encode())
+        return value
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"size": len(self._entries), "maxsize": self.maxsize}
+
+
+class RedisCacheBackend(CacheBackend):
+    """redis.asyncio.Redis 호환 클라이언트(워커/스크래퍼가 공유)."""
+
+    name = "redis"
+
+    def __init__(self, client: Any, prefix: str = "diary:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        # 소수 초 TTL도 잃지 않도록 밀리초 단위(PX)로 전달
+        px = max(1, int(ttl * 1000)) if ttl else None
+        await self.client.set(self.prefix + key, value, px=px)
+
+    async def incr(self, key: str) -> int:
+        return int(await self.client.incr(self.prefix + key))
+
+    async def clear(self) -> None:
+        # 운영 Redis를 통째로 비우지 않도록 prefix 키만 삭제
+        keys = [k async for k in self.client.scan_iter(match=self.prefix + "*")]
+        if keys:
+            await self.client.delete(*keys)
+
+    async def aclose(self) -> None:
+        # redis-py 5.0.1부터 aclose, 그 전에는 close
+        close = getattr(self.client, "aclose", None) or self.client.close
+        await close()
+
+
+def build_cache_backend(
+    backend: str = settings.CACHE_BACKEND,
+    *,
+    redis_url: str = settings.CACHE_REDIS_URL,
+    maxsize: int = settings.CACHE_MAXSIZE,
+) -> Optional[CacheBackend]:
+    if backend not in SUPPORTED_CACHE_BACKENDS:
+        raise ValueError(f"지원하지 않는 CACHE_BACKEND 입니다: {backend}")
+    if backend == "none":
+        return None
+    if backend == "redis":
+        if not REDIS_AVAILABLE:
+            raise RuntimeError(
+                "CACHE_BACKEND=redis를 쓰려면 redis 패키지가 필요합니다."
+            )
+        import redis.asyncio as redis
+
+        # 연결은 첫 명령에서 맺음 (import 시점에 네트워크를 타지 않음)
+        return RedisCacheBackend(redis.from_url(redis_url))
+    return MemoryCacheBackend(maxsize)
+
+
+# ---------- 카탈로그 캐시 ----------
+class CatalogCache:
+    """
+    스크래퍼가 쓸 때만 바뀌는 명언/질문 조회 결과 캐시.
+
+    키에 카탈로그 버전을 넣어(catalog:quote:<version>:id:3) 무효화는 버전 증가(bump)
+    한 번으로 끝납니다. 이전 버전 항목은 읽히지 않다가 TTL/LRU로 사라집니다.
+    버전 키가 없으면(최초/축출) 시각 기반 값으로 새로 시작해 옛 항목과 겹치지 않습니다.
+
+    값은 JSON으로 직렬화한 행(dict)이고, 모델로는 _init_from_db로 되돌립니다.
+    백엔드 오류는 요청을 실패시키지 않고 DB 조회로 넘어갑니다.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend], ttl_seconds: float):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.bumps = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None and self.ttl_seconds > 0
+
+    @staticmethod
+    def _version_key(catalog: str) -> str:
+        return f"catalog:{catalog}:version"
+
+    async def _current_version(self, catalog: str) -> int:
+        raw = await self.backend.get(self._version_key(catalog))
+        if raw is not None:
+            return int(raw)
+        version = time.time_ns()
+        await self.backend.set(self._version_key(catalog), str(version).encode())
+        return version
+
+    async def version(self, catalog: str) -> int:
+        if not self.enabled:
+            return 0
+        try:
+            return await self._current_version(catalog)
+        except Exception:
+            self.errors += 1
+            return 0
+
+    async def bump(self, catalog: str) -> int:
+        """카탈로그에 행이 추가/변경됐을 때 호출 (모든 캐시 항목을 한 번에 무효화)"""
+        if not self.enabled:
+            return 0
+        try:
+            # 없으면 먼저 초기화 (INCR이 1부터 시작해 옛 버전과 겹치지 않게)
+            await self._current_version(catalog)
+            version = await self.backend.incr(self._version_key(catalog))
+        except Exception:
+            self.errors += 1
+            return 0
+        self.bumps += 1
+        return version
+
+    async def get_or_load(
+        self, catalog: str, key: str, load: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        JSON으로 표현 가능한 값을 캐시에서 읽고, 없으면 load()로 채웁니다.
+        load()가 None을 돌려줘도 캐시합니다(없는 PK 반복 조회 방지).
+        """
+        if not self.enabled:
+            return await load()
+        try:
+            version = await self._current_version(catalog)
+            full_key = f"catalog:{catalog}:{version}:{key}"
+            raw = await self.backend.get(full_key)
+        except Exception:
+            # 백엔드 장애: 캐시 없이 DB에서 읽음
+            self.errors += 1
+            self.misses += 1
+            return await load()
+        if raw is not None:
+            self.hits += 1
+            return json.loads(raw)
+
+        self.misses += 1
+        value = await load()
+        try:
+            await self.backend.set(
+                full_key, json.dumps(value).encode(), self.ttl_seconds
+            )
+        except Exception:
+            self.errors += 1
+        return value
+
+    async def get_model(
+        self,
+        catalog: str,
+        key: str,
+        model: Type[Model],
+        load: Callable[[], Awaitable[Optional[Model]]],
+    ) -> Optional[Model]:
+        async def load_row() -> Optional[Dict[str, Any]]:
+            obj = await load()
+            return model_to_row(obj) if obj is not None else None
+
+        row = await self.get_or_load(catalog, key, load_row)
+        return row_to_model(model, row) if row is not None else None
+
+    async def get_models(
+        self,
+        catalog: str,
+        key: str,
+        model: Type[Model],
+        load: Callable[[], Awaitable[List[Model]]],
+    ) -> List[Model]:
+        async def load_rows() -> List[Dict[str, Any]]:
+            return [model_to_row(obj) for obj in await load()]
+
+        rows = await self.get_or_load(catalog, key, load_rows)
+        return [row_to_model(model, row) for row in rows]
+
+    async def clear(self) -> None:
+        if self.backend is not None:
+            await self.backend.clear()
+
+    async def aclose(self) -> None:
+        if self.backend is not None:
+            await self.backend.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name if self.backend else "none",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "errors": self.errors,
+            "bumps": self.bumps,
+            **(self.backend.stats() if self.backend else {}),
+        }
+
+
+def model_to_row(obj: Model) -> Dict[str, Any]:
+    # FK/날짜 컬럼이 없는 카탈로그 모델(Quote, Question) 전용
+    return {name: getattr(obj, name) for name in obj._meta.db_fields}
+
+
+def row_to_model(model: Type[Model], row: Dict[str, Any]) -> Model:
+    return model._init_from_db(**row)
+
+
+catalog_cache = CatalogCache(build_cache_backend(), settings.CACHE_TTL_SECONDS)
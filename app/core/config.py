@@ -16,6 +16,43 @@ class Settings(BaseSettings):
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
 
+    # 비밀번호 해시 방식/비용 (변경 시 다음 로그인에서 자동 재해싱)
+    PASSWORD_HASH_SCHEME: str = "bcrypt"  # "bcrypt" | "argon2"
+    BCRYPT_ROUNDS: int = 12
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 4
+
+    # 비밀번호 해싱 전용 스레드 풀 (대기열이 차면 503)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+
+    # 토큰 검증 캐시 (0이면 비활성화)
+    # TTL 동안은 사용자를 다시 읽지 않아 계정 비활성화가 그만큼 늦게 반영됨
+    TOKEN_CACHE_MAXSIZE: int = 10_000
+    TOKEN_CACHE_TTL_SECONDS: int = 60
+
+    # 토큰 폐기(로그아웃) 인덱스
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    REVOCATION_SYNC_INTERVAL_SECONDS: float = 5.0
+    # 증분 동기화 때 마지막 id 아래로 다시 훑는 폭: 동시 로그아웃으로 작은 id가
+    # 나중에 커밋돼도 놓치지 않도록 (동시 진행 중인 insert 수보다 넉넉하게)
+    REVOCATION_SYNC_OVERLAP_IDS: int = 1_000
+    # 그래도 창 밖으로 늦게 커밋된 행을 위한 안전망: 주기적 전체 재적재
+    REVOCATION_FULL_RELOAD_SECONDS: float = 600.0
+    BLACKLIST_PRUNE_INTERVAL_SECONDS: float = 600.0
+    BLACKLIST_PRUNE_BATCH_SIZE: int = 1_000
+
+    # 명언/질문 카탈로그 조회 캐시 (스크래퍼가 insert하면 버전 증가로 무효화)
+    CACHE_BACKEND: str = "memory"  # "memory" | "redis" | "none"
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    # memory 백엔드에서는 다른 프로세스(스크래퍼) 변경이 반영되기까지의 상한
+    CACHE_TTL_SECONDS: int = 600
+    CACHE_MAXSIZE: int = 10_000  # memory 백엔드 항목 수
+
+    # 랜덤 선택용 PK 풀 갱신 주기 (다른 프로세스의 insert 반영 지연 상한)
+    RANDOM_ID_POOL_TTL_SECONDS: int = 300
+
     # PostgreSQL DB 설정
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
@@ -25,6 +62,30 @@ class Settings(BaseSettings):
 
     DATABASE_URL: str = ""
 
+    # asyncpg 커넥션 풀 (워커 프로세스마다 따로 생김: 총 연결 수 = 워커 수 x MAX)
+    DB_POOL_MIN_SIZE: int = 2
+    DB_POOL_MAX_SIZE: int = 10
+    DB_POOL_MAX_QUERIES: int = 50_000  # 이만큼 쓴 연결은 새로 맺음
+    DB_POOL_MAX_INACTIVE_SECONDS: float = 300.0  # 유휴 연결 정리 (0이면 안 함)
+    DB_STATEMENT_CACHE_SIZE: int = 100  # 연결당 prepared statement 캐시
+    # PgBouncer transaction/statement pooling 뒤에서는 prepared statement 캐시를 끔
+    DB_PGBOUNCER_MODE: bool = False
+
+    # 운영 지표 GET /metrics (풀/캐시 내부 상태를 인증 없이 노출하므로 기본 꺼짐,
+    # 켤 때는 내부망/사이드카에서만 닿게 둘 것)
+    METRICS_ENABLED: bool = False
+
+    # DB 기동 방식
+    # - "development": 매 기동마다 generate_schemas (로컬 편의)
+    # - "production": 스키마는 aerich 마이그레이션에 맡기고, 풀 예열 + 버전 확인만
+    DB_STARTUP_MODE: str = "development"
+
+    # 읽기 전용 복제본 (비우면 모든 쿼리가 primary로). 계정/DB 이름은 primary와 같음
+    DB_REPLICA_HOST: str = ""
+    DB_REPLICA_PORT: str = ""  # 비우면 POSTGRES_PORT
+    # 사용자가 쓴 직후 이 시간 동안은 그 사용자의 읽기를 primary로 (복제 지연 상한)
+    DB_REPLICA_STICKY_SECONDS: float = 5.0
+
     class Config:
         case_sensitive = True
         env_file = ".env"  # .env 파일 사용
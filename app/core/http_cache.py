@@ -0,0 +1,48 @@
+# app/core/http_cache.py
+
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Response, status
+
+# 인증이 필요한 응답: 브라우저만 저장하고 매번 ETag로 재검증 (CDN/공유 캐시는 저장 금지)
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts: Any, weak: bool = False) -> str:
+    """
+    parts를 이어 붙인 sha256 앞 32자로 ETag를 만듭니다.
+    weak=True(W/)는 '의미상 같은 응답'이라는 뜻으로, 행 내용 대신 집계값
+    (개수, 최대 updated_at 등)에서 만든 태그에 씁니다.
+    """
+    raw = "\x1f".join("" if p is None else str(p) for p in parts)
+    tag = f'"{hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]}"'
+    return f"W/{tag}" if weak else tag
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 비교 (RFC 9110: 약한 비교, 여러 태그와 * 허용)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = _opaque(etag)
+    return any(_opaque(t) == target for t in if_none_match.split(","))
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    # 304에도 캐시 관련 헤더는 200과 같게 실어 보냄
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
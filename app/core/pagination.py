@@ -0,0 +1,34 @@
+# app/core/pagination.py
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List
+
+# 다음 페이지 커서를 내려주는 응답 헤더 (본문은 기존 list 응답 그대로 유지)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    keyset 페이지네이션용 불투명 커서.
+    마지막 행의 정렬 키(예: created_at, id)를 JSON → base64url 로 감쌉니다.
+    """
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """encode_cursor의 역변환. 형식이 맞지 않으면 ValueError."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, json.JSONDecodeError) as e:
+        raise ValueError("invalid cursor") from e
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("invalid cursor")
+    return values
@@ -0,0 +1,204 @@
+# app/core/revocation.py
+
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from typing import Iterable, List, Optional, Set
+
+from app.core.config import settings
+from app.core.token_cache import token_cache
+from app.models.token_blacklist import TokenBlacklist
+
+_LOAD_BATCH_SIZE = 10_000
+_MIN_CAPACITY = 10_000
+
+logger = logging.getLogger(__name__)
+
+
+def token_key(token_id: str) -> bytes:
+    """토큰 ID(jti)를 Bloom filter용 고정 길이 키(sha256 digest)로 변환."""
+    return hashlib.sha256(token_id.encode("utf-8")).digest()
+
+
+class BloomFilter:
+    """
+    sha256 digest 기반 double hashing Bloom filter.
+    false positive는 있어도 false negative는 없습니다.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.num_bits = max(
+            8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        )
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: bytes) -> Iterable[int]:
+        # key는 이미 균일 분포인 digest(token_key)라 그대로 쪼개 씁니다.
+        h1 = int.from_bytes(key[:8], "big")
+        h2 = int.from_bytes(key[8:16], "big") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: bytes) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: bytes) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class RevocationIndex:
+    """
+    로그아웃된 토큰의 인메모리 인덱스.
+    - 시작 시 token_blacklist 전체를 Bloom filter로 적재 (테이블 크기 기준으로 sizing)
+    - 이 워커의 로그아웃은 add()로 즉시 반영
+    - 전체 재적재 중의 add()는 따로 모아 두었다가 새 filter에 다시 넣고 교체
+    - 다른 워커의 로그아웃은 sync()가 id 증분으로 따라잡음
+      id는 커밋 순서와 다를 수 있어(동시 로그아웃) 매번 마지막 id 아래
+      overlap_ids 만큼을 다시 훑고, full_reload_seconds마다 전체를 다시 적재
+    Bloom filter에 없으면 확실히 폐기되지 않은 토큰이므로 DB 조회가 필요 없습니다.
+    적재 전(ready=False)에는 항상 DB 확인이 필요하다고 답합니다.
+    """
+
+    def __init__(self, error_rate: float, overlap_ids: int, full_reload_seconds: float):
+        self.error_rate = error_rate
+        self.overlap_ids = overlap_ids
+        self.full_reload_seconds = full_reload_seconds
+        self._bloom: Optional[BloomFilter] = None
+        self._last_id = 0
+        # 겹침 창 안에서 이미 반영한 id (다시 훑을 때 중복 add/카운트 방지)
+        self._recent_ids: Set[int] = set()
+        # load() 진행 중에 add()된 토큰 (스냅샷 이후 커밋이라 새 filter에 없을 수 있음)
+        self._added_during_load: Optional[List[str]] = None
+        self._loaded_at = 0.0
+        self.db_checks = 0
+        self.skipped_checks = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._bloom is not None
+
+    def reset(self) -> None:
+        self._bloom = None
+        self._last_id = 0
+        self._recent_ids = set()
+        self._added_during_load = None
+        self._loaded_at = 0.0
+        self.db_checks = 0
+        self.skipped_checks = 0
+
+    async def load(self) -> None:
+        added: List[str] = []
+        self._added_during_load = added
+        try:
+            count = await TokenBlacklist.all().count()
+            bloom = BloomFilter(max(count * 2, _MIN_CAPACITY), self.error_rate)
+            recent: Set[int] = set()
+            last_id = await self._consume(bloom, 0, 0, recent)
+            # 적재하는 동안 옛 filter에만 들어간 로그아웃을 새 filter에 옮긴 뒤 교체
+            # (여기서 교체까지는 await가 없어 그 사이 add()가 끼어들지 않음)
+            for token_id in added:
+                bloom.add(token_key(token_id))
+            self._bloom, self._last_id, self._recent_ids = bloom, last_id, recent
+            self._loaded_at = time.monotonic()
+        finally:
+            self._added_during_load = None
+
+    async def sync(self) -> None:
+        if (
+            self._bloom is None
+            or time.monotonic() - self._loaded_at >= self.full_reload_seconds
+        ):
+            await self.load()
+            return
+        floor = max(0, self._last_id - self.overlap_ids)
+        self._last_id = await self._consume(
+            self._bloom, floor, self._last_id, self._recent_ids, evict=True
+        )
+        # 설계 용량을 넘으면 오탐률이 올라가므로 테이블 크기에 맞춰 다시 적재
+        if self._bloom.count > self._bloom.capacity:
+            await self.load()
+
+    async def _consume(
+        self,
+        bloom: BloomFilter,
+        after_id: int,
+        last_id: int,
+        recent: Set[int],
+        *,
+        evict: bool = False,
+    ) -> int:
+        """
+        id > after_id 인 행을 bloom에 넣고 새 last_id를 돌려줍니다.
+        recent에 있는 id는 건너뛰고, 끝나면 겹침 창 밖의 id를 recent에서 뺍니다.
+        """
+        while True:
+            rows = (
+                await TokenBlacklist.filter(id__gt=after_id)
+                .order_by("id")
+                .limit(_LOAD_BATCH_SIZE)
+                .values_list("id", "jti")
+            )
+            for row_id, jti in rows:
+                after_id = row_id
+                if row_id in recent:
+                    continue
+                bloom.add(token_key(jti))
+                if evict:
+                    # 다른 워커에서 로그아웃된 토큰의 검증 캐시도 제거
+                    token_cache.invalidate_token_id(jti)
+                last_id = max(last_id, row_id)
+                if row_id > last_id - self.overlap_ids:
+                    recent.add(row_id)
+            if len(rows) < _LOAD_BATCH_SIZE:
+                break
+        floor = last_id - self.overlap_ids
+        recent.difference_update([i for i in recent if i <= floor])
+        return last_id
+
+    def add(self, token_id: str) -> None:
+        if self._added_during_load is not None:
+            self._added_during_load.append(token_id)
+        if self._bloom is not None:
+            self._bloom.add(token_key(token_id))
+
+    def might_be_revoked(self, token_id: str) -> bool:
+        if self._bloom is None or token_key(token_id) in self._bloom:
+            self.db_checks += 1
+            return True
+        self.skipped_checks += 1
+        return False
+
+    async def run(self, interval_seconds: float) -> None:
+        """lifespan에서 띄우는 백그라운드 루프: 최초 적재 후 주기적으로 증분 동기화."""
+        while True:
+            try:
+                await self.sync()
+            except Exception:
+                # 실패해도 루프는 유지 (적재 전이면 계속 DB 확인으로 동작)
+                logger.exception("토큰 폐기 인덱스 동기화 실패")
+            await asyncio.sleep(interval_seconds)
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "entries": self._bloom.count if self._bloom else 0,
+            "capacity": self._bloom.capacity if self._bloom else 0,
+            "db_checks": self.db_checks,
+            "skipped_checks": self.skipped_checks,
+        }
+
+
+revocation_index = RevocationIndex(
+    error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+    overlap_ids=settings.REVOCATION_SYNC_OVERLAP_IDS,
+    full_reload_seconds=settings.REVOCATION_FULL_RELOAD_SECONDS,
+)
@@ -1,7 +1,12 @@
 # app/core/security.py
 
+import asyncio
+import hashlib
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, TypeVar
 
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
@@ -22,7 +27,41 @@ REFRESH_TOKEN_EXPIRE_DAYS: int = getattr(settings, "REFRESH_TOKEN_EXPIRE_DAYS",
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 # 비밀번호 해싱 컨텍스트
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+SUPPORTED_PASSWORD_SCHEMES = ("bcrypt", "argon2")
+
+
+def build_pwd_context(
+    scheme: str = settings.PASSWORD_HASH_SCHEME,
+    *,
+    bcrypt_rounds: int = settings.BCRYPT_ROUNDS,
+    argon2_time_cost: int = settings.ARGON2_TIME_COST,
+    argon2_memory_cost: int = settings.ARGON2_MEMORY_COST,
+    argon2_parallelism: int = settings.ARGON2_PARALLELISM,
+) -> CryptContext:
+    """
+    scheme을 기본(신규 해시) 방식으로 두고, 나머지 방식은 검증만 가능하도록 남깁니다.
+    deprecated="auto" 이므로 다른 방식이거나 비용이 다른 해시는 needs_update()가 True.
+    """
+    if scheme not in SUPPORTED_PASSWORD_SCHEMES:
+        raise ValueError(f"지원하지 않는 PASSWORD_HASH_SCHEME 입니다: {scheme}")
+    if scheme == "argon2":
+        from passlib.handlers.argon2 import argon2
+
+        if not argon2.has_backend():
+            raise RuntimeError("argon2를 쓰려면 argon2-cffi 패키지가 필요합니다.")
+
+    schemes = [scheme] + [s for s in SUPPORTED_PASSWORD_SCHEMES if s != scheme]
+    return CryptContext(
+        schemes=schemes,
+        deprecated="auto",
+        bcrypt__rounds=bcrypt_rounds,
+        argon2__time_cost=argon2_time_cost,
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+
+pwd_context = build_pwd_context()
 
 
 # ===== Password helpers =====
@@ -36,6 +75,99 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """현재 설정(방식/비용)과 다른 해시인지 여부. 해시 계산 없이 파싱만 합니다."""
+    return pwd_context.needs_update(hashed_password)
+
+
+# ===== Password hashing worker pool =====
+T = TypeVar("T")
+
+
+class PasswordHasherBusy(Exception):
+    """해싱 대기열이 가득 차서 요청을 받을 수 없음."""
+
+
+class PasswordHashPool:
+    """
+    bcrypt 같은 CPU 집약 해싱을 이벤트 루프 밖의 전용 스레드 풀에서 실행합니다.
+    (bcrypt는 GIL을 풀기 때문에 스레드로도 병렬 실행됩니다.)
+    - max_workers: 동시에 해싱하는 스레드 수
+    - max_pending: 실행 중 + 대기 중 작업 상한, 넘으면 PasswordHasherBusy
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hash"
+        )
+        self.pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.peak_pending = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusy()
+
+        self.pending += 1
+        self.submitted += 1
+        self.peak_pending = max(self.peak_pending, self.pending)
+        queued_at = time.perf_counter()
+
+        def job():
+            started_at = time.perf_counter()
+            result = fn(*args)
+            return result, started_at - queued_at, time.perf_counter() - started_at
+
+        try:
+            loop = asyncio.get_running_loop()
+            result, waited, ran = await loop.run_in_executor(self._executor, job)
+        finally:
+            self.pending -= 1
+        self.completed += 1
+        self.total_wait_seconds += waited
+        self.total_run_seconds += ran
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        done = self.completed or 1
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "peak_pending": self.peak_pending,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.total_wait_seconds / done * 1000, 3),
+            "avg_run_ms": round(self.total_run_seconds / done * 1000, 3),
+        }
+
+
+password_hash_pool = PasswordHashPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash를 해싱 전용 풀에서 실행합니다."""
+    return await password_hash_pool.run(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password를 해싱 전용 풀에서 실행합니다."""
+    return await password_hash_pool.run(
+        verify_password, plain_password, hashed_password
+    )
+
+
 # ===== JWT helpers =====
 def create_access_token(
     data: Dict[str, Any], expires_delta: Optional[timedelta] = None
@@ -43,14 +175,26 @@ def create_access_token(
     """
     Access Token 생성.
     data 예: {"sub": "<user_id>"}
+    jti(짧은 랜덤 ID)를 함께 넣어 블랙리스트가 토큰 원문 대신 ID만 저장하게 합니다.
     """
     expire = datetime.now(timezone.utc) + (
         expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     )
-    to_encode = {**data, "exp": expire}
+    to_encode = {"jti": secrets.token_urlsafe(12), **data, "exp": expire}
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+def get_token_id(token: str, payload: Dict[str, Any]) -> str:
+    """
+    블랙리스트/캐시에서 쓰는 토큰 식별자.
+    jti가 없는 (이전 버전에서 발급된) 토큰은 원문의 sha256 hex로 대신합니다.
+    """
+    jti = payload.get("jti")
+    if jti:
+        return str(jti)
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
 def create_refresh_token(
     data: Dict[str, Any], expires_delta: Optional[timedelta] = None
 ) -> str:
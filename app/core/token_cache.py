@@ -0,0 +1,145 @@
+# app/core/token_cache.py
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.security import get_token_id
+from app.models.user import User
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """인증 의존성이 필요로 하는 최소한의 사용자 정보(비밀번호 해시 제외)."""
+
+    id: int
+    username: str
+    email: str
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            is_active=user.is_active,
+        )
+
+    def to_user(self) -> User:
+        """
+        스냅샷으로 partial User 인스턴스를 만듭니다.
+        `.only()`로 조회한 객체와 같은 상태라 FK 대입은 가능하지만,
+        update_fields 없이 save() 하면 IncompleteInstanceError가 납니다.
+        """
+        return User._init_from_db(
+            id=self.id,
+            username=self.username,
+            email=self.email,
+            is_active=self.is_active,
+        )
+
+
+@dataclass(frozen=True)
+class CachedToken:
+    token_id: str  # jti (블랙리스트 키)
+    payload: Dict[str, Any]
+    user: UserSnapshot
+    expires_at: float  # epoch seconds, 토큰 exp를 넘지 않음
+
+
+class TokenVerificationCache:
+    """
+    검증이 끝난 access token → (payload, 사용자 스냅샷) 을 보관하는 프로세스 내 캐시.
+    - 키는 토큰 원문이 아니라 sha256 digest
+    - 크기 제한(LRU) + TTL, 만료 시각은 min(now + ttl, exp)
+    - 로그아웃 시 invalidate_* 로 즉시 제거
+    워커 간 공유되지 않으므로 다른 워커의 무효화는 최대 TTL 만큼 늦게 반영됩니다.
+    사용자 스냅샷도 TTL 동안 다시 읽지 않으므로, DB에서 계정을 비활성화해도
+    이미 캐시된 토큰은 모든 워커에서 최대 TTL(기본 60초)까지 계속 통과합니다.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, CachedToken]" = OrderedDict()
+        self._key_by_token_id: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[CachedToken]:
+        key = self.digest(token)
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.time():
+            self._discard(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, token: str, payload: Dict[str, Any], user: User) -> None:
+        if self.maxsize <= 0 or self.ttl_seconds <= 0:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        exp = payload.get("exp")
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+
+        key = self.digest(token)
+        token_id = get_token_id(token, payload)
+        self._discard(key)
+        self._entries[key] = CachedToken(
+            token_id=token_id,
+            payload=payload,
+            user=UserSnapshot.from_user(user),
+            expires_at=expires_at,
+        )
+        self._key_by_token_id[token_id] = key
+        while len(self._entries) > self.maxsize:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+
+    def invalidate_token(self, token: str) -> None:
+        self._discard(self.digest(token))
+
+    def invalidate_token_id(self, token_id: str) -> None:
+        key = self._key_by_token_id.get(token_id)
+        if key is not None:
+            self._discard(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._key_by_token_id.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._key_by_token_id.pop(entry.token_id, None)
+
+
+token_cache = TokenVerificationCache(
+    maxsize=settings.TOKEN_CACHE_MAXSIZE,
+    ttl_seconds=settings.TOKEN_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,54 @@
+"""
+Tortoise engine 모듈: asyncpg 클라이언트에 풀 대기 시간/포화도 계측을 붙입니다.
+
+TORTOISE_ORM의 "engine": "app.db.asyncpg_pool" 로 지정하면 Tortoise가
+client_class를 가져다 씁니다. 풀 설정은 credentials(minsize, maxsize, max_queries,
+max_inactive_connection_lifetime, statement_cache_size)로 asyncpg에 그대로 전달됩니다.
+"""
+
+from typing import Any, Optional
+
+from tortoise.backends.asyncpg.client import AsyncpgDBClient
+
+from app.db.pool_metrics import PoolMetrics, pool_metrics
+
+
+class InstrumentedPool:
+    """
+    asyncpg.Pool 대리 객체. Tortoise는 쿼리/트랜잭션 모두 pool.acquire()/release()로
+    커넥션을 빌리므로 이 두 곳만 감싸면 모든 대기를 잴 수 있습니다.
+    """
+
+    def __init__(self, pool: Any, metrics: PoolMetrics):
+        self._pool = pool
+        self._metrics = metrics
+
+    async def acquire(self, *, timeout: Optional[float] = None) -> Any:
+        started = self._metrics.started_waiting()
+        try:
+            connection = await self._pool.acquire(timeout=timeout)
+        except BaseException:
+            self._metrics.acquire_failed()
+            raise
+        self._metrics.acquired(started)
+        return connection
+
+    async def release(self, connection: Any, *, timeout: Optional[float] = None):
+        try:
+            await self._pool.release(connection, timeout=timeout)
+        finally:
+            self._metrics.released()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pool, name)
+
+
+class InstrumentedAsyncpgClient(AsyncpgDBClient):
+    async def create_pool(self, **kwargs) -> Any:
+        pool = await super().create_pool(**kwargs)
+        metrics = pool_metrics.setdefault(self.connection_name, PoolMetrics())
+        metrics.bind(pool, self.pool_maxsize)
+        return InstrumentedPool(pool, metrics)
+
+
+client_class = InstrumentedAsyncpgClient
@@ -1,23 +1,57 @@
-import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
 
-from dotenv import load_dotenv
-from tortoise import Tortoise
+from tortoise import Tortoise, connections
 
-# .env 파일에서 환경 변수 로드
-load_dotenv()
+from app.core.config import settings
 
-POSTGRES_USER = os.getenv("POSTGRES_USER")
-POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD")
-POSTGRES_HOST = os.getenv("POSTGRES_HOST")
-POSTGRES_PORT = os.getenv("POSTGRES_PORT")
-POSTGRES_DB = os.getenv("POSTGRES_DB")
+# aerich 마이그레이션 파일 위치 (pyproject의 [tool.aerich] location + 앱 이름)
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations" / "models"
+
+
+def db_credentials(host: Optional[str] = None, port: Optional[str] = None) -> dict:
+    """
+    asyncpg 풀 설정까지 담은 Tortoise credentials.
+    (URL 형식으로는 풀 크기 외 옵션을 넘길 수 없어 dict 형식 사용)
+    """
+    return {
+        "host": host or settings.POSTGRES_HOST,
+        "port": int(port or settings.POSTGRES_PORT),
+        "user": settings.POSTGRES_USER,
+        "password": settings.POSTGRES_PASSWORD,
+        "database": settings.POSTGRES_DB,
+        "minsize": settings.DB_POOL_MIN_SIZE,
+        "maxsize": settings.DB_POOL_MAX_SIZE,
+        "max_queries": settings.DB_POOL_MAX_QUERIES,
+        "max_inactive_connection_lifetime": settings.DB_POOL_MAX_INACTIVE_SECONDS,
+        # PgBouncer는 연결을 세션 간에 돌려 쓰므로 이름 있는 prepared statement를 못 씀
+        "statement_cache_size": (
+            0 if settings.DB_PGBOUNCER_MODE else settings.DB_STATEMENT_CACHE_SIZE
+        ),
+    }
 
-# 데이터베이스 URL 생성
-db_url = f"postgres://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
 
 TORTOISE_ORM = {
     "connections": {
-        "default": db_url  # 여기서 정의한 db_url 사용
+        "default": {
+            # 풀 대기 시간/포화도 계측이 붙은 asyncpg 클라이언트
+            "engine": "app.db.asyncpg_pool",
+            "credentials": db_credentials(),
+        },
+        # 읽기 전용 복제본: app.db.routing.read_db()로 고른 조회만 여기로 감
+        **(
+            {
+                "replica": {
+                    "engine": "app.db.asyncpg_pool",
+                    "credentials": db_credentials(
+                        settings.DB_REPLICA_HOST, settings.DB_REPLICA_PORT
+                    ),
+                }
+            }
+            if settings.DB_REPLICA_HOST
+            else {}
+        ),
     },
     "apps": {
         "models": {
@@ -29,6 +63,7 @@ TORTOISE_ORM = {
                 "app.models.bookmark",
                 "app.models.question",
                 "app.models.user_question",
+                "app.models.question_deck",
                 "aerich.models",
             ],
             "default_connection": "default",
@@ -37,13 +72,98 @@ TORTOISE_ORM = {
 }
 
 
-async def init_db():
+# ---------- 기동 ----------
+class MigrationMismatch(RuntimeError):
+    pass
+
+
+# 마지막 기동의 단계별 소요 시간(ms), /metrics에 노출
+startup_timings: Dict[str, float] = {}
+
+
+def _migration_number(version: str) -> int:
+    # "14_20261018140000_update.py" → 14
+    return int(version.split("_", 1)[0])
+
+
+def latest_migration(directory: Path = MIGRATIONS_DIR) -> Optional[str]:
+    files = [p.name for p in directory.glob("*.py") if p.name[0].isdigit()]
+    return max(files, key=_migration_number) if files else None
+
+
+async def check_migrations(directory: Path = MIGRATIONS_DIR) -> str:
+    """
+    DB에 적용된 aerich 버전이 코드의 마지막 마이그레이션보다 뒤처져 있으면 기동 실패.
+    (DB가 더 앞선 경우는 롤링 배포 중 구버전 워커일 수 있어 경고만 출력)
+    """
+    expected = latest_migration(directory)
+    conn = connections.get("default")
+    try:
+        _, rows = await conn.execute_query(
+            "SELECT version FROM aerich WHERE app = 'models' ORDER BY id DESC LIMIT 1"
+        )
+    except Exception as e:
+        raise MigrationMismatch(
+            f"aerich 테이블 조회 실패 (aerich upgrade 필요): {e}"
+        ) from e
+    applied = rows[0]["version"] if rows else None
+    if expected is None:
+        return applied or "-"
+    if applied is None or _migration_number(applied) < _migration_number(expected):
+        raise MigrationMismatch(
+            f"DB 마이그레이션 {applied or '없음'} < 코드 {expected}: "
+            "aerich upgrade 필요"
+        )
+    if _migration_number(applied) > _migration_number(expected):
+        print(f"⚠️ DB 마이그레이션({applied})이 코드({expected})보다 앞서 있습니다")
+    return applied
+
+
+async def _init_production() -> None:
+    """
+    스키마 생성 없이 풀만 열고 마이그레이션 버전을 확인합니다.
+    카탈로그 조회가 없어 워커가 동시에 떠도 DB에 몰리지 않고,
+    aerich 마이그레이션과 경합하지 않습니다.
+    """
+    started = time.perf_counter()
+
+    def lap(phase: str) -> None:
+        nonlocal started
+        now = time.perf_counter()
+        startup_timings[phase] = round((now - started) * 1000, 1)
+        started = now
+
+    await Tortoise.init(config=TORTOISE_ORM)
+    lap("init")
+    # 첫 쿼리에서 asyncpg 풀이 생기며 minsize만큼 연결을 미리 맺음 (복제본 포함)
+    for alias in TORTOISE_ORM["connections"]:
+        await connections.get(alias).execute_query("SELECT 1")
+    lap("pool_warmup")
+    version = await check_migrations()
+    lap("migration_check")
+
+    total = sum(startup_timings.values())
+    startup_timings["total"] = round(total, 1)
+    phases = ", ".join(f"{k} {v}ms" for k, v in startup_timings.items())
+    print(f"✅ DB 기동 완료 (production, migration {version}): {phases}")
+
+
+async def init_db(mode: Optional[str] = None):
     """
-    Tortoise ORM으로 DB 연결 초기화 및 스키마 생성
+    Tortoise ORM으로 DB 연결 초기화.
+    development는 스키마까지 생성하고, production은 _init_production 참고.
     """
+    mode = mode or settings.DB_STARTUP_MODE
+    startup_timings.clear()
+    if mode == "production":
+        # 운영에서는 실패를 삼키지 않음: 잘못된 스키마로 트래픽을 받지 않도록
+        await _init_production()
+        return
     try:
+        started = time.perf_counter()
         await Tortoise.init(config=TORTOISE_ORM)
         await Tortoise.generate_schemas()
+        startup_timings["total"] = round((time.perf_counter() - started) * 1000, 1)
         print("✅ 데이터베이스 연결 및 스키마 생성 완료")
     except Exception as e:
         print(f"데이터베이스 연결 초기화 실패: {e}")
@@ -0,0 +1,79 @@
+import time
+from typing import Any, Dict, Optional
+
+# 이 시간보다 오래 기다린 acquire는 '느린 대기'로 따로 셈
+SLOW_ACQUIRE_SECONDS = 0.1
+
+
+class PoolMetrics:
+    """
+    커넥션 풀 하나의 대기 시간/포화도 지표 (워커 프로세스 단위).
+    acquire 대기 시간이 늘거나 in_use가 max_size에 붙어 있으면
+    풀이 작다는 뜻입니다.
+    """
+
+    def __init__(self):
+        self.max_size = 0
+        self.acquires = 0
+        self.slow_acquires = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.waiting = 0
+        self.peak_waiting = 0
+        self._pool: Optional[Any] = None
+
+    def bind(self, pool: Any, max_size: int) -> None:
+        self._pool = pool
+        self.max_size = max_size
+
+    def started_waiting(self) -> float:
+        self.waiting += 1
+        self.peak_waiting = max(self.peak_waiting, self.waiting)
+        return time.perf_counter()
+
+    def acquired(self, started: float) -> None:
+        wait = time.perf_counter() - started
+        self.waiting -= 1
+        self.acquires += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        if wait >= SLOW_ACQUIRE_SECONDS:
+            self.slow_acquires += 1
+        self.in_use += 1
+        self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def acquire_failed(self) -> None:
+        self.waiting -= 1
+
+    def released(self) -> None:
+        self.in_use -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_size": self.max_size,
+            "size": self._pool.get_size() if self._pool else 0,
+            "idle": self._pool.get_idle_size() if self._pool else 0,
+            "in_use": self.in_use,
+            "peak_in_use": self.peak_in_use,
+            "saturation": round(self.in_use / self.max_size, 3) if self.max_size else 0,
+            "waiting": self.waiting,
+            "peak_waiting": self.peak_waiting,
+            "acquires": self.acquires,
+            "slow_acquires": self.slow_acquires,
+            "avg_wait_ms": (
+                round(self.total_wait / self.acquires * 1000, 3)
+                if self.acquires
+                else 0.0
+            ),
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+        }
+
+
+# 연결 이름("default" 등)별 지표
+pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: m.stats() for name, m in pool_metrics.items()}
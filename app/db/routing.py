@@ -0,0 +1,91 @@
+"""
+읽기 전용 복제본 라우팅.
+
+목록/조회 같은 읽기는 read_db()가 준 연결로 using_db 해서 복제본으로 보내고,
+쓰기는 항상 primary("default")로 갑니다. 복제는 비동기라 방금 쓴 행이 복제본에
+아직 없을 수 있으므로, 사용자가 쓰면 mark_write()로 DB_REPLICA_STICKY_SECONDS 동안
+그 사용자의 읽기를 primary에 붙여둡니다 (read-your-writes).
+
+스티키 상태는 워커 프로세스 단위입니다. 다른 워커로 간 요청은 복제 지연만큼
+이전 상태를 볼 수 있으니, 지연이 창보다 길어지면 DB_REPLICA_STICKY_SECONDS를 늘리세요.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from tortoise import connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+from app.core.config import settings
+
+REPLICA = "replica"
+
+
+class ReadRouter:
+    def __init__(self):
+        # user_id → 스티키 만료 시각. 창 길이가 같아 뒤에 넣을수록 늦게 만료됨
+        self._sticky: "OrderedDict[int, float]" = OrderedDict()
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.sticky_reads = 0
+
+    @staticmethod
+    def enabled() -> bool:
+        return bool(settings.DB_REPLICA_HOST)
+
+    def mark_write(self, user_id: Optional[int]) -> None:
+        if user_id is None or not self.enabled():
+            return
+        self._sticky[user_id] = time.monotonic() + settings.DB_REPLICA_STICKY_SECONDS
+        self._sticky.move_to_end(user_id)
+
+    def _prune(self, now: float) -> None:
+        while self._sticky:
+            user_id, expires = next(iter(self._sticky.items()))
+            if expires > now:
+                break
+            del self._sticky[user_id]
+
+    def is_sticky(self, user_id: int) -> bool:
+        now = time.monotonic()
+        self._prune(now)
+        return self._sticky.get(user_id, 0.0) > now
+
+    def read_db(self, user_id: Optional[int] = None) -> Optional[BaseDBAsyncClient]:
+        """
+        읽기에 쓸 연결. None이면 모델 기본 연결(primary)을 쓰면 됩니다.
+        (QuerySet.using_db(None)은 기본 연결을 유지)
+        """
+        if not self.enabled():
+            self.primary_reads += 1
+            return None
+        if user_id is not None and self.is_sticky(user_id):
+            self.sticky_reads += 1
+            return None
+        self.replica_reads += 1
+        return connections.get(REPLICA)
+
+    def reset(self) -> None:
+        self._sticky.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        self._prune(time.monotonic())
+        return {
+            "enabled": self.enabled(),
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "sticky_reads": self.sticky_reads,
+            "sticky_users": len(self._sticky),
+        }
+
+
+read_router = ReadRouter()
+
+
+def read_db(user_id: Optional[int] = None) -> Optional[BaseDBAsyncClient]:
+    return read_router.read_db(user_id)
+
+
+def mark_write(user_id: Optional[int]) -> None:
+    read_router.mark_write(user_id)
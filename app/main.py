@@ -1,25 +1,58 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from tortoise import Tortoise
 
 # 프로젝트의 API 라우터들을 임포트합니다.
-from app.api.v1 import auth, diary, question, quote
+from app.api.v1 import auth, diary, metrics, question, quote
+from app.core.cache import catalog_cache
 from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.revocation import revocation_index
 
 # 사용자 기존의 database.py 파일에서 init_db 함수를 임포트
 from app.db.database import init_db
+from app.services.auth_service import run_blacklist_pruner
 
-app = FastAPI(
-    title=settings.PROJECT_NAME, openapi_url=f"{settings.API_V1_STR}/openapi.json"
-)
 
-
-# DB 연결 및 초기화
-@app.on_event("startup")
-async def startup_event():
+# DB 연결 및 초기화 + 백그라운드 작업 수명 관리
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
     print("DB 연결 중...")
     await init_db()
     print("DB 연결 완료")
 
+    # 토큰 폐기 인덱스: 적재가 끝나기 전까지는 DB 조회로 동작하므로 기동을 막지 않음
+    revocation_task = asyncio.create_task(
+        revocation_index.run(settings.REVOCATION_SYNC_INTERVAL_SECONDS)
+    )
+    # 만료된 블랙리스트 정리: 테이블 크기가 활성 세션 수를 따라가도록 유지
+    prune_task = asyncio.create_task(
+        run_blacklist_pruner(
+            settings.BLACKLIST_PRUNE_INTERVAL_SECONDS,
+            settings.BLACKLIST_PRUNE_BATCH_SIZE,
+        )
+    )
+    try:
+        yield
+    finally:
+        revocation_task.cancel()
+        prune_task.cancel()
+        # 취소가 실제로 끝날 때까지 기다린 뒤(진행 중인 쿼리 포함) DB 연결을 닫음
+        await asyncio.gather(revocation_task, prune_task, return_exceptions=True)
+        await Tortoise.close_connections()
+        # Redis 캐시 백엔드의 연결 풀 정리 (memory 백엔드는 할 일 없음)
+        await catalog_cache.aclose()
+
+
+app = FastAPI(
+    title=settings.PROJECT_NAME,
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
+)
+
 
 # CORS 미들웨어 추가: 프론트엔드와 백엔드 간 통신을 허용합니다.
 app.add_middleware(
@@ -28,6 +61,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 커서 페이지네이션/조건부 요청 헤더를 브라우저 JS에 노출
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 # API 라우터 포함: 각 기능별 API 엔드포인트를 등록합니다.
@@ -35,6 +70,8 @@ app.include_router(auth.router, prefix=settings.API_V1_STR)
 app.include_router(diary.router, prefix=settings.API_V1_STR)
 app.include_router(quote.router, prefix=settings.API_V1_STR)
 app.include_router(question.router, prefix=settings.API_V1_STR)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router, prefix=settings.API_V1_STR)
 
 
 @app.get("/")
@@ -19,3 +19,5 @@ class Bookmark(Model):
     class Meta:
         table = "bookmarks"
         unique_together = ("user", "quote")  # 중복 북마크 방지
+        # 내 북마크 목록 keyset 페이지네이션: (user_id, id DESC)
+        indexes = (("user_id", "id"),)
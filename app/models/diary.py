@@ -19,3 +19,5 @@ class Diary(Model):
 
     class Meta:
         table = "diaries"
+        # 내 일기 목록 keyset 페이지네이션: (user_id, created_at DESC, id DESC)
+        indexes = (("user_id", "created_at", "id"),)
@@ -7,6 +7,8 @@ from tortoise.models import Model
 class Question(Model):
     id = fields.IntField(primary_key=True)
     question_text = fields.TextField(null=False)
+    # 정규화한 question_text의 sha256 (app.scraping.normalize.text_hash)
+    text_hash = fields.CharField(max_length=64, null=True, unique=True)
 
     def __str__(self):
         return self.question_text
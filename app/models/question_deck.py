@@ -0,0 +1,25 @@
+from tortoise import fields
+from tortoise.models import Model
+
+from app.models.user import User
+
+
+class QuestionDeck(Model):
+    """
+    사용자별로 섞어 둔 질문 덱.
+    질문 목록 전체의 순열을 seed로만 저장하고, position으로 다음 카드를 가리킵니다.
+    """
+
+    id = fields.IntField(primary_key=True)
+    user: fields.OneToOneRelation[User] = fields.OneToOneField(
+        "models.User", related_name="question_deck", on_delete=fields.CASCADE
+    )
+    seed = fields.BigIntField()
+    # 덱을 섞을 당시의 질문 수 (바뀌면 다시 섞음)
+    size = fields.IntField()
+    # 덱을 섞을 당시의 최대 질문 id: 개수가 같은 채 삭제+추가돼도 바뀌므로 같이 비교
+    max_id = fields.IntField(default=0)
+    position = fields.IntField(default=0)
+
+    class Meta:
+        table = "question_decks"
@@ -8,6 +8,8 @@ class Quote(Model):
     id = fields.IntField(primary_key=True)
     content = fields.TextField(null=False)
     author = fields.CharField(max_length=100)
+    # 정규화한 content + author의 sha256 (app.scraping.normalize.text_hash)
+    content_hash = fields.CharField(max_length=64, null=True, unique=True)
 
     def __str__(self):
         return self.author
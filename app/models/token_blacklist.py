@@ -7,15 +7,17 @@ from app.models.user import User
 class TokenBlacklist(Model):
     """
     로그아웃된 JWT 토큰을 저장하여 보안을 강화합니다.
+    토큰 원문 대신 jti(없으면 원문 sha256 hex)만 저장합니다.
     """
 
     id = fields.IntField(primary_key=True)
-    token = fields.CharField(max_length=500, unique=True, null=False)
+    jti = fields.CharField(max_length=64, unique=True, null=False)
     # 아래 라인의 "models.User"를 "app.models.User"로 변경합니다.
     user: fields.ForeignKeyRelation[User] = fields.ForeignKeyField(
         "models.User", related_name="token_blacklist"
     )
-    expired_at = fields.DatetimeField(null=False)
+    # 만료된 행은 주기적으로 정리(prune)되므로 인덱스를 둡니다.
+    expired_at = fields.DatetimeField(null=False, db_index=True)
 
     class Meta:
         table = "token_blacklist"
@@ -1,5 +1,8 @@
-from typing import Optional
+from typing import Optional, Tuple
 
+from tortoise.functions import Count, Max
+
+from app.db.routing import mark_write, read_db
 from app.models.bookmark import Bookmark
 
 
@@ -14,20 +17,46 @@ async def create_bookmark(user_id: int, quote_id: int) -> Bookmark:
     existing = await get_bookmark_by_user_and_quote(user_id, quote_id)
     if existing:
         return existing
-    return await Bookmark.create(user_id=user_id, quote_id=quote_id)
+    bookmark = await Bookmark.create(user_id=user_id, quote_id=quote_id)
+    mark_write(user_id)
+    return bookmark
 
 
 async def delete_bookmark(user_id: int, quote_id: int) -> None:
     await Bookmark.filter(user_id=user_id, quote_id=quote_id).delete()
+    mark_write(user_id)
+
+
+async def bookmark_list_stamp(user_id: int) -> Tuple[int, Optional[int]]:
+    """
+    (개수, 최대 id). 북마크는 추가(새 id)와 삭제(개수)만 있으므로
+    목록 ETag의 재료로 충분합니다.
+    """
+    row = await (
+        Bookmark.filter(user_id=user_id)
+        .using_db(read_db(user_id))
+        .annotate(count=Count("id"), last=Max("id"))
+        .first()
+        .values("count", "last")
+    )
+    return row["count"], row["last"]
 
 
 async def list_bookmarks_for_user(
-    user_id: int, *, limit: int = 50, offset: int = 0
+    user_id: int,
+    *,
+    limit: int = 50,
+    offset: int = 0,
+    before_id: Optional[int] = None,
 ) -> list[Bookmark]:
-    return (
-        await Bookmark.filter(user_id=user_id)
-        .prefetch_related("quote")
-        .order_by("-id")
-        .offset(offset)
-        .limit(limit)
-    )
+    """
+    최신순 목록. before_id가 주어지면 offset 대신 keyset(id < before_id)으로 읽습니다.
+    quote는 select_related(JOIN)로 함께 가져와 페이지당 쿼리 1번으로 끝납니다.
+    읽기 복제본으로 가되, 방금 북마크를 바꾼 사용자는 primary에서 읽습니다.
+    """
+    qs = Bookmark.filter(user_id=user_id).using_db(read_db(user_id))
+    if before_id is not None:
+        qs = qs.filter(id__lt=before_id)
+    elif offset:
+        qs = qs.offset(offset)
+    return await qs.select_related("quote").order_by("-id").limit(limit)
@@ -1,11 +1,18 @@
-from typing import Iterable, Optional
+from datetime import datetime
+from typing import Any, Iterable, Optional, Tuple
 
+from tortoise.expressions import Q
+from tortoise.functions import Count, Max
+
+from app.db.routing import mark_write, read_db
 from app.models.diary import Diary
 from app.models.user import User
 
 
 async def create_diary(*, user: User, title: str, content: str) -> Diary:
-    return await Diary.create(user=user, title=title, content=content)
+    diary = await Diary.create(user=user, title=title, content=content)
+    mark_write(user.id)
+    return diary
 
 
 async def get_diary_by_id_for_user(diary_id: int, user_id: int) -> Optional[Diary]:
@@ -14,14 +21,41 @@ async def get_diary_by_id_for_user(diary_id: int, user_id: int) -> Optional[Diar
 
 
 async def list_diaries_for_user(
-    user_id: int, *, limit: int = 20, offset: int = 0
+    user_id: int,
+    *,
+    limit: int = 20,
+    offset: int = 0,
+    after: Optional[Tuple[datetime, int]] = None,
 ) -> Iterable[Diary]:
-    return (
-        await Diary.filter(user_id=user_id)
-        .order_by("-created_at")
-        .offset(offset)
-        .limit(limit)
+    """
+    최신순 목록. after=(created_at, id)가 주어지면 offset 대신 keyset 조건으로
+    그 다음 행부터 읽습니다. (user_id, created_at, id) 인덱스로 페이지 깊이와
+    무관하게 같은 비용이 듭니다. 읽기 복제본으로 가되, 방금 쓴 사용자는 primary.
+    """
+    qs = Diary.filter(user_id=user_id).using_db(read_db(user_id))
+    if after is not None:
+        created_at, diary_id = after
+        qs = qs.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=diary_id)
+        )
+    elif offset:
+        qs = qs.offset(offset)
+    return await qs.order_by("-created_at", "-id").limit(limit)
+
+
+async def diary_list_stamp(user_id: int) -> Tuple[int, Any]:
+    """
+    (개수, 최대 updated_at). 생성/수정/삭제 중 하나라도 있으면 값이 바뀌므로
+    목록 ETag의 재료로 씁니다. 같은 (user_id, ...) 인덱스 범위만 읽습니다.
+    """
+    row = await (
+        Diary.filter(user_id=user_id)
+        .using_db(read_db(user_id))
+        .annotate(count=Count("id"), last=Max("updated_at"))
+        .first()
+        .values("count", "last")
     )
+    return row["count"], row["last"]
 
 
 async def update_diary_fields(
@@ -32,8 +66,10 @@ async def update_diary_fields(
     if content is not None:
         diary.content = content
     await diary.save()
+    mark_write(diary.user_id)
     return diary
 
 
 async def delete_diary(diary: Diary) -> None:
     await diary.delete()
+    mark_write(diary.user_id)
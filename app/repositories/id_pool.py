@@ -0,0 +1,113 @@
+import asyncio
+import random
+import time
+from array import array
+from typing import Awaitable, Callable, Generic, Optional, Type, TypeVar
+
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.models import Model
+
+from app.core.config import settings
+
+MODEL = TypeVar("MODEL", bound=Model)
+
+_LOAD_BATCH_SIZE = 100_000
+
+
+class RandomIdPool(Generic[MODEL]):
+    """
+    테이블의 PK 목록을 메모리(array, 행당 8바이트)에 들고 있다가
+    랜덤 PK 하나를 고른 뒤 PK 조회 한 번으로 행을 가져옵니다.
+    COUNT + OFFSET 처럼 테이블 크기에 비례하는 스캔이 없습니다.
+
+    - 비어 있거나 ttl이 지나면 다음 호출에서 다시 적재
+    - 같은 프로세스에서 행을 추가/삭제했다면 invalidate()로 즉시 갱신
+    - 고른 PK가 그 사이 삭제됐으면 갱신 후 한 번 더 시도
+    - using_db를 주면 적재/조회를 그 연결(읽기 복제본 등)로 보냄
+    - get을 주면 PK 조회를 그 함수(캐시된 조회 등)로 대신함
+    """
+
+    def __init__(self, model: Type[MODEL], ttl_seconds: float):
+        self.model = model
+        self.ttl_seconds = ttl_seconds
+        self._ids: array = array("q")
+        self._loaded_at: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._version: Optional[int] = None
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    def sync_version(self, version: int) -> None:
+        # 카탈로그 버전(app.core.cache)이 바뀌었다 = 다른 프로세스가 행을 추가함
+        if version != self._version:
+            self._version = version
+            self.invalidate()
+
+    def _is_stale(self) -> bool:
+        return (
+            self._loaded_at is None
+            or not self._ids
+            or time.monotonic() - self._loaded_at >= self.ttl_seconds
+        )
+
+    def _get_lock(self) -> asyncio.Lock:
+        # 이벤트 루프가 바뀌면(테스트 등) 그 루프용 락을 새로 만든다
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock, self._lock_loop = asyncio.Lock(), loop
+        return self._lock
+
+    async def refresh(self, using_db: Optional[BaseDBAsyncClient] = None) -> None:
+        ids = array("q")
+        last_id = None
+        while True:
+            qs = self.model.all().using_db(using_db)
+            if last_id is not None:
+                qs = qs.filter(id__gt=last_id)
+            batch = (
+                await qs.order_by("id")
+                .limit(_LOAD_BATCH_SIZE)
+                .values_list("id", flat=True)
+            )
+            ids.extend(batch)
+            if len(batch) < _LOAD_BATCH_SIZE:
+                break
+            last_id = batch[-1]
+        self._ids = ids
+        self._loaded_at = time.monotonic()
+
+    async def ids(self, using_db: Optional[BaseDBAsyncClient] = None) -> array:
+        if self._is_stale():
+            # 동시에 들어온 요청들이 한 번만 적재하도록 직렬화
+            async with self._get_lock():
+                if self._is_stale():
+                    await self.refresh(using_db)
+        return self._ids
+
+    async def pick(
+        self,
+        using_db: Optional[BaseDBAsyncClient] = None,
+        get: Optional[Callable[[int], Awaitable[Optional[MODEL]]]] = None,
+    ) -> Optional[MODEL]:
+        for _ in range(2):
+            ids = await self.ids(using_db)
+            if not ids:
+                return None
+            pk = random.choice(ids)
+            if get is not None:
+                obj = await get(pk)
+            else:
+                obj = await self.model.get_or_none(id=pk, using_db=using_db)
+            if obj is not None:
+                return obj
+            self.invalidate()
+        return None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+def make_id_pool(model: Type[MODEL]) -> RandomIdPool[MODEL]:
+    return RandomIdPool(model, ttl_seconds=settings.RANDOM_ID_POOL_TTL_SECONDS)
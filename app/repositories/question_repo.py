@@ -1,32 +1,115 @@
+import math
 import random
-from typing import Optional
+from typing import Optional, Tuple
 
+from tortoise.expressions import Q, Subquery
+
+from app.core.cache import catalog_cache
 from app.models.question import Question
+from app.models.question_deck import QuestionDeck
 from app.models.user_question import UserQuestion
+from app.repositories.id_pool import make_id_pool
+
+# 랜덤 질문용 PK 풀 (스크래퍼가 insert하면 invalidate)
+question_id_pool = make_id_pool(Question)
+
+# 카탈로그 캐시 이름 (스크래퍼가 insert 후 bump)
+CATALOG = "question"
+
+# 덱에서 연속으로 '이미 본 질문'이 나올 때 몇 장까지 넘겨볼지
+_MAX_DECK_PROBES = 8
 
 
 async def get_random_question() -> Optional[Question]:
     """
     전체에서 랜덤 1건.
     """
-    count = await Question.all().count()
-    if count == 0:
-        return None
-    offset = random.randint(0, count - 1)
-    return await Question.all().offset(offset).limit(1).first()
+    question_id_pool.sync_version(await catalog_cache.version(CATALOG))
+    return await question_id_pool.pick(get=get_question_by_id)
+
+
+async def get_question_by_id(question_id: int) -> Optional[Question]:
+    return await catalog_cache.get_model(
+        CATALOG,
+        f"id:{question_id}",
+        Question,
+        lambda: Question.get_or_none(id=question_id),
+    )
+
+
+def _new_seed() -> int:
+    return random.getrandbits(62)
+
+
+def _deck_params(seed: int, size: int) -> Tuple[int, int]:
+    """
+    seed로 [0, size) 위의 순열 i -> (a*i + b) % size 를 정합니다.
+    gcd(a, size) == 1 이면 전단사이므로 덱 전체를 저장할 필요가 없습니다.
+    """
+    rng = random.Random(seed)
+    a = rng.randrange(1, size) if size > 1 else 1
+    while math.gcd(a, size) != 1:
+        a = rng.randrange(1, size)
+    return a, rng.randrange(size)
+
+
+async def _random_unseen_by_anti_join(user_id: int, ids) -> Optional[Question]:
+    """
+    덱을 다 돌지 않았는데 넘겨본 카드가 모두 이미 본 질문일 때의 안전망:
+    본 기록을 파이썬으로 가져오지 않고 DB의 NOT IN (subquery)로 거른 뒤,
+    랜덤 PK 이상에서 첫 행을 고릅니다.
+    """
+    seen = Subquery(UserQuestion.filter(user_id=user_id).values("question_id"))
+    qs = Question.filter(~Q(id__in=seen))
+    pivot = random.choice(ids)
+    return (
+        await qs.filter(id__gte=pivot).order_by("id").first()
+        or await qs.filter(id__lt=pivot).order_by("id").first()
+    )
 
 
 async def get_random_unseen_question_for_user(user_id: int) -> Optional[Question]:
     """
     사용자가 '본 기록'이 없는 질문 중 랜덤 1건.
     없으면 None.
+
+    사용자마다 seed로 섞은 덱을 두고 position을 한 칸씩 전진시키므로,
+    본 질문 수와 무관하게 요청당 상수 번의 PK/unique 조회로 끝납니다.
+    카탈로그 지문(질문 수, 최대 id)이 바뀌면 덱을 새로 섞고, 이미 본 카드는 건너뜁니다.
+    지문이 그대로인 채 덱을 끝까지 돌았다면 새 질문이 없다는 뜻이므로
+    스캔 없이 바로 None을 돌려줍니다(전체를 본 활성 사용자의 일반적인 상태).
     """
-    seen_ids = await UserQuestion.filter(user_id=user_id).values_list(
-        "question_id", flat=True
+    question_id_pool.sync_version(await catalog_cache.version(CATALOG))
+    ids = await question_id_pool.ids()
+    size = len(ids)
+    if size == 0:
+        return None
+    max_id = ids[-1]  # 풀은 id 순으로 적재됨
+
+    deck, _ = await QuestionDeck.get_or_create(
+        user_id=user_id,
+        defaults={"seed": _new_seed(), "size": size, "max_id": max_id},
     )
-    qs = Question.exclude(id__in=seen_ids)
-    count = await qs.count()
-    if count == 0:
+    if (deck.size, deck.max_id) != (size, max_id):
+        deck.seed, deck.size, deck.max_id, deck.position = _new_seed(), size, max_id, 0
+    elif deck.position >= size:
         return None
-    offset = random.randint(0, count - 1)
-    return await qs.offset(offset).limit(1).first()
+
+    a, b = _deck_params(deck.seed, size)
+    question = None
+    for _ in range(_MAX_DECK_PROBES):
+        if deck.position >= size:
+            break
+        question_id = ids[(a * deck.position + b) % size]
+        deck.position += 1
+        if await UserQuestion.filter(user_id=user_id, question_id=question_id).exists():
+            continue
+        question = await get_question_by_id(question_id)
+        if question is not None:
+            break
+    await deck.save(update_fields=["seed", "size", "max_id", "position"])
+
+    if question is None and deck.position < size:
+        # 탐색 횟수만 다 썼고 덱에는 카드가 남아 있음
+        question = await _random_unseen_by_anti_join(user_id, ids)
+    return question
@@ -1,20 +1,37 @@
-import random
 from typing import Iterable, Optional
 
+from app.core.cache import catalog_cache
+from app.db.routing import read_db
 from app.models.quote import Quote
+from app.repositories.id_pool import make_id_pool
+
+# 랜덤 명언용 PK 풀 (스크래퍼가 insert하면 invalidate)
+quote_id_pool = make_id_pool(Quote)
+
+# 카탈로그 캐시 이름 (스크래퍼가 insert 후 bump)
+CATALOG = "quote"
 
 
 async def get_random_quote() -> Optional[Quote]:
-    count = await Quote.all().count()
-    if count == 0:
-        return None
-    offset = random.randint(0, count - 1)
-    return await Quote.all().offset(offset).limit(1).first()
+    # COUNT + OFFSET 대신 메모리의 PK 목록에서 고른 뒤 캐시된 PK 조회 (읽기 복제본)
+    quote_id_pool.sync_version(await catalog_cache.version(CATALOG))
+    return await quote_id_pool.pick(using_db=read_db(), get=get_quote_by_id)
 
 
 async def get_quote_by_id(quote_id: int) -> Optional[Quote]:
-    return await Quote.get_or_none(id=quote_id)
+    return await catalog_cache.get_model(
+        CATALOG,
+        f"id:{quote_id}",
+        Quote,
+        lambda: Quote.get_or_none(id=quote_id, using_db=read_db()),
+    )
 
 
 async def list_quotes(limit: int = 20, offset: int = 0) -> Iterable[Quote]:
-    return await Quote.all().order_by("-id").offset(offset).limit(limit)
+    async def load():
+        qs = Quote.all().using_db(read_db())
+        return await qs.order_by("-id").offset(offset).limit(limit)
+
+    return await catalog_cache.get_models(
+        CATALOG, f"list:{limit}:{offset}", Quote, load
+    )
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from app.models.token_blacklist import TokenBlacklist
+
+
+async def is_revoked(jti: str) -> bool:
+    return await TokenBlacklist.filter(jti=jti).exists()
+
+
+async def add_revoked(*, jti: str, user_id: int, expired_at: datetime) -> None:
+    # 중복 저장 방지
+    await TokenBlacklist.get_or_create(
+        jti=jti, defaults={"user_id": user_id, "expired_at": expired_at}
+    )
+
+
+async def delete_expired_batch(now: datetime, *, batch_size: int) -> int:
+    """만료된 행을 id 순으로 최대 batch_size개 삭제하고 삭제 건수를 반환."""
+    ids = (
+        await TokenBlacklist.filter(expired_at__lt=now)
+        .order_by("id")
+        .limit(batch_size)
+        .values_list("id", flat=True)
+    )
+    if not ids:
+        return 0
+    return await TokenBlacklist.filter(id__in=ids).delete()
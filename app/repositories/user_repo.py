@@ -1,5 +1,8 @@
 from typing import Optional
 
+from tortoise.expressions import Q
+
+from app.db.routing import mark_write, read_db
 from app.models.user import User
 
 
@@ -13,16 +16,45 @@ async def get_by_username(username: str) -> Optional[User]:
     return await User.get_or_none(username=username)
 
 
-# PK(id)로 조회
+# 사용자명 또는 이메일로 한 번에 조회 (둘 다 걸리면 사용자명 일치 우선)
+async def get_by_username_or_email(username_or_email: str) -> Optional[User]:
+    users = await User.filter(
+        Q(username=username_or_email) | Q(email=username_or_email)
+    ).limit(2)
+    for user in users:
+        if user.username == username_or_email:
+            return user
+    return users[0] if users else None
+
+
+# 가입 INSERT가 unique 위반으로 실패했을 때 겹친 필드("username" / "email")를 찾음
+# (사용자명 우선, 방금 쓴 행을 봐야 하므로 복제본이 아닌 primary에서 조회)
+async def find_signup_conflict(username: str, email: str) -> Optional[str]:
+    rows = await User.filter(Q(username=username) | Q(email=email)).limit(2)
+    if any(u.username == username for u in rows):
+        return "username"
+    return "email" if rows else None
+
+
+# PK(id)로 조회 (토큰 검증 경로라 읽기 복제본으로, 방금 바뀐 사용자는 primary)
 async def get_by_id(user_id: int) -> Optional[User]:
-    return await User.get_or_none(id=user_id)
+    return await User.get_or_none(id=user_id, using_db=read_db(user_id))
 
 
 # 생성
 async def create_user(*, username: str, email: str, password_hash: str) -> User:
-    return await User.create(
+    user = await User.create(
         username=username,
         email=email,
         password_hash=password_hash,
         is_active=True,
     )
+    mark_write(user.id)
+    return user
+
+
+# 비밀번호 해시 교체
+async def update_password_hash(user_id: int, password_hash: str) -> int:
+    updated = await User.filter(id=user_id).update(password_hash=password_hash)
+    mark_write(user_id)
+    return updated
@@ -0,0 +1,82 @@
+# app/scraping/bulk.py
+"""
+unique 해시 컬럼을 기준으로 한 집합 단위 insert / 기존 행 해시 채우기.
+
+청크마다 '이미 있는 해시 IN 조회 1번 + bulk insert(ON CONFLICT DO NOTHING) 1번'이라
+왕복 횟수와 메모리가 테이블 크기가 아니라 들어오는 배치 크기에만 비례합니다.
+"""
+
+from typing import Callable, Dict, Iterable, Tuple, Type
+
+from tortoise.models import Model
+
+# 해시 IN 조회/insert 한 번에 다루는 행 수
+CHUNK_SIZE = 1_000
+
+
+async def insert_missing(
+    model: Type[Model],
+    hash_field: str,
+    objs_by_hash: Dict[str, Model],
+    chunk_size: int = CHUNK_SIZE,
+) -> int:
+    """
+    objs_by_hash 중 아직 없는 해시만 insert 하고 실제로 들어간 행 수를 돌려줍니다.
+    (insert 후 다시 세므로, 충돌로 무시된 행은 세지 않음)
+    """
+    hashes = list(objs_by_hash)
+    created = 0
+    for start in range(0, len(hashes), chunk_size):
+        chunk = hashes[start : start + chunk_size]
+        lookup = {f"{hash_field}__in": chunk}
+        existing = set(await model.filter(**lookup).values_list(hash_field, flat=True))
+        to_create = [objs_by_hash[h] for h in chunk if h not in existing]
+        if not to_create:
+            continue
+        await model.bulk_create(to_create, ignore_conflicts=True)
+        created += await model.filter(**lookup).count() - len(existing)
+    return created
+
+
+async def backfill_hashes(
+    model: Type[Model],
+    hash_field: str,
+    value_fields: Iterable[str],
+    make_hash: Callable[..., str],
+    batch_size: int = CHUNK_SIZE,
+) -> Tuple[int, int]:
+    """
+    hash_field가 비어 있는 기존 행을 id 순으로 훑으며 채웁니다(마이그레이션 후 1회).
+    같은 해시가 이미 있으면 그 행은 중복으로 보고 NULL로 남겨 둡니다.
+    반환: (채운 행 수, 중복으로 남긴 행 수)
+    """
+    fields = list(value_fields)
+    filled = duplicates = 0
+    last_id = 0
+    while True:
+        rows = (
+            await model.filter(**{f"{hash_field}__isnull": True, "id__gt": last_id})
+            .order_by("id")
+            .limit(batch_size)
+            .values_list("id", *fields)
+        )
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        by_hash: Dict[str, int] = {}
+        for row_id, *values in rows:
+            by_hash.setdefault(make_hash(*(v or "" for v in values)), row_id)
+        taken = set(
+            await model.filter(**{f"{hash_field}__in": list(by_hash)}).values_list(
+                hash_field, flat=True
+            )
+        )
+        batch_filled = 0
+        for h, row_id in by_hash.items():
+            if h in taken:
+                continue
+            await model.filter(id=row_id).update(**{hash_field: h})
+            batch_filled += 1
+        filled += batch_filled
+        duplicates += len(rows) - batch_filled
+    return filled, duplicates
@@ -0,0 +1,285 @@
+# app/scraping/crawl_state.py
+"""
+증분/재개 가능한 크롤링을 위한 로컬 상태 저장소 (표준 라이브러리 sqlite3).
+
+- URL마다 ETag / Last-Modified / 본문 해시 / 다음 페이지 URL을 기억해 두고,
+  다음 실행에서 If-None-Match / If-Modified-Since 를 보냅니다.
+  304이거나 본문 해시가 같으면 파싱을 건너뛰고 기억해 둔 다음 URL로 넘어갑니다.
+- 크롤링마다(crawl_key) 마지막으로 끝낸 페이지의 다음 URL(커서)을 남겨
+  --resume 으로 중단된 지점부터 이어 갑니다. 끝까지 돌면 커서를 지웁니다.
+- 페이지 기록도 crawl_key별입니다. crawl_key에 저장 대상(--store)이 들어가므로
+  --store file 실행이 남긴 기록 때문에 이후 --store db 실행이 페이지를 건너뛰어
+  DB에 아무것도 넣지 못하는 일이 없습니다.
+
+페이지 기록은 바로 쓰지 않고 모아 두었다가 checkpoint()에서 한 번에 씁니다.
+호출자는 그 페이지의 항목이 저장된 뒤에만 checkpoint() 해야, 중간에 죽었을 때
+저장 못 한 페이지를 다음 실행에서 '변경 없음'으로 건너뛰지 않습니다.
+"""
+
+import argparse
+import hashlib
+import sqlite3
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import ContextManager, Dict, List, Optional
+
+from app.scraping.fetch import Fetcher
+
+DEFAULT_STATE_PATH = Path("data/crawl_state.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    crawl_key TEXT NOT NULL,
+    url TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT NOT NULL,
+    next_url TEXT,
+    fetched_at TEXT NOT NULL,
+    PRIMARY KEY (crawl_key, url)
+);
+CREATE TABLE IF NOT EXISTS cursors (
+    crawl_key TEXT PRIMARY KEY,
+    next_url TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True)
+class PageState:
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_hash: str
+    next_url: Optional[str]
+
+
+@dataclass(frozen=True)
+class PageFetch:
+    """
+    조건부 GET 결과. html이 None이면 이전 실행 이후 바뀌지 않은 페이지입니다.
+    """
+
+    url: str
+    html: Optional[str]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    previous: Optional[PageState] = None
+
+    @property
+    def unchanged(self) -> bool:
+        return self.html is None
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class CrawlState:
+    def __init__(self, path: Path, crawl_key: str, *, use_validators: bool = True):
+        self.path = path
+        self.crawl_key = crawl_key
+        # False면 저장된 검증자를 무시하고 전부 다시 받되, 기록은 갱신 (--full)
+        self.use_validators = use_validators
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending: List[PageState] = []
+        self._pending_cursor: Optional[str] = None
+        self._finished = False
+        self.not_modified = 0
+        self.fetched = 0
+
+    def __enter__(self) -> "CrawlState":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(pages)")}
+        if columns and "crawl_key" not in columns:
+            # 예전 형식(URL만 키)은 어느 저장 대상의 기록인지 알 수 없어 버림
+            # (다음 실행은 전체를 다시 받음)
+            self._conn.execute("DROP TABLE pages")
+        self._conn.executescript(_SCHEMA)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._conn.close()
+
+    # ---------- 조회 ----------
+    def lookup(self, url: str) -> Optional[PageState]:
+        row = self._conn.execute(
+            "SELECT url, etag, last_modified, content_hash, next_url"
+            " FROM pages WHERE crawl_key = ? AND url = ?",
+            (self.crawl_key, url),
+        ).fetchone()
+        return PageState(*row) if row else None
+
+    def conditional_headers(self, previous: Optional[PageState]) -> Dict[str, str]:
+        if previous is None or not self.use_validators:
+            return {}
+        headers = {}
+        if previous.etag:
+            headers["If-None-Match"] = previous.etag
+        if previous.last_modified:
+            headers["If-Modified-Since"] = previous.last_modified
+        return headers
+
+    def resume_url(self) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT next_url FROM cursors WHERE crawl_key = ?", (self.crawl_key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    # ---------- 기록 ----------
+    def record(self, fetch: PageFetch, next_url: Optional[str]) -> None:
+        """페이지 하나를 끝냈음을 기록(보류). checkpoint()에서 실제로 씁니다."""
+        # 304면 새 검증자가 없으니 이전 값을 그대로 이어 씀
+        src = fetch if fetch.content_hash else fetch.previous
+        self._pending.append(
+            PageState(
+                fetch.url, src.etag, src.last_modified, src.content_hash, next_url
+            )
+        )
+        if next_url:
+            self._pending_cursor = next_url
+
+    def finish(self) -> None:
+        """마지막 페이지까지 돌았음. 다음 checkpoint()에서 커서를 지웁니다."""
+        self._finished = True
+
+    def checkpoint(self) -> None:
+        if not (self._pending or self._finished):
+            return
+        now = _now()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pages (crawl_key, url, etag,"
+                " last_modified, content_hash, next_url, fetched_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        self.crawl_key,
+                        p.url,
+                        p.etag,
+                        p.last_modified,
+                        p.content_hash,
+                        p.next_url,
+                        now,
+                    )
+                    for p in self._pending
+                ],
+            )
+            if self._finished:
+                self._conn.execute(
+                    "DELETE FROM cursors WHERE crawl_key = ?", (self.crawl_key,)
+                )
+            elif self._pending_cursor:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cursors (crawl_key, next_url, updated_at)"
+                    " VALUES (?, ?, ?)",
+                    (self.crawl_key, self._pending_cursor, now),
+                )
+        self._pending = []
+        self._pending_cursor = None
+        self._finished = False
+
+    def summary(self) -> str:
+        return f"{self.fetched} fetched, {self.not_modified} unchanged (skipped)"
+
+
+async def conditional_get(
+    client: Fetcher,
+    url: str,
+    state: Optional[CrawlState],
+    *,
+    missing_ok: bool = False,
+) -> Optional[PageFetch]:
+    """
+    state가 있으면 조건부 GET. 오류 응답은 예외지만,
+    missing_ok면 404는 None(페이지 없음)으로 돌려줍니다.
+    304이거나 본문 해시가 이전과 같으면 html=None 인 PageFetch를 돌려줍니다.
+    """
+    previous = state.lookup(url) if state else None
+    headers = state.conditional_headers(previous) if state else {}
+    r = await client.get(url, headers=headers)
+    if missing_ok and r.status_code == 404:
+        return None
+    if r.status_code == 304 and previous is not None:
+        state.not_modified += 1
+        return PageFetch(url, None, previous=previous)
+    r.raise_for_status()
+
+    content_hash = hashlib.sha256(r.content).hexdigest()
+    if state is None:
+        return PageFetch(url, r.text)
+    state.fetched += 1
+    fetch = PageFetch(
+        url,
+        r.text,
+        etag=r.headers.get("etag"),
+        last_modified=r.headers.get("last-modified"),
+        content_hash=content_hash,
+        previous=previous,
+    )
+    if (
+        state.use_validators
+        and previous is not None
+        and previous.content_hash == content_hash
+    ):
+        # 검증자를 지원하지 않는 서버: 받긴 했지만 파싱은 생략
+        state.not_modified += 1
+        return PageFetch(
+            url,
+            None,
+            etag=fetch.etag,
+            last_modified=fetch.last_modified,
+            content_hash=content_hash,
+            previous=previous,
+        )
+    return fetch
+
+
+# ---------- CLI 공용 ----------
+def add_state_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--state-file",
+        type=Path,
+        default=DEFAULT_STATE_PATH,
+        help="SQLite file for crawl state (ETag/Last-Modified/content hash, cursor)",
+    )
+    parser.add_argument(
+        "--no-state", action="store_true", help="Ignore and don't update crawl state"
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-fetch and re-parse every page (state is still updated)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted crawl from its last saved page"
+        " (pages are saved as they are stored, so this needs --stream"
+        " in the single-source scrapers)",
+    )
+
+
+def open_state(
+    args: argparse.Namespace, crawl_key: str
+) -> ContextManager[Optional[CrawlState]]:
+    """
+    crawl_key 뒤에 저장 대상(--store)을 붙여 엽니다: 같은 소스라도 file로 받은
+    페이지는 db 실행에서 '변경 없음'으로 건너뛰지 않습니다.
+    """
+    if args.no_state:
+        return nullcontext()
+    return CrawlState(
+        args.state_file, f"{crawl_key}@{args.store}", use_validators=not args.full
+    )
+
+
+def require_stream_for_resume(args: argparse.Namespace) -> None:
+    # 일괄 모드는 모든 저장이 끝난 뒤에만 checkpoint 하므로 중간 커서가 남지 않음
+    if args.resume and not args.stream:
+        raise SystemExit("--resume requires --stream")
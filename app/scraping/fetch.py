@@ -0,0 +1,293 @@
+# app/scraping/fetch.py
+"""
+스크래퍼 공용 HTTP 수집 계층.
+
+- 호스트별 토큰 버킷으로 초당 요청 수 제한 (burst 허용)
+- 429/5xx·연결 오류는 지수 백오프 + full jitter로 재시도, Retry-After가 있으면 따름
+- h2 패키지가 있으면 HTTP/2, keep-alive 커넥션 풀 크기 지정
+- 선택적 전역 동시 요청 한도 (모든 호출자/호스트 합산)
+- 실행 단위 통계 (요청/재시도/상태 코드/대기 시간)
+
+httpx.AsyncClient.get 과 같은 모양의 get()을 제공하므로 기존 코드에 그대로 끼웁니다.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import random
+import time
+from collections import Counter
+from contextlib import asynccontextmanager, nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import AsyncContextManager, AsyncIterator, Dict, Mapping, Optional
+
+import httpx
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+DEFAULT_RATE = 5.0  # 호스트당 초당 요청 수
+DEFAULT_BURST = 10
+DEFAULT_RETRIES = 4
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 30.0
+# 서버가 터무니없이 긴 Retry-After를 주면 이 값에서 자름
+MAX_RETRY_AFTER = 120.0
+
+USER_AGENT = "DiaryScraper/1.0"
+
+
+class TokenBucket:
+    """
+    초당 rate개씩 채워지고 최대 burst개까지 쌓이는 토큰 버킷.
+    이벤트 루프 하나에서만 쓰므로 확인~차감 사이에 await가 없으면 락이 필요 없습니다.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """토큰 하나를 얻을 때까지 기다리고, 기다린 시간(초)을 돌려줍니다."""
+        waited = 0.0
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return waited
+            delay = (1 - self._tokens) / self.rate
+            await asyncio.sleep(delay)
+            waited += delay
+
+
+@dataclass
+class FetchStats:
+    requests: int = 0
+    retries: int = 0
+    errors: int = 0
+    bytes: int = 0
+    throttled_seconds: float = 0.0
+    backoff_seconds: float = 0.0
+    statuses: Counter = field(default_factory=Counter)
+    started_at: float = field(default_factory=time.monotonic)
+
+    def summary(self) -> str:
+        elapsed = time.monotonic() - self.started_at
+        rps = self.requests / elapsed if elapsed > 0 else 0.0
+        statuses = ", ".join(f"{k}={v}" for k, v in sorted(self.statuses.items()))
+        return (
+            f"{self.requests} requests ({rps:.1f}/s), {self.retries} retries, "
+            f"{self.errors} transport errors, {self.bytes / 1024:.0f} KiB, "
+            f"throttled {self.throttled_seconds:.1f}s, "
+            f"backoff {self.backoff_seconds:.1f}s [{statuses}]"
+        )
+
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP-date)를 초로 변환. 해석 못 하면 None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return min(float(value), MAX_RETRY_AFTER)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    delta = (when - datetime.now(timezone.utc)).total_seconds()
+    return min(max(delta, 0.0), MAX_RETRY_AFTER)
+
+
+class Fetcher:
+    def __init__(
+        self,
+        *,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        retries: int = DEFAULT_RETRIES,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        max_connections: int = 20,
+        max_in_flight: Optional[int] = None,
+        timeout: float = 30.0,
+        http2: Optional[bool] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.http2 = HTTP2_AVAILABLE if http2 is None else http2
+        self.stats = FetchStats()
+        self._buckets: Dict[str, TokenBucket] = {}
+        # 커넥션 풀 크기와 별개로 동시에 보내는 요청 수 상한
+        # (HTTP/2는 커넥션 하나에 여러 요청을 싣기 때문에 풀 크기로는 묶이지 않음)
+        self._in_flight = asyncio.Semaphore(max_in_flight) if max_in_flight else None
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            headers={"User-Agent": USER_AGENT},
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=30.0,
+            ),
+            transport=transport,
+        )
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> "Fetcher":
+        return cls(
+            rate=args.rate,
+            burst=args.burst,
+            retries=args.retries,
+            max_connections=args.max_connections,
+            max_in_flight=args.max_in_flight,
+            http2=False if args.no_http2 else None,
+        )
+
+    async def __aenter__(self) -> "Fetcher":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self._client.aclose()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return bucket
+
+    async def _acquire_slot(self) -> None:
+        if self._in_flight is not None:
+            await self._in_flight.acquire()
+
+    def _release_slot(self) -> None:
+        if self._in_flight is not None:
+            self._in_flight.release()
+
+    def _backoff(self, attempt: int) -> float:
+        # full jitter: 0 ~ min(max, base * 2^attempt)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    async def _send(
+        self, url: str, headers: Optional[Mapping[str, str]], *, stream: bool
+    ) -> httpx.Response:
+        """
+        요청 슬롯은 시도마다 잡고 백오프 대기 중에는 놓습니다.
+        stream=True로 돌려준 응답은 슬롯을 쥔 채이므로
+        호출자가 다 읽은 뒤 _release_slot()을 부릅니다.
+        """
+        bucket = self._bucket(httpx.URL(url).host)
+        attempt = 0
+        while True:
+            self.stats.throttled_seconds += await bucket.acquire()
+            await self._acquire_slot()
+            self.stats.requests += 1
+            request = self._client.build_request("GET", url, headers=headers)
+            try:
+                r = await self._client.send(request, stream=stream)
+            except httpx.TransportError:
+                self._release_slot()
+                self.stats.errors += 1
+                if attempt >= self.retries:
+                    raise
+                delay = self._backoff(attempt)
+            except BaseException:
+                self._release_slot()
+                raise
+            else:
+                self.stats.statuses[r.status_code] += 1
+                if r.status_code not in RETRY_STATUSES or attempt >= self.retries:
+                    if not stream:
+                        self._release_slot()
+                    return r
+                try:
+                    if stream:
+                        await r.aclose()
+                    else:
+                        self.stats.bytes += r.num_bytes_downloaded
+                finally:
+                    self._release_slot()
+                retry_after = _retry_after_seconds(r.headers.get("retry-after"))
+                delay = self._backoff(attempt) if retry_after is None else retry_after
+            attempt += 1
+            self.stats.retries += 1
+            self.stats.backoff_seconds += delay
+            await asyncio.sleep(delay)
+
+    async def get(
+        self, url: str, headers: Optional[Mapping[str, str]] = None
+    ) -> httpx.Response:
+        """
+        재시도 가능한 응답(429/5xx)은 횟수를 다 쓰면 마지막 응답을 그대로 돌려주고,
+        상태 판단(raise_for_status 등)은 호출자에게 맡깁니다.
+        연결 오류는 횟수를 다 쓰면 예외를 다시 던집니다.
+        """
+        r = await self._send(url, headers, stream=False)
+        self.stats.bytes += r.num_bytes_downloaded
+        return r
+
+    @asynccontextmanager
+    async def stream(
+        self, url: str, headers: Optional[Mapping[str, str]] = None
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        get()과 같은 제한/재시도를 거친 뒤 본문을 읽지 않은 응답을 넘겨줍니다.
+        본문은 r.aiter_bytes()로 조금씩 읽고, 블록을 벗어나면 연결을 닫습니다.
+        """
+        r = await self._send(url, headers, stream=True)
+        try:
+            yield r
+        finally:
+            try:
+                await r.aclose()
+                self.stats.bytes += r.num_bytes_downloaded
+            finally:
+                self._release_slot()
+
+
+def borrow_fetcher(fetcher: Optional[Fetcher]) -> AsyncContextManager[Fetcher]:
+    """넘겨받은 fetcher는 닫지 않고 그대로, 없으면 기본 설정으로 새로 만들어 씁니다."""
+    return nullcontext(fetcher) if fetcher is not None else Fetcher()
+
+
+# ---------- CLI 공용 ----------
+def add_fetch_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--rate", type=float, default=DEFAULT_RATE, help="Requests per second per host"
+    )
+    parser.add_argument(
+        "--burst", type=int, default=DEFAULT_BURST, help="Token bucket burst size"
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=DEFAULT_RETRIES,
+        help="Retries on 429/5xx and connection errors",
+    )
+    parser.add_argument(
+        "--max-connections", type=int, default=20, help="HTTP connection pool size"
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=None,
+        help="Global cap on concurrent requests across all pages and sources",
+    )
+    parser.add_argument(
+        "--no-http2", action="store_true", help="Disable HTTP/2 even if h2 is installed"
+    )
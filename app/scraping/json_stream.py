@@ -0,0 +1,108 @@
+# app/scraping/json_stream.py
+"""
+대용량 JSON 피드를 메모리에 다 올리지 않고 읽는 스트리밍 파서 (ijson 필요).
+
+본문을 청크 단위로 받으면서 ijson 이벤트를 따라가,
+list_path 아래 각 항목의 field 값만 나오는 즉시 내보냅니다.
+같은 패스에서 next_path 값(다음 페이지 URL 또는 커서)을 잡아 다음 페이지로 이어 갑니다.
+메모리는 청크 크기와 문자열 하나 크기에만 비례합니다.
+"""
+
+import importlib.util
+from typing import AsyncIterator, Optional
+from urllib.parse import urljoin
+
+import httpx
+
+from app.scraping.fetch import Fetcher
+
+IJSON_AVAILABLE = importlib.util.find_spec("ijson") is not None
+
+_SCALAR_EVENTS = ("string", "number")
+
+
+class _ResponseReader:
+    """ijson.parse_async가 요구하는 async read(n) 인터페이스로 응답 본문을 감쌉니다."""
+
+    def __init__(self, response: httpx.Response):
+        self._chunks = response.aiter_bytes()
+        self._buffer = b""
+        self._eof = False
+
+    async def read(self, n: int = -1) -> bytes:
+        while not self._eof and (n < 0 or len(self._buffer) < n):
+            try:
+                self._buffer += await self._chunks.__anext__()
+            except StopAsyncIteration:
+                self._eof = True
+        if n < 0:
+            n = len(self._buffer)
+        out, self._buffer = self._buffer[:n], self._buffer[n:]
+        return out
+
+
+def _ijson_prefix(path: str) -> str:
+    """
+    'data.items' → ijson prefix. 배열 원소는 ijson에서 'item'이라 인덱스 지정은 불가.
+    """
+    parts = path.split(".") if path else []
+    if any(p.isdigit() for p in parts):
+        raise ValueError(f"numeric indexes are not supported in streaming mode: {path}")
+    return ".".join(parts)
+
+
+def next_page_url(current: str, value, cursor_param: Optional[str]) -> Optional[str]:
+    """
+    next_path 값으로 다음 요청 URL을 만듭니다.
+    cursor_param이 있으면 값을 커서로 보고 현재 URL의 그 쿼리 파라미터를 바꾸고,
+    없으면 값을 (상대) URL로 봅니다.
+    """
+    if value in (None, ""):
+        return None
+    if cursor_param:
+        return str(httpx.URL(current).copy_set_param(cursor_param, str(value)))
+    return urljoin(current, str(value))
+
+
+async def iter_json_field(
+    fetcher: Fetcher,
+    url: str,
+    list_path: str,
+    field: str,
+    *,
+    next_path: Optional[str] = None,
+    cursor_param: Optional[str] = None,
+    max_pages: Optional[int] = None,
+) -> AsyncIterator[str]:
+    """
+    list_path 배열의 각 객체에서 field 값(문자열/숫자)을 순서대로 내보냅니다.
+    next_path가 있으면 페이지마다 그 값을 따라 더 이상 없을 때까지 계속합니다.
+    """
+    if not IJSON_AVAILABLE:
+        raise RuntimeError('streaming JSON mode requires ijson (pip install "ijson")')
+    import ijson
+
+    list_prefix = _ijson_prefix(list_path)
+    item_prefix = f"{list_prefix}.item" if list_prefix else "item"
+    field_prefix = f"{item_prefix}.{field}"
+    next_prefix = _ijson_prefix(next_path) if next_path else None
+
+    page = 0
+    seen_urls = set()
+    while url and url not in seen_urls:
+        seen_urls.add(url)  # 같은 커서가 반복되는 피드에서 무한 루프 방지
+        page += 1
+        next_value = None
+        async with fetcher.stream(url) as r:
+            r.raise_for_status()
+            async for prefix, event, value in ijson.parse_async(_ResponseReader(r)):
+                if event not in _SCALAR_EVENTS:
+                    continue
+                if prefix == field_prefix:
+                    if value != "":
+                        yield str(value)
+                elif prefix == next_prefix:
+                    next_value = value
+        if max_pages and page >= max_pages:
+            break
+        url = next_page_url(url, next_value, cursor_param)
@@ -0,0 +1,40 @@
+# app/scraping/normalize.py
+"""
+스크래핑 텍스트 정규화와 중복 판정용 해시.
+
+표기만 다른 같은 문장(전각/반각, 공백, 대소문자)이 같은 키를 갖도록
+NFKC 정규화 → 공백 압축 → casefold 후 sha256 hex(64자)를 씁니다.
+DB의 unique 해시 컬럼과 스크래퍼의 배치 내 중복 제거가 같은 함수를 공유합니다.
+"""
+
+import hashlib
+import re
+import unicodedata
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text)
+    return _WS_RE.sub(" ", text).strip().casefold()
+
+
+def canonical_text(text: str) -> str:
+    """
+    유사 중복 판정용: normalize_text 후 구두점·기호(곧은/굽은 따옴표 포함)를 지우고
+    공백을 다시 압축합니다. 저장용 해시 키(text_hash)에는 쓰지 않습니다.
+    """
+    text = "".join(
+        ch if not unicodedata.category(ch).startswith(("P", "S")) else " "
+        for ch in normalize_text(text)
+    )
+    return _WS_RE.sub(" ", text).strip()
+
+
+def text_hash(*parts: str) -> str:
+    """
+    정규화한 조각들을 구분자로 이어 sha256 hex로 만듭니다.
+    (조각이 여러 개면 경계가 섞이지 않도록 \\x1f 로 구분)
+    """
+    joined = "\x1f".join(normalize_text(p) for p in parts)
+    return hashlib.sha256(joined.encode("utf-8")).hexdigest()
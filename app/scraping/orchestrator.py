@@ -0,0 +1,331 @@
+# app/scraping/orchestrator.py
+"""
+여러 수집 소스를 한 번에 돌리는 오케스트레이터.
+
+매니페스트(JSON, 또는 PyYAML이 있으면 YAML)에 적힌 소스들을 병렬로 크롤링합니다.
+Tortoise 초기화/DB 커넥션 풀과 HTTP Fetcher(호스트별 요청 제한 포함)를 모든 소스가
+공유하고, 끝나면 소스별 요약을 출력합니다. 한 소스가 실패해도 나머지는 계속 진행합니다.
+
+동시성은 두 단계입니다.
+- --concurrency: 동시에 도는 소스 수. 소스 안의 요청 수는 묶지 않으므로
+  quote 소스의 concurrency: 8은 그 자체로 페이지 요청 8개를 동시에 보냅니다.
+- --max-in-flight: 모든 소스를 합친 동시 요청 수 상한 (공유 Fetcher가 적용).
+
+중복 제거는 소스 안에서만 하고, 소스 간 중복은 DB의 해시 유니크 제약이 걸러냅니다.
+(공유 인덱스를 두면 DB 쓰기 전에 키가 등록되므로, 한 소스가 저장 전에 실패하면
+다른 소스에 있던 같은 항목까지 건너뛰어 끝내 저장되지 않습니다.)
+
+    python -m app.scraping.orchestrator sources.yaml --concurrency 8 --max-in-flight 16
+
+매니페스트 예시 (defaults는 각 소스에 기본값으로 합쳐짐):
+
+    {
+      "defaults": {"max_pages": 20, "parser": "auto"},
+      "sources": [
+        {"name": "quotes", "kind": "quote", "url": "https://quotes.toscrape.com/"},
+        {"name": "reflect", "mode": "html", "url": "https://example.com/q",
+         "item_selector": "li.question", "next_selector": "a.next"},
+        {"name": "api", "mode": "json", "url": "https://example.com/api/questions",
+         "list_path": "data.items", "field": "text"},
+        {"name": "feed", "mode": "json", "url": "https://example.com/feed",
+         "list_path": "items", "field": "q", "json_stream": true,
+         "next_path": "next_cursor", "cursor_param": "cursor"}
+      ]
+    }
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from tortoise import Tortoise
+
+from app.db.database import init_db
+from app.scraping import question_scraper, quote_scraper
+from app.scraping.crawl_state import CrawlState, add_state_arguments, open_state
+from app.scraping.fetch import Fetcher, add_fetch_arguments
+from app.scraping.parsers import PARSER_CHOICES, resolve_parser
+from app.scraping.pipeline import NdjsonWriter, StreamStats, dedupe_stream, run_stream
+
+YAML_AVAILABLE = importlib.util.find_spec("yaml") is not None
+
+DATA_DIR = Path("data/raw/orchestrator")
+
+KINDS = ("question", "quote")
+
+
+@dataclass(frozen=True)
+class SourceSpec:
+    name: str
+    url: str
+    kind: str = "question"
+    mode: str = "html"  # question 전용: html / json
+    item_selector: Optional[str] = None
+    text_selector: Optional[str] = None
+    next_selector: Optional[str] = None
+    list_path: Optional[str] = None
+    field: Optional[str] = None
+    json_stream: bool = False  # json 모드: 청크 단위 파싱 (ijson)
+    next_path: Optional[str] = None
+    cursor_param: Optional[str] = None
+    max_pages: Optional[int] = None
+    parser: str = "auto"
+    concurrency: int = 1  # quote 전용: 페이지 동시 요청 수
+
+
+@dataclass
+class SourceResult:
+    spec: SourceSpec
+    stats: StreamStats = field(default_factory=StreamStats)
+    seconds: float = 0.0
+    pages: str = ""
+    error: Optional[str] = None
+
+
+# ---------- 매니페스트 ----------
+def load_manifest(path: Path) -> List[SourceSpec]:
+    text = path.read_text(encoding="utf-8")
+    if path.suffix in (".yaml", ".yml"):
+        if not YAML_AVAILABLE:
+            raise SystemExit('YAML manifests require PyYAML (pip install "PyYAML")')
+        import yaml
+
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+
+    if not isinstance(data, dict) or not isinstance(data.get("sources"), list):
+        raise SystemExit("manifest must be an object with a 'sources' list")
+    defaults = data.get("defaults") or {}
+    known = set(SourceSpec.__dataclass_fields__)
+
+    specs: List[SourceSpec] = []
+    for i, raw in enumerate(data["sources"]):
+        entry: Dict[str, Any] = {**defaults, **raw}
+        entry.setdefault("name", f"source-{i + 1}")
+        unknown = set(entry) - known
+        if unknown:
+            raise SystemExit(f"{entry['name']}: unknown keys {sorted(unknown)}")
+        try:
+            spec = SourceSpec(**entry)
+        except TypeError as e:
+            raise SystemExit(f"{entry['name']}: {e}") from e
+        _validate(spec)
+        specs.append(spec)
+
+    names = [s.name for s in specs]
+    if len(names) != len(set(names)):
+        raise SystemExit("source names must be unique")
+    return specs
+
+
+def _validate(spec: SourceSpec) -> None:
+    if spec.kind not in KINDS:
+        raise SystemExit(f"{spec.name}: kind must be one of {KINDS}")
+    if spec.parser not in PARSER_CHOICES:
+        raise SystemExit(f"{spec.name}: parser must be one of {PARSER_CHOICES}")
+    if spec.kind == "quote":
+        return
+    if spec.mode == "html":
+        if not spec.item_selector:
+            raise SystemExit(f"{spec.name}: item_selector is required for HTML mode")
+    elif spec.mode == "json":
+        if not (spec.list_path and spec.field):
+            raise SystemExit(f"{spec.name}: list_path and field are required for JSON")
+        if spec.next_path and not spec.json_stream:
+            raise SystemExit(f"{spec.name}: next_path requires json_stream")
+    else:
+        raise SystemExit(f"{spec.name}: mode must be html or json")
+
+
+# ---------- 소스 실행 ----------
+def _iter_source(
+    spec: SourceSpec,
+    fetcher: Fetcher,
+    state: Optional[CrawlState],
+    resume_url: Optional[str],
+) -> AsyncIterator:
+    if spec.kind == "quote":
+        return quote_scraper.iter_quotes(
+            spec.url,
+            spec.max_pages,
+            concurrency=spec.concurrency,
+            state=state,
+            start_url=resume_url,
+            fetcher=fetcher,
+            parser=resolve_parser(spec.parser),
+        )
+    if spec.mode == "json" and spec.json_stream:
+        return question_scraper.iter_json_stream(
+            spec.url,
+            spec.list_path,
+            spec.field,
+            next_path=spec.next_path,
+            cursor_param=spec.cursor_param,
+            max_pages=spec.max_pages,
+            fetcher=fetcher,
+        )
+    if spec.mode == "json":
+        return question_scraper.iter_json(
+            spec.url, spec.list_path, spec.field, state, fetcher
+        )
+    return question_scraper.iter_html(
+        start_url=spec.url,
+        item_selector=spec.item_selector,
+        text_selector=spec.text_selector,
+        next_selector=spec.next_selector,
+        max_pages=spec.max_pages,
+        state=state,
+        resume_url=resume_url,
+        fetcher=fetcher,
+        parser=resolve_parser(spec.parser, needs_css=True),
+    )
+
+
+# 종류별 (중복 키, JSON 변환, DB 저장)
+_SINKS = {
+    "question": (
+        question_scraper.dedupe_key,
+        question_scraper.to_json,
+        question_scraper.upsert_to_db,
+    ),
+    "quote": (
+        quote_scraper.dedupe_key,
+        quote_scraper.to_json,
+        quote_scraper.upsert_to_db,
+    ),
+}
+
+
+def _ndjson_path(spec: SourceSpec) -> Path:
+    ts = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    return DATA_DIR / f"{spec.name}-{ts}.ndjson"
+
+
+async def _run_source(
+    spec: SourceSpec,
+    args: argparse.Namespace,
+    fetcher: Fetcher,
+    budget: asyncio.Semaphore,
+    write_lock: asyncio.Lock,
+) -> SourceResult:
+    result = SourceResult(spec)
+    key, to_json, upsert = _SINKS[spec.kind]
+
+    async def write_db(batch: List[Any]) -> int:
+        # 같은 종류의 배치는 한 번에 하나씩: 소스 간 중복이 동시에 들어가도
+        # insert 수(inserted)를 정확히 셈
+        async with write_lock:
+            return await upsert(batch)
+
+    use_db = args.store in ("db", "both")
+    path = _ndjson_path(spec) if args.store in ("file", "both") else None
+
+    async with budget:
+        started = time.perf_counter()
+        try:
+            with open_state(args, crawl_key=f"{spec.kind}s:{spec.url}") as state:
+                resume_url = state.resume_url() if (args.resume and state) else None
+                with NdjsonWriter(path) if path else nullcontext() as writer:
+                    result.stats = await run_stream(
+                        dedupe_stream(
+                            _iter_source(spec, fetcher, state, resume_url),
+                            key=key,
+                            seen=set(),
+                        ),
+                        batch_size=args.batch_size,
+                        to_json=to_json,
+                        write_db=write_db if use_db else None,
+                        writer=writer,
+                        on_checkpoint=state.checkpoint if state else None,
+                    )
+                if state:
+                    result.pages = state.summary()
+        except Exception as e:
+            # 한 소스 실패가 전체 실행을 멈추지 않도록 결과에만 남김
+            result.error = f"{type(e).__name__}: {e}"
+        result.seconds = time.perf_counter() - started
+    return result
+
+
+async def run_sources(
+    specs: List[SourceSpec], args: argparse.Namespace, fetcher: Fetcher
+) -> List[SourceResult]:
+    # 동시에 도는 소스 수만 제한 (요청 수 상한은 fetcher의 max_in_flight)
+    budget = asyncio.Semaphore(args.concurrency)
+    write_locks = {kind: asyncio.Lock() for kind in KINDS}
+    return await asyncio.gather(
+        *(
+            _run_source(spec, args, fetcher, budget, write_locks[spec.kind])
+            for spec in specs
+        )
+    )
+
+
+def _print_summary(results: List[SourceResult]) -> None:
+    header = ("source", "kind", "status", "scraped", "inserted", "seconds")
+    print("{:<20} {:<9} {:<6} {:>8} {:>9} {:>8}".format(*header))
+    for r in results:
+        status = "error" if r.error else "ok"
+        print(
+            f"{r.spec.name:<20} {r.spec.kind:<9} {status:<6} "
+            f"{r.stats.scraped:>8} {r.stats.inserted:>9} {r.seconds:>8.1f}"
+        )
+        if r.pages:
+            print(f"    pages: {r.pages}")
+        if r.error:
+            print(f"    {r.error}")
+
+
+# ---------- CLI ----------
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Scrape every source in a manifest concurrently"
+    )
+    parser.add_argument("manifest", type=Path, help="JSON or YAML source manifest")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Max sources crawled at once (use --max-in-flight to cap total requests)",
+    )
+    parser.add_argument("--store", choices=["db", "file", "both"], default="db")
+    parser.add_argument(
+        "--batch-size", type=int, default=500, help="DB commit size per source"
+    )
+    parser.add_argument(
+        "--only", nargs="*", help="Run only the named sources from the manifest"
+    )
+    add_fetch_arguments(parser)
+    add_state_arguments(parser)
+    args = parser.parse_args()
+
+    specs = load_manifest(args.manifest)
+    if args.only:
+        specs = [s for s in specs if s.name in set(args.only)]
+
+    use_db = args.store in ("db", "both")
+    if use_db:
+        await init_db()
+    try:
+        async with Fetcher.from_args(args) as fetcher:
+            results = await run_sources(specs, args, fetcher)
+    finally:
+        if use_db:
+            await Tortoise.close_connections()
+
+    _print_summary(results)
+    print(f"Fetch: {fetcher.stats.summary()}")
+    if any(r.error for r in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,140 @@
+# app/scraping/pipeline.py
+"""
+스크래퍼 공용 스트리밍 수집 파이프라인.
+
+크롤러(async generator) → 증분 중복 제거 → NDJSON 파일 / N건 단위 DB 저장
+결과 전체를 메모리에 모으지 않으므로 메모리는 배치 크기만큼만 쓰고,
+중간에 죽어도 그때까지 저장한 배치는 남습니다.
+"""
+
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+async def dedupe_stream(
+    items: AsyncIterable[T],
+    key: Callable[[T], Optional[str]],
+    seen: Optional[Set[bytes]] = None,
+) -> AsyncIterator[T]:
+    """
+    이미 나온 키를 건너뛰는 증분 중복 제거.
+    키 원문 대신 16바이트 digest만 기억하므로 항목 크기와 무관하게 메모리가 작습니다.
+    key가 빈 값을 돌려주면 그 항목은 버립니다.
+    seen을 넘기면 여러 스트림이 같은 중복 인덱스를 공유합니다.
+    """
+    if seen is None:
+        seen = set()
+    async for it in items:
+        k = key(it)
+        if not k:
+            continue
+        digest = hashlib.blake2b(k.encode("utf-8"), digest_size=16).digest()
+        if digest in seen:
+            continue
+        seen.add(digest)
+        yield it
+
+
+class NdjsonWriter:
+    """한 줄에 JSON 객체 하나씩 추가하고 줄마다 flush 합니다."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.count = 0
+        self._fh = None
+
+    def __enter__(self) -> "NdjsonWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = self.path.open("a", encoding="utf-8")
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._fh.close()
+
+    def write(self, obj: Dict[str, Any]) -> None:
+        self._fh.write(json.dumps(obj, ensure_ascii=False) + "\n")
+        self._fh.flush()
+        self.count += 1
+
+
+@dataclass
+class StreamStats:
+    scraped: int = 0
+    inserted: int = 0
+    batches: int = 0
+
+
+async def run_stream(
+    items: AsyncIterable[T],
+    *,
+    batch_size: int,
+    to_json: Callable[[T], Dict[str, Any]],
+    write_db: Optional[Callable[[List[T]], Awaitable[int]]] = None,
+    writer: Optional[NdjsonWriter] = None,
+    on_checkpoint: Optional[Callable[[], None]] = None,
+) -> StreamStats:
+    """
+    크롤링과 저장을 동시에 진행합니다.
+    생산자 태스크가 items를 큐에 넣는 동안 소비자가 파일에 쓰고 batch_size마다 DB에
+    커밋합니다. 큐 크기가 batch_size로 제한돼 있어 저장이 느리면 크롤링이 기다립니다.
+
+    on_checkpoint는 '지금까지 크롤러가 내놓은 항목이 전부 저장된' 시점
+    (배치를 커밋했고 큐가 비었을 때, 그리고 마지막)에 호출됩니다.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=batch_size)
+    stats = StreamStats()
+
+    async def produce() -> None:
+        # 정상 종료/예외 모두 종료 표시를 넣되, 소비자가 취소한 경우에는 넣지 않음
+        try:
+            async for it in items:
+                await queue.put(it)
+        except Exception:
+            await queue.put(_DONE)
+            raise
+        await queue.put(_DONE)
+
+    async def flush(batch: List[T]) -> None:
+        if write_db is not None and batch:
+            stats.inserted += await write_db(batch)
+            stats.batches += 1
+
+    producer = asyncio.create_task(produce())
+    batch: List[T] = []
+    try:
+        while (it := await queue.get()) is not _DONE:
+            stats.scraped += 1
+            if writer is not None:
+                writer.write(to_json(it))
+            batch.append(it)
+            if len(batch) >= batch_size:
+                await flush(batch)
+                batch = []
+                if on_checkpoint is not None and queue.empty():
+                    on_checkpoint()
+        await flush(batch)
+        await producer  # 크롤러 예외를 호출자에게 전달
+        if on_checkpoint is not None:
+            on_checkpoint()
+    finally:
+        producer.cancel()
+    return stats
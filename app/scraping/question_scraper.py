@@ -2,18 +2,45 @@
 import argparse
 import asyncio
 import json
+from contextlib import nullcontext
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import AsyncIterator, List, Optional, Tuple
 from urllib.parse import urljoin
 
-import httpx
 from bs4 import BeautifulSoup
 from tortoise import Tortoise
 
-from app.db.database import TORTOISE_ORM
+from app.core.cache import catalog_cache
+from app.db.database import init_db
 from app.models.question import Question
+from app.repositories.question_repo import CATALOG as QUESTION_CATALOG
+from app.repositories.question_repo import question_id_pool
+from app.scraping.bulk import backfill_hashes, insert_missing
+from app.scraping.crawl_state import (
+    CrawlState,
+    add_state_arguments,
+    conditional_get,
+    open_state,
+    require_stream_for_resume,
+)
+from app.scraping.dedupe import (
+    add_near_dup_arguments,
+    near_dedupe_stream,
+    near_dup_scope,
+)
+from app.scraping.fetch import Fetcher, add_fetch_arguments, borrow_fetcher
+from app.scraping.json_stream import iter_json_field
+from app.scraping.normalize import normalize_text, text_hash
+from app.scraping.parsers import (
+    PARSER_CHOICES,
+    css_xpath,
+    parse_document,
+    resolve_parser,
+    text_of,
+)
+from app.scraping.pipeline import NdjsonWriter, dedupe_stream, run_stream
 
 DATA_DIR = Path("data/raw/questions")
 
@@ -29,32 +56,66 @@ def _dedupe(items: List[QuestionItem]) -> List[QuestionItem]:
     out: List[QuestionItem] = []
     for it in items:
         t = it.question_text.strip()
-        if not t or t in seen:
+        key = normalize_text(t)
+        if not key or key in seen:
             continue
-        seen.add(t)
+        seen.add(key)
         out.append(QuestionItem(question_text=t))
     return out
 
 
+def _near_dup_text(it: QuestionItem) -> str:
+    return it.question_text
+
+
+def dedupe_key(it: QuestionItem) -> str:
+    return normalize_text(it.question_text)
+
+
+def to_json(it: QuestionItem) -> dict:
+    return {"question_text": it.question_text}
+
+
 def _save_to_file(items: List[QuestionItem]) -> Path:
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     ts = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
     path = DATA_DIR / f"questions-{ts}.json"
-    payload = [{"question_text": it.question_text} for it in items]
+    payload = [to_json(it) for it in items]
     path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
     return path
 
 
-async def _upsert_to_db(items: List[QuestionItem]) -> int:
-    created = 0
+def _ndjson_path() -> Path:
+    ts = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    return DATA_DIR / f"questions-{ts}.ndjson"
+
+
+async def upsert_to_db(items: List[QuestionItem]) -> int:
+    """
+    정규화 텍스트 해시(text_hash, unique) 기준 집합 단위 insert.
+    반환값은 실제로 새로 들어간 행 수입니다.
+    """
+    by_hash = {}
     for it in items:
-        if await Question.filter(question_text=it.question_text).exists():
-            continue
-        await Question.create(question_text=it.question_text)
-        created += 1
+        h = text_hash(it.question_text)
+        by_hash.setdefault(h, Question(question_text=it.question_text, text_hash=h))
+    created = await insert_missing(Question, "text_hash", by_hash)
+    if created:
+        # 같은 프로세스의 랜덤 질문 풀은 즉시 갱신, 다른 프로세스는 카탈로그 버전으로
+        # (memory 캐시 백엔드면 다른 프로세스에는 TTL 후 반영)
+        question_id_pool.invalidate()
+        await catalog_cache.bump(QUESTION_CATALOG)
     return created
 
 
+async def backfill_text_hashes() -> Tuple[int, int]:
+    """
+    text_hash가 비어 있는 기존 행을 채웁니다(마이그레이션 13 이후 1회).
+    반환: (채운 행 수, 중복으로 남긴 행 수)
+    """
+    return await backfill_hashes(Question, "text_hash", ["question_text"], text_hash)
+
+
 # ---------- HTML 모드 ----------
 def _parse_html_page(
     html: str,
@@ -83,32 +144,85 @@ def _parse_html_page(
     return items, next_url
 
 
-async def _scrape_html(
+def _parse_html_page_lxml(
+    html: str,
+    base_url: str,
+    item_selector: str,
+    text_selector: Optional[str],
+    next_selector: Optional[str],
+) -> Tuple[List[QuestionItem], Optional[str]]:
+    """
+    _parse_html_page와 같은 결과를 lxml 트리 + 컴파일된 XPath로 뽑습니다.
+    (CSS → XPath 변환은 선택자마다 한 번만, cssselect 필요)
+    """
+    doc = parse_document(html)
+    if doc is None:
+        return [], None
+    items: List[QuestionItem] = []
+    find_text = css_xpath(text_selector) if text_selector else None
+
+    for node in css_xpath(item_selector)(doc):
+        if find_text is not None:
+            found = find_text(node)
+            if not found:
+                continue
+            node = found[0]
+        text = text_of(node)
+        if text:
+            items.append(QuestionItem(question_text=text))
+
+    next_url = None
+    if next_selector:
+        found = css_xpath(next_selector)(doc)
+        if found and found[0].get("href") is not None:
+            next_url = urljoin(base_url, found[0].get("href"))
+
+    return items, next_url
+
+
+HTML_PAGE_PARSERS = {"bs4": _parse_html_page, "lxml": _parse_html_page_lxml}
+
+
+async def iter_html(
     start_url: str,
     item_selector: str,
     text_selector: Optional[str],
     next_selector: Optional[str],
     max_pages: Optional[int],
-) -> List[QuestionItem]:
-    url = start_url
+    state: Optional[CrawlState] = None,
+    resume_url: Optional[str] = None,
+    fetcher: Optional[Fetcher] = None,
+    parser: str = "bs4",
+) -> AsyncIterator[QuestionItem]:
+    """
+    state가 있으면 조건부 요청으로 바뀌지 않은 페이지는 건너뛰고
+    기록해 둔 다음 URL로 이동합니다. 각 페이지는 항목을 넘겨준 뒤 state에 기록합니다.
+    resume_url이 있으면 그 페이지부터 시작합니다.
+    parser는 HTML_PAGE_PARSERS의 키(bs4 / lxml)입니다.
+    """
+    parse_page = HTML_PAGE_PARSERS[parser]
+    url = resume_url or start_url
     page = 0
-    out: List[QuestionItem] = []
 
-    async with httpx.AsyncClient(
-        timeout=30, headers={"User-Agent": "DiaryScraper/1.0"}
-    ) as client:
+    async with borrow_fetcher(fetcher) as client:
         while url:
             page += 1
-            r = await client.get(url)
-            r.raise_for_status()
-            items, next_url = _parse_html_page(
-                r.text, start_url, item_selector, text_selector, next_selector
-            )
-            out.extend(items)
+            fetch = await conditional_get(client, url, state)
+            if fetch.unchanged:
+                next_url = fetch.previous.next_url
+            else:
+                items, next_url = parse_page(
+                    fetch.html, start_url, item_selector, text_selector, next_selector
+                )
+                for it in items:
+                    yield it
+            if state:
+                state.record(fetch, next_url)
+                if not next_url:
+                    state.finish()
             if max_pages and page >= max_pages:
                 break
             url = next_url
-    return _dedupe(out)
 
 
 # ---------- JSON 모드 ----------
@@ -124,21 +238,125 @@ def _get_by_path(obj, path: str):
     return cur
 
 
-async def _scrape_json(url: str, list_path: str, field: str) -> List[QuestionItem]:
-    async with httpx.AsyncClient(
-        timeout=30, headers={"User-Agent": "DiaryScraper/1.0"}
-    ) as client:
-        r = await client.get(url)
-        r.raise_for_status()
-        data = r.json()
-
-    rows = _get_by_path(data, list_path)
-    items: List[QuestionItem] = []
-    if isinstance(rows, list):
-        for row in rows:
-            if isinstance(row, dict) and row.get(field):
-                items.append(QuestionItem(question_text=str(row[field]).strip()))
-    return _dedupe(items)
+async def iter_json(
+    url: str,
+    list_path: str,
+    field: str,
+    state: Optional[CrawlState] = None,
+    fetcher: Optional[Fetcher] = None,
+) -> AsyncIterator[QuestionItem]:
+    async with borrow_fetcher(fetcher) as client:
+        fetch = await conditional_get(client, url, state)
+
+    if not fetch.unchanged:
+        rows = _get_by_path(json.loads(fetch.html), list_path)
+        if isinstance(rows, list):
+            for row in rows:
+                if isinstance(row, dict) and row.get(field):
+                    yield QuestionItem(question_text=str(row[field]).strip())
+    if state:
+        state.record(fetch, None)
+        state.finish()
+
+
+async def iter_json_stream(
+    url: str,
+    list_path: str,
+    field: str,
+    next_path: Optional[str] = None,
+    cursor_param: Optional[str] = None,
+    max_pages: Optional[int] = None,
+    fetcher: Optional[Fetcher] = None,
+) -> AsyncIterator[QuestionItem]:
+    """
+    본문 전체를 json.loads 하지 않고 청크 단위로 파싱하는 JSON 모드 (ijson 필요).
+    next_path가 있으면 다음 페이지 URL/커서를 따라갑니다.
+    (본문 해시가 필요한 크롤 상태 기록은 하지 않음)
+    """
+    async with borrow_fetcher(fetcher) as client:
+        async for text in iter_json_field(
+            client,
+            url,
+            list_path,
+            field,
+            next_path=next_path,
+            cursor_param=cursor_param,
+            max_pages=max_pages,
+        ):
+            text = text.strip()
+            if text:
+                yield QuestionItem(question_text=text)
+
+
+# ---------- 스트리밍 수집 ----------
+def _iter_items(
+    args: argparse.Namespace,
+    fetcher: Fetcher,
+    state: Optional[CrawlState],
+    resume_url: Optional[str],
+) -> AsyncIterator[QuestionItem]:
+    if args.mode == "html":
+        return iter_html(
+            start_url=args.url,
+            item_selector=args.item_selector,
+            text_selector=args.text_selector,
+            next_selector=args.next_selector,
+            max_pages=args.max_pages,
+            state=state,
+            resume_url=resume_url,
+            fetcher=fetcher,
+            parser=resolve_parser(args.parser, needs_css=True),
+        )
+    if args.json_stream:
+        return iter_json_stream(
+            args.url,
+            args.list_path,
+            args.field,
+            next_path=args.next_path,
+            cursor_param=args.cursor_param,
+            max_pages=args.max_pages,
+            fetcher=fetcher,
+        )
+    return iter_json(args.url, args.list_path, args.field, state, fetcher)
+
+
+async def _stream_ingest(
+    args: argparse.Namespace,
+    fetcher: Fetcher,
+    state: Optional[CrawlState],
+    resume_url: Optional[str],
+) -> None:
+    use_db = args.store in ("db", "both")
+    if use_db:
+        await init_db()
+    try:
+        path = _ndjson_path() if args.store in ("file", "both") else None
+        near_scope = near_dup_scope(args, "question", with_existing=use_db)
+        async with near_scope as near:
+            items = dedupe_stream(
+                _iter_items(args, fetcher, state, resume_url), key=dedupe_key
+            )
+            if near:
+                items = near_dedupe_stream(items, _near_dup_text, near)
+            with NdjsonWriter(path) if path else nullcontext() as writer:
+                stats = await run_stream(
+                    items,
+                    batch_size=args.batch_size,
+                    to_json=to_json,
+                    write_db=upsert_to_db if use_db else None,
+                    writer=writer,
+                    on_checkpoint=state.checkpoint if state else None,
+                )
+        print(f"Scraped {stats.scraped} unique questions")
+        if near:
+            print(f"Near-duplicates dropped: {near.dropped}")
+        if path:
+            print(f"Saved file: {path}")
+        if use_db:
+            print(f"DB inserted new rows: {stats.inserted} ({stats.batches} batches)")
+    finally:
+        if use_db:
+            await Tortoise.close_connections()
 
 
 # ---------- CLI ----------
@@ -146,11 +364,17 @@ async def main():
     parser = argparse.ArgumentParser(
         description="Scrape self-reflection questions and store into DB"
     )
-    parser.add_argument("--mode", choices=["html", "json"], required=True)
+    parser.add_argument("--mode", choices=["html", "json"])
+    parser.add_argument("--url", help="Start URL (HTML page or JSON endpoint)")
+    parser.add_argument("--store", choices=["db", "file", "both"], default="db")
     parser.add_argument(
-        "--url", required=True, help="Start URL (HTML page or JSON endpoint)"
+        "--stream",
+        action="store_true",
+        help="Write NDJSON / commit to DB in batches while crawling",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=500, help="DB commit size in --stream mode"
     )
-    parser.add_argument("--store", choices=["db", "file", "both"], default="db")
 
     # HTML 옵션
     parser.add_argument(
@@ -164,6 +388,12 @@ async def main():
         help="CSS selector to find the 'next page' link (HTML) [optional]",
     )
     parser.add_argument("--max-pages", type=int, default=None)
+    parser.add_argument(
+        "--parser",
+        choices=PARSER_CHOICES,
+        default="auto",
+        help="HTML parser backend (auto = lxml XPath if cssselect is installed)",
+    )
 
     # JSON 옵션
     parser.add_argument(
@@ -172,39 +402,99 @@ async def main():
     parser.add_argument(
         "--field", help="Field name containing question text in each item"
     )
+    parser.add_argument(
+        "--json-stream",
+        action="store_true",
+        help="Parse the JSON body incrementally (constant memory, requires ijson)",
+    )
+    parser.add_argument(
+        "--next-path",
+        help="Dot-path to the next page URL or cursor (JSON, with --json-stream)",
+    )
+    parser.add_argument(
+        "--cursor-param",
+        help="Treat --next-path value as a cursor sent in this query parameter",
+    )
+
+    add_fetch_arguments(parser)
+    add_state_arguments(parser)
+    add_near_dup_arguments(parser)
+    parser.add_argument(
+        "--backfill-hashes",
+        action="store_true",
+        help="Fill text_hash for existing rows and exit (run once after migrating)",
+    )
 
     args = parser.parse_args()
 
+    if args.backfill_hashes:
+        await init_db()
+        try:
+            filled, duplicates = await backfill_text_hashes()
+            print(f"Backfilled {filled} rows, left {duplicates} duplicates unhashed")
+        finally:
+            await Tortoise.close_connections()
+        return
+
+    if not (args.mode and args.url):
+        raise SystemExit("--mode and --url are required")
     if args.mode == "html":
         if not args.item_selector:
             raise SystemExit("--item-selector is required for HTML mode")
-        items = await _scrape_html(
-            start_url=args.url,
-            item_selector=args.item_selector,
-            text_selector=args.text_selector,
-            next_selector=args.next_selector,
-            max_pages=args.max_pages,
-        )
-    else:
-        if not (args.list_path and args.field):
-            raise SystemExit("--list-path and --field are required for JSON mode")
-        items = await _scrape_json(args.url, args.list_path, args.field)
-
+    elif not (args.list_path and args.field):
+        raise SystemExit("--list-path and --field are required for JSON mode")
+    if args.next_path and not args.json_stream:
+        raise SystemExit("--next-path requires --json-stream")
+
+    require_stream_for_resume(args)
+    with open_state(args, crawl_key=f"questions:{args.url}") as state:
+        resume_url = state.resume_url() if (args.resume and state) else None
+        if resume_url:
+            print(f"Resuming from {resume_url}")
+        async with Fetcher.from_args(args) as fetcher:
+            await _crawl_and_store(args, fetcher, state, resume_url)
+        print(f"Fetch: {fetcher.stats.summary()}")
+        if state:
+            print(f"Pages: {state.summary()}")
+
+
+async def _crawl_and_store(
+    args: argparse.Namespace,
+    fetcher: Fetcher,
+    state: Optional[CrawlState],
+    resume_url: Optional[str],
+) -> None:
+    if args.stream:
+        await _stream_ingest(args, fetcher, state, resume_url)
+        return
+
+    items = _dedupe([it async for it in _iter_items(args, fetcher, state, resume_url)])
     print(f"Scraped {len(items)} unique questions")
 
-    if args.store in ("file", "both"):
-        path = _save_to_file(items)
-        print(f"Saved file: {path}")
-
-    if args.store in ("db", "both"):
-        await Tortoise.init(config=TORTOISE_ORM)
-        await Tortoise.generate_schemas()
-        try:
-            created = await _upsert_to_db(items)
+    use_db = args.store in ("db", "both")
+    if use_db:
+        await init_db()
+    try:
+        async with near_dup_scope(args, "question", with_existing=use_db) as near:
+            if near:
+                items = await near.filter(items, _near_dup_text)
+                print(f"Near-duplicates dropped: {near.dropped}")
+
+        if args.store in ("file", "both"):
+            path = _save_to_file(items)
+            print(f"Saved file: {path}")
+
+        if use_db:
+            created = await upsert_to_db(items)
             print(f"DB inserted new rows: {created}")
-        finally:
+    finally:
+        if use_db:
             await Tortoise.close_connections()
 
+    # 저장까지 끝난 뒤에만 페이지 상태를 남김
+    if state:
+        state.checkpoint()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
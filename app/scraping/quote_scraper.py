@@ -2,18 +2,48 @@
 import argparse
 import asyncio
 import json
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from urllib.parse import urljoin
 
-import httpx
 from bs4 import BeautifulSoup
+from lxml import etree
 from tortoise import Tortoise
 
-from app.db.database import TORTOISE_ORM
+from app.core.cache import catalog_cache
+from app.db.database import init_db
 from app.models.quote import Quote
+from app.repositories.quote_repo import CATALOG as QUOTE_CATALOG
+from app.repositories.quote_repo import quote_id_pool
+from app.scraping.bulk import backfill_hashes, insert_missing
+from app.scraping.crawl_state import (
+    CrawlState,
+    PageFetch,
+    add_state_arguments,
+    conditional_get,
+    open_state,
+    require_stream_for_resume,
+)
+from app.scraping.dedupe import (
+    add_near_dup_arguments,
+    near_dedupe_stream,
+    near_dup_scope,
+)
+from app.scraping.fetch import Fetcher, add_fetch_arguments, borrow_fetcher
+from app.scraping.normalize import text_hash
+from app.scraping.parsers import (
+    PARSER_CHOICES,
+    class_xpath,
+    parse_document,
+    resolve_parser,
+    text_of,
+)
+from app.scraping.pipeline import NdjsonWriter, dedupe_stream, run_stream
 
 DATA_DIR = Path("data/raw/quotes")
 
@@ -48,66 +78,346 @@ def _parse_page(html: str, base_url: str) -> Tuple[List[QuoteItem], Optional[str
     return items, next_url
 
 
+# lxml 백엔드: 위 CSS 선택자와 같은 XPath를 모듈 로드 시 한 번만 컴파일
+_X_QUOTES = etree.XPath(f"//*[{class_xpath('quote')}]")
+_X_TEXT = etree.XPath(f"(.//*[{class_xpath('text')}])[1]")
+_X_AUTHOR = etree.XPath(f"(.//*[{class_xpath('author')}])[1]")
+_X_NEXT_HREF = etree.XPath(f"(//li[{class_xpath('next')}]/a)[1]/@href")
+
+
+def _parse_page_lxml(html: str, base_url: str) -> Tuple[List[QuoteItem], Optional[str]]:
+    """_parse_page와 같은 결과를 BeautifulSoup 없이 lxml 트리에서 바로 뽑습니다."""
+    doc = parse_document(html)
+    if doc is None:
+        return [], None
+    items: List[QuoteItem] = []
+    for q in _X_QUOTES(doc):
+        text_el = _X_TEXT(q)
+        if not text_el:
+            continue
+        text = text_of(text_el[0]).strip("“”\"' \n\t")
+        author_el = _X_AUTHOR(q)
+        author = text_of(author_el[0]) if author_el else None
+        items.append(QuoteItem(content=text, author=author or None))
+
+    hrefs = _X_NEXT_HREF(doc)
+    next_url = urljoin(base_url, hrefs[0]) if hrefs else None
+    return items, next_url
+
+
+PAGE_PARSERS = {"bs4": _parse_page, "lxml": _parse_page_lxml}
+
+
 # ---------- 수집 ----------
+# ".../page/<N>/" 형태의 다음 페이지 링크면 이후 페이지 URL을 미리 추측할 수 있음
+_PAGE_URL_RE = re.compile(r"^(?P<prefix>.*/page/)(?P<num>\d+)(?P<suffix>/?)$")
+
+
+async def _parse_offloaded(
+    executor: Optional[Executor], html: str, base_url: str, parser: str = "lxml"
+) -> Tuple[List[QuoteItem], Optional[str]]:
+    # 파싱은 CPU 작업이라 이벤트 루프 밖(스레드/프로세스 풀)에서 실행
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, PAGE_PARSERS[parser], html, base_url)
+
+
+async def _fetch_page(
+    client: Fetcher,
+    url: str,
+    base_url: str,
+    executor: Optional[Executor],
+    state: Optional[CrawlState],
+    *,
+    parser: str = "lxml",
+    missing_ok: bool = False,
+) -> Tuple[Optional[PageFetch], List[QuoteItem], Optional[str]]:
+    """
+    페이지 하나를 (조건부로) 받아 파싱합니다.
+    바뀌지 않은 페이지는 파싱 없이 기록해 둔 다음 URL을 돌려줍니다.
+    """
+    fetch = await conditional_get(client, url, state, missing_ok=missing_ok)
+    if fetch is None:
+        return None, [], None
+    if fetch.unchanged:
+        return fetch, [], fetch.previous.next_url
+    items, next_url = await _parse_offloaded(executor, fetch.html, base_url, parser)
+    return fetch, items, next_url
+
+
+async def iter_quote_pages(
+    client: Fetcher,
+    base_url: str,
+    max_pages: Optional[int] = None,
+    *,
+    concurrency: int = 1,
+    executor: Optional[Executor] = None,
+    state: Optional[CrawlState] = None,
+    start_url: Optional[str] = None,
+    parser: str = "lxml",
+) -> AsyncIterator[List[QuoteItem]]:
+    """
+    페이지 순서대로 QuoteItem 목록을 내보내는 async generator.
+
+    첫 페이지의 다음 링크가 /page/N/ 패턴이면, 이후 페이지 URL을 추측해
+    최대 concurrency개까지 동시에 요청합니다. 결과는 페이지 순서대로 내보내며,
+    다음 링크가 없거나(마지막 페이지) 404/빈 페이지를 만나면 그 뒤 요청은 취소합니다.
+    패턴이 아니면 다음 링크를 하나씩 따라갑니다.
+
+    state가 있으면 조건부 요청을 보내고, 바뀌지 않은 페이지는 내보내지 않고 건너뜁니다.
+    각 페이지는 항목을 넘겨준 뒤 state에 기록됩니다. start_url은 재개용 시작 지점입니다.
+    parser는 PAGE_PARSERS의 키(bs4 / lxml)입니다.
+    """
+
+    def record(fetch: Optional[PageFetch], next_url: Optional[str]) -> None:
+        if state is None or fetch is None:
+            return
+        state.record(fetch, next_url)
+        if not next_url:
+            state.finish()
+
+    fetch, items, next_url = await _fetch_page(
+        client, start_url or base_url, base_url, executor, state, parser=parser
+    )
+    if items:
+        yield items
+    record(fetch, next_url)
+
+    match = _PAGE_URL_RE.match(next_url or "")
+    if concurrency <= 1 or not match:
+        page = 1
+        while next_url and not (max_pages and page >= max_pages):
+            page += 1
+            fetch, items, next_url = await _fetch_page(
+                client, next_url, base_url, executor, state, parser=parser
+            )
+            if items:
+                yield items
+            record(fetch, next_url)
+        return
+
+    first_guess = int(match["num"])
+    last_allowed = first_guess + max_pages - 2 if max_pages else None
+
+    def page_url(n: int) -> str:
+        return f"{match['prefix']}{n}{match['suffix']}"
+
+    def fetch(n: int) -> asyncio.Task:
+        return asyncio.create_task(
+            _fetch_page(
+                client,
+                page_url(n),
+                base_url,
+                executor,
+                state,
+                parser=parser,
+                missing_ok=True,
+            )
+        )
+
+    pending: Dict[int, asyncio.Task] = {}
+    next_to_dispatch = next_to_emit = first_guess
+    try:
+        while True:
+            # 생산자: 순서 버퍼가 concurrency를 넘지 않게 앞 페이지를 미리 요청
+            while len(pending) < concurrency and (
+                last_allowed is None or next_to_dispatch <= last_allowed
+            ):
+                pending[next_to_dispatch] = fetch(next_to_dispatch)
+                next_to_dispatch += 1
+            if next_to_emit not in pending:
+                return
+            # 소비자: 페이지 순서대로 꺼내서 내보냄
+            page_fetch, items, next_url = await pending.pop(next_to_emit)
+            if page_fetch is None or not (items or page_fetch.unchanged):
+                return  # 404 / 빈 페이지 = 끝을 지나침
+            if items:
+                yield items
+            record(page_fetch, next_url)
+            if not next_url:
+                return
+            next_to_emit += 1
+    finally:
+        for task in pending.values():
+            task.cancel()
+
+
+async def iter_quotes(
+    base_url: str,
+    max_pages: Optional[int] = None,
+    *,
+    concurrency: int = 1,
+    parse_workers: int = 0,
+    state: Optional[CrawlState] = None,
+    start_url: Optional[str] = None,
+    fetcher: Optional[Fetcher] = None,
+    parser: str = "lxml",
+) -> AsyncIterator[QuoteItem]:
+    """
+    수집한 명언을 하나씩 내보내는 async generator (중복 제거 전).
+    concurrency > 1 이면 페이지를 동시에 요청하고,
+    parse_workers > 0 이면 파싱을 프로세스 풀에서 실행합니다(0이면 스레드 풀).
+    state / start_url / parser 는 iter_quote_pages 참고.
+    fetcher가 없으면 기본 설정으로 만듭니다.
+    """
+    executor = ProcessPoolExecutor(parse_workers) if parse_workers > 0 else None
+    try:
+        async with borrow_fetcher(fetcher) as client:
+            async for items in iter_quote_pages(
+                client,
+                base_url,
+                max_pages,
+                concurrency=concurrency,
+                executor=executor,
+                state=state,
+                start_url=start_url,
+                parser=parser,
+            ):
+                for it in items:
+                    yield it
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def _near_dup_text(it: QuoteItem) -> str:
+    return it.content
+
+
+def dedupe_key(it: QuoteItem) -> str:
+    return text_hash(it.content, it.author or "")
+
+
 async def scrape_quotes(
-    base_url: str, max_pages: Optional[int] = None
+    base_url: str,
+    max_pages: Optional[int] = None,
+    *,
+    concurrency: int = 1,
+    parse_workers: int = 0,
+    state: Optional[CrawlState] = None,
+    start_url: Optional[str] = None,
+    fetcher: Optional[Fetcher] = None,
+    parser: str = "lxml",
 ) -> List[QuoteItem]:
     """
     quotes.toscrape.com 페이지네이션을 따라가며 전부 수집.
     max_pages 지정 시 해당 페이지 수까지만 수집.
     """
-    out: List[QuoteItem] = []
-    url = base_url
-    page = 0
-    async with httpx.AsyncClient(
-        timeout=30, headers={"User-Agent": "DiaryScraper/1.0"}
-    ) as client:
-        while url:
-            page += 1
-            r = await client.get(url)
-            r.raise_for_status()
-            items, next_url = _parse_page(r.text, base_url)
-            out.extend(items)
-            if max_pages and page >= max_pages:
-                break
-            url = next_url
     # 중복 제거 (content+author 기준)
-    seen: set[tuple[str, Optional[str]]] = set()
-    uniq: List[QuoteItem] = []
-    for it in out:
-        key = (it.content, it.author)
-        if key in seen:
-            continue
-        seen.add(key)
-        uniq.append(it)
-    return uniq
+    return [
+        it
+        async for it in dedupe_stream(
+            iter_quotes(
+                base_url,
+                max_pages,
+                concurrency=concurrency,
+                parse_workers=parse_workers,
+                state=state,
+                start_url=start_url,
+                fetcher=fetcher,
+                parser=parser,
+            ),
+            key=dedupe_key,
+        )
+    ]
 
 
 # ---------- 저장 ----------
+def to_json(it: QuoteItem) -> dict:
+    return {"content": it.content, "author": it.author}
+
+
 def save_to_file(items: List[QuoteItem]) -> Path:
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     ts = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
     path = DATA_DIR / f"quotes-{ts}.json"
-    payload = [{"content": it.content, "author": it.author} for it in items]
+    payload = [to_json(it) for it in items]
     path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
     return path
 
 
+def ndjson_path() -> Path:
+    ts = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    return DATA_DIR / f"quotes-{ts}.ndjson"
+
+
 async def upsert_to_db(items: List[QuoteItem]) -> int:
     """
-    content+author 조합으로 중복을 피하며 insert.
-    (모델에 unique 제약이 없어도 애플리케이션 레벨에서 중복 방지)
+    content+author 해시(content_hash, unique) 기준 집합 단위 insert.
+    테이블 전체를 읽지 않으므로 비용이 들어오는 배치 크기에만 비례합니다.
+    author가 없으면 저장값과 같게 ""로 맞춘 뒤 해시합니다.
     """
-    existing = {(c, a) for c, a in await Quote.all().values_list("content", "author")}
-    to_create = [
-        Quote(content=it.content, author=it.author or "")
-        for it in items
-        if (it.content, it.author) not in existing
-    ]
-    if not to_create:
-        return 0
-    await Quote.bulk_create(to_create, batch_size=200)
-    return len(to_create)
+    by_hash = {}
+    for it in items:
+        author = it.author or ""
+        h = text_hash(it.content, author)
+        by_hash.setdefault(h, Quote(content=it.content, author=author, content_hash=h))
+    created = await insert_missing(Quote, "content_hash", by_hash)
+    if created:
+        # 같은 프로세스의 랜덤 명언 풀은 즉시 갱신, 다른 프로세스는 카탈로그 버전으로
+        # (memory 캐시 백엔드면 다른 프로세스에는 TTL 후 반영)
+        quote_id_pool.invalidate()
+        await catalog_cache.bump(QUOTE_CATALOG)
+    return created
+
+
+async def backfill_content_hashes() -> Tuple[int, int]:
+    """
+    content_hash가 비어 있는 기존 행을 채웁니다(마이그레이션 14 이후 1회).
+    반환: (채운 행 수, 중복으로 남긴 행 수)
+    """
+    return await backfill_hashes(
+        Quote, "content_hash", ["content", "author"], text_hash
+    )
+
+
+# ---------- 스트리밍 수집 ----------
+async def _stream_ingest(
+    args: argparse.Namespace,
+    fetcher: Fetcher,
+    state: Optional[CrawlState],
+    start_url: Optional[str],
+) -> None:
+    use_db = args.store in ("db", "both")
+    if use_db:
+        await init_db()
+    try:
+        path = ndjson_path() if args.store in ("file", "both") else None
+        near_scope = near_dup_scope(args, "quote", with_existing=use_db)
+        async with near_scope as near:
+            items = dedupe_stream(
+                iter_quotes(
+                    args.base_url,
+                    args.max_pages,
+                    concurrency=args.concurrency,
+                    parse_workers=args.parse_workers,
+                    state=state,
+                    start_url=start_url,
+                    fetcher=fetcher,
+                    parser=resolve_parser(args.parser),
+                ),
+                key=dedupe_key,
+            )
+            if near:
+                items = near_dedupe_stream(items, _near_dup_text, near)
+            with NdjsonWriter(path) if path else nullcontext() as writer:
+                stats = await run_stream(
+                    items,
+                    batch_size=args.batch_size,
+                    to_json=to_json,
+                    write_db=upsert_to_db if use_db else None,
+                    writer=writer,
+                    on_checkpoint=state.checkpoint if state else None,
+                )
+        print(f"Scraped {stats.scraped} unique quotes")
+        if near:
+            print(f"Near-duplicates dropped: {near.dropped}")
+        if path:
+            print(f"Saved file: {path}")
+        if use_db:
+            print(f"DB inserted new rows: {stats.inserted} ({stats.batches} batches)")
+    finally:
+        if use_db:
+            await Tortoise.close_connections()
 
 
 # ---------- CLI ----------
@@ -126,25 +436,110 @@ async def main():
         default=None,
         help="Limit the number of pages to scrape",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Max in-flight page requests (/page/N/ URLs are guessed ahead)",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=0,
+        help="Process pool size for HTML parsing (0 = thread pool)",
+    )
+    parser.add_argument(
+        "--parser",
+        choices=PARSER_CHOICES,
+        default="auto",
+        help="HTML parser backend (auto = lxml XPath)",
+    )
     parser.add_argument("--store", choices=["db", "file", "both"], default="db")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Write NDJSON / commit to DB in batches while crawling",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=500, help="DB commit size in --stream mode"
+    )
+    add_fetch_arguments(parser)
+    add_state_arguments(parser)
+    add_near_dup_arguments(parser)
+    parser.add_argument(
+        "--backfill-hashes",
+        action="store_true",
+        help="Fill content_hash for existing rows and exit (run once after migrating)",
+    )
     args = parser.parse_args()
 
-    items = await scrape_quotes(args.base_url, args.max_pages)
+    if args.backfill_hashes:
+        await init_db()
+        try:
+            filled, duplicates = await backfill_content_hashes()
+            print(f"Backfilled {filled} rows, left {duplicates} duplicates unhashed")
+        finally:
+            await Tortoise.close_connections()
+        return
+
+    require_stream_for_resume(args)
+    with open_state(args, crawl_key=f"quotes:{args.base_url}") as state:
+        start_url = state.resume_url() if (args.resume and state) else None
+        if start_url:
+            print(f"Resuming from {start_url}")
+        async with Fetcher.from_args(args) as fetcher:
+            await _crawl_and_store(args, fetcher, state, start_url)
+        print(f"Fetch: {fetcher.stats.summary()}")
+        if state:
+            print(f"Pages: {state.summary()}")
+
+
+async def _crawl_and_store(
+    args: argparse.Namespace,
+    fetcher: Fetcher,
+    state: Optional[CrawlState],
+    start_url: Optional[str],
+) -> None:
+    if args.stream:
+        await _stream_ingest(args, fetcher, state, start_url)
+        return
+
+    items = await scrape_quotes(
+        args.base_url,
+        args.max_pages,
+        concurrency=args.concurrency,
+        parse_workers=args.parse_workers,
+        state=state,
+        start_url=start_url,
+        fetcher=fetcher,
+        parser=resolve_parser(args.parser),
+    )
     print(f"Scraped {len(items)} unique quotes")
 
-    if args.store in ("file", "both"):
-        path = save_to_file(items)
-        print(f"Saved file: {path}")
+    use_db = args.store in ("db", "both")
+    if use_db:
+        await init_db()
+    try:
+        async with near_dup_scope(args, "quote", with_existing=use_db) as near:
+            if near:
+                items = await near.filter(items, _near_dup_text)
+                print(f"Near-duplicates dropped: {near.dropped}")
 
-    if args.store in ("db", "both"):
-        await Tortoise.init(config=TORTOISE_ORM)
-        await Tortoise.generate_schemas()
-        try:
+        if args.store in ("file", "both"):
+            path = save_to_file(items)
+            print(f"Saved file: {path}")
+
+        if use_db:
             created = await upsert_to_db(items)
             print(f"DB inserted new rows: {created}")
-        finally:
+    finally:
+        if use_db:
             await Tortoise.close_connections()
 
+    # 저장까지 끝난 뒤에만 페이지 상태를 남김
+    if state:
+        state.checkpoint()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,66 +1,127 @@
+import asyncio
+import logging
 from datetime import datetime, timezone
-from typing import Annotated, Optional
+from typing import Annotated
 
 from fastapi import Depends, HTTPException, status
+from tortoise.exceptions import IntegrityError
 
+from app.core.revocation import revocation_index
 from app.core.security import (
+    PasswordHasherBusy,
     create_access_token,
     decode_token,
-    get_password_hash,
+    get_password_hash_async,
+    get_token_id,
     oauth2_scheme,
-    verify_password,
+    password_needs_rehash,
+    verify_password_async,
 )
-from app.models.token_blacklist import TokenBlacklist
+from app.core.token_cache import token_cache
 from app.models.user import User
+from app.repositories.token_blacklist_repo import (
+    add_revoked,
+    delete_expired_batch,
+    is_revoked,
+)
 from app.repositories.user_repo import (
     create_user,
-    get_by_email,
+    find_signup_conflict,
     get_by_id,
-    get_by_username,
+    get_by_username_or_email,
+    update_password_hash,
 )
 
-# ---------- 유저 조회 유틸 ----------
+logger = logging.getLogger(__name__)
+
+# 응답과 분리해 실행하는 작업들 (GC로 사라지지 않도록 참조 유지)
+_background_tasks: set[asyncio.Task] = set()
+
 
+# ---------- 공통 에러 ----------
 
-async def _find_user_by_username_or_email(username_or_email: str) -> Optional[User]:
-    user = await get_by_username(username_or_email)
-    if user:
-        return user
-    return await get_by_email(username_or_email)
+
+def _password_hasher_busy() -> HTTPException:
+    # 해싱 풀이 포화 상태면 이벤트 루프를 막는 대신 즉시 거절
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해 주세요.",
+        headers={"Retry-After": "1"},
+    )
 
 
 # ---------- 회원가입 ----------
 
 
+_DUPLICATE_DETAILS = {
+    "username": "이미 사용 중인 사용자명입니다.",
+    "email": "이미 가입된 이메일입니다.",
+}
+
+
+async def _duplicate_user_error(username: str, email: str) -> HTTPException:
+    # 실패한 가입에서만 도는 조회: 어느 필드가 겹쳤는지 드라이버 메시지 대신 DB로 확인
+    # (그 사이 상대 행이 지워졌거나 다른 제약이었으면 일반 중복 메시지)
+    conflict = await find_signup_conflict(username, email)
+    detail = _DUPLICATE_DETAILS.get(conflict, "이미 가입된 사용자입니다.")
+    return HTTPException(status_code=400, detail=detail)
+
+
 async def register_user(username: str, email: str, password: str) -> User:
-    # 중복 체크
-    if await get_by_username(username):
-        raise HTTPException(status_code=400, detail="이미 사용 중인 사용자명입니다.")
-    if await get_by_email(email):
-        raise HTTPException(status_code=400, detail="이미 가입된 이메일입니다.")
-
-    pw_hash = get_password_hash(password)
-    user = await create_user(username=username, email=email, password_hash=pw_hash)
-    return user
+    try:
+        pw_hash = await get_password_hash_async(password)
+    except PasswordHasherBusy:
+        raise _password_hasher_busy() from None
+
+    # 중복 체크는 사전 조회 대신 DB unique 제약에 맡겨 성공 경로는 INSERT 한 번
+    try:
+        return await create_user(username=username, email=email, password_hash=pw_hash)
+    except IntegrityError:
+        raise await _duplicate_user_error(username, email) from None
 
 
 # ---------- 로그인 (토큰 발급) ----------
 
 
 async def authenticate_and_issue_token(username_or_email: str, password: str) -> str:
-    user = await _find_user_by_username_or_email(username_or_email)
-    if not user or not verify_password(password, user.password_hash):
+    user = await get_by_username_or_email(username_or_email)
+    try:
+        verified = bool(user) and await verify_password_async(
+            password, user.password_hash
+        )
+    except PasswordHasherBusy:
+        raise _password_hasher_busy() from None
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="아이디(또는 이메일) 혹은 비밀번호가 올바르지 않습니다.",
         )
     if not user.is_active:
         raise HTTPException(status_code=403, detail="비활성화된 계정입니다.")
+
+    # 해시 방식/비용 설정이 바뀌었으면 응답을 늦추지 않도록 백그라운드에서 재해싱
+    if password_needs_rehash(user.password_hash):
+        task = asyncio.create_task(_rehash_password(user.id, password))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
     # JWT 생성 (sub에 user.id 저장)
     token = create_access_token({"sub": str(user.id)})
     return token
 
 
+async def _rehash_password(user_id: int, password: str) -> None:
+    try:
+        new_hash = await get_password_hash_async(password)
+        await update_password_hash(user_id, new_hash)
+    except PasswordHasherBusy:
+        # 풀이 바쁘면 이번엔 건너뛰고 다음 로그인에서 다시 시도
+        return
+    except Exception:
+        # 로그인은 이미 성공했으므로 실패는 기록만 하고 다음 로그인에서 다시 시도
+        logger.exception("비밀번호 재해싱 실패(user_id=%s)", user_id)
+
+
 # ---------- 현재 로그인 사용자 의존성 ----------
 
 
@@ -68,18 +129,29 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> Use
     """
     - Authorization: Bearer <token> 에서 토큰 추출
     - JWT 디코드 / 블랙리스트 확인 / 유저 조회 / 활성화 확인
+    - 검증을 통과한 토큰은 token_cache에 보관해 이후 요청의 DB 조회를 생략
+
+    캐시된 토큰은 사용자를 다시 읽지 않으므로, DB에서 is_active를 끈 계정도
+    TOKEN_CACHE_TTL_SECONDS(기본 60초)가 지날 때까지 모든 워커에서 통과합니다.
     """
-    # 1) 토큰 블랙리스트 체크(로그아웃 처리된 토큰)
-    if await TokenBlacklist.filter(token=token).exists():
-        raise HTTPException(
-            status_code=401, detail="만료되었거나 로그아웃된 토큰입니다."
-        )
+    # 0) 검증 캐시 (로그아웃 시 무효화, TTL/exp 이후로는 남지 않음)
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached.user.to_user()
 
-    # 2) JWT 디코드
+    # 1) JWT 디코드
     payload = decode_token(token, refresh=False)
     if not payload:
         raise HTTPException(status_code=401, detail="유효하지 않은 토큰입니다.")
 
+    # 2) 토큰 블랙리스트 체크(로그아웃 처리된 토큰, jti 기준)
+    #    폐기 인덱스에 없으면 DB 조회 없이 통과, 후보일 때만 DB로 확정
+    token_id = get_token_id(token, payload)
+    if revocation_index.might_be_revoked(token_id) and await is_revoked(token_id):
+        raise HTTPException(
+            status_code=401, detail="만료되었거나 로그아웃된 토큰입니다."
+        )
+
     sub = payload.get("sub")
     if not sub:
         raise HTTPException(status_code=401, detail="토큰에 사용자 정보가 없습니다.")
@@ -98,6 +170,7 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> Use
     if not user.is_active:
         raise HTTPException(status_code=403, detail="비활성화된 계정입니다.")
 
+    token_cache.put(token, payload, user)
     return user
 
 
@@ -123,12 +196,39 @@ async def logout_current_token(
         else datetime.now(timezone.utc)
     )
 
-    # 중복 저장 방지
-    if await TokenBlacklist.filter(token=token).exists():
-        return
+    token_id = get_token_id(token, payload)
+    await add_revoked(jti=token_id, user_id=current_user.id, expired_at=expired_at)
+    revocation_index.add(token_id)
 
-    await TokenBlacklist.create(
-        token=token,
-        user=current_user,
-        expired_at=expired_at,
-    )
+    # 블랙리스트 기록 이후에 캐시를 비워야 재캐싱 경쟁이 생기지 않습니다.
+    token_cache.invalidate_token(token)
+
+
+# ---------- 만료된 블랙리스트 정리 ----------
+
+
+async def prune_expired_blacklist(*, batch_size: int) -> int:
+    """
+    exp가 지난 블랙리스트 행을 batch_size 단위로 삭제합니다.
+    만료된 토큰은 JWT 디코드 단계에서 이미 거부되므로 보관할 필요가 없습니다.
+    """
+    now = datetime.now(timezone.utc)
+    total = 0
+    while True:
+        deleted = await delete_expired_batch(now, batch_size=batch_size)
+        total += deleted
+        if deleted < batch_size:
+            return total
+        await asyncio.sleep(0)  # 긴 정리 중에도 다른 요청이 끼어들 수 있게 양보
+
+
+async def run_blacklist_pruner(interval_seconds: float, batch_size: int) -> None:
+    """lifespan에서 띄우는 백그라운드 루프."""
+    while True:
+        try:
+            deleted = await prune_expired_blacklist(batch_size=batch_size)
+            if deleted:
+                logger.info("만료된 블랙리스트 %d건 정리", deleted)
+        except Exception:
+            logger.exception("블랙리스트 정리 실패")
+        await asyncio.sleep(interval_seconds)
@@ -1,8 +1,13 @@
-from typing import Tuple
+from typing import Optional, Tuple
 
+from fastapi import HTTPException, status
+
+from app.core.http_cache import make_etag
+from app.core.pagination import decode_cursor, encode_cursor
 from app.models.bookmark import Bookmark
 from app.models.user import User
 from app.repositories.bookmark_repo import (
+    bookmark_list_stamp,
     create_bookmark,
     delete_bookmark,
     get_bookmark_by_user_and_quote,
@@ -28,7 +33,43 @@ async def svc_remove_bookmark(*, current_user: User, quote_id: int) -> None:
     await delete_bookmark(current_user.id, quote_id)
 
 
+async def svc_my_bookmarks_etag(
+    *, current_user: User, limit: int, offset: int, cursor: Optional[str]
+) -> str:
+    """목록 ETag: 집계(개수, 최대 id) + 페이지 파라미터로 만든 약한 태그."""
+    count, last = await bookmark_list_stamp(current_user.id)
+    return make_etag(
+        "bookmarks", current_user.id, count, last, limit, offset, cursor, weak=True
+    )
+
+
 async def svc_list_my_bookmarks(
-    *, current_user: User, limit: int = 50, offset: int = 0
-) -> list[Bookmark]:
-    return await list_bookmarks_for_user(current_user.id, limit=limit, offset=offset)
+    *,
+    current_user: User,
+    limit: int = 50,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+) -> Tuple[list[Bookmark], Optional[str]]:
+    """
+    반환: (bookmarks, next_cursor)
+    cursor가 있으면 keyset 모드로 offset은 무시합니다.
+    """
+    before_id = None
+    if cursor:
+        try:
+            (before_id,) = decode_cursor(cursor, 1)
+            before_id = int(before_id)
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="잘못된 커서입니다."
+            ) from None
+
+    # 한 건 더 읽어서 다음 페이지 존재 여부를 판단
+    items = await list_bookmarks_for_user(
+        current_user.id, limit=limit + 1, offset=offset, before_id=before_id
+    )
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1].id)
+    return items, next_cursor
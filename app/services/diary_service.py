@@ -1,9 +1,15 @@
+from datetime import datetime
+from typing import Optional
+
 from fastapi import HTTPException, status
 
+from app.core.http_cache import make_etag
+from app.core.pagination import decode_cursor, encode_cursor
 from app.models.user import User
 from app.repositories.diary_repo import (
     create_diary,
     delete_diary,
+    diary_list_stamp,
     get_diary_by_id_for_user,
     list_diaries_for_user,
     update_diary_fields,
@@ -14,8 +20,53 @@ async def svc_create_diary(*, current_user: User, title: str, content: str):
     return await create_diary(user=current_user, title=title, content=content)
 
 
-async def svc_list_my_diaries(*, current_user: User, limit: int = 20, offset: int = 0):
-    return await list_diaries_for_user(current_user.id, limit=limit, offset=offset)
+async def svc_list_my_diaries(
+    *,
+    current_user: User,
+    limit: int = 20,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+):
+    """
+    반환: (diaries, next_cursor)
+    cursor가 있으면 keyset 모드로 offset은 무시합니다.
+    next_cursor는 다음 페이지가 있을 때만 채워집니다.
+    """
+    after = None
+    if cursor:
+        try:
+            created_at, diary_id = decode_cursor(cursor, 2)
+            after = (datetime.fromisoformat(created_at), int(diary_id))
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="잘못된 커서입니다."
+            ) from None
+
+    # 한 건 더 읽어서 다음 페이지 존재 여부를 판단
+    diaries = list(
+        await list_diaries_for_user(
+            current_user.id, limit=limit + 1, offset=offset, after=after
+        )
+    )
+    next_cursor = None
+    if len(diaries) > limit:
+        diaries = diaries[:limit]
+        last = diaries[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return diaries, next_cursor
+
+
+async def svc_my_diaries_etag(
+    *, current_user: User, limit: int, offset: int, cursor: Optional[str]
+) -> str:
+    """
+    목록 ETag: 집계(개수, 최대 updated_at) + 페이지 파라미터로 만든 약한 태그.
+    목록을 읽거나 직렬화하기 전에 304로 끊을 수 있도록 쿼리 1번으로 계산합니다.
+    """
+    count, last = await diary_list_stamp(current_user.id)
+    return make_etag(
+        "diaries", current_user.id, count, last, limit, offset, cursor, weak=True
+    )
 
 
 async def svc_get_my_diary(*, current_user: User, diary_id: int):
@@ -0,0 +1,27 @@
+# benchmarks/_env.py
+"""
+벤치마크 공용 Settings 보정.
+
+app.core.config.Settings는 import 시점에 필수 값을 읽으므로,
+각 벤치마크는 app 모듈을 import 하기 전에 bootstrap_settings()를 호출합니다.
+이미 환경 변수나 .env에 있는 값은 덮어쓰지 않습니다.
+"""
+
+import os
+
+_POSTGRES_KEYS = ("POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_HOST", "POSTGRES_DB")
+
+
+def bootstrap_settings(*, postgres: bool = False) -> None:
+    """
+    JWT 설정은 항상 더미 값으로 채웁니다(벤치마크는 토큰을 쓰지 않음).
+    postgres=True면 실제 PostgreSQL에 붙는 벤치마크라 POSTGRES_*는 채우지 않습니다.
+    """
+    os.environ.setdefault("SECRET_KEY", "bench-secret")
+    os.environ.setdefault("ALGORITHM", "HS256")
+    os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+    if postgres:
+        return
+    for key in _POSTGRES_KEYS:
+        os.environ.setdefault(key, "bench")
+    os.environ.setdefault("POSTGRES_PORT", "5432")
@@ -0,0 +1,95 @@
+# benchmarks/bench_db_pool.py
+"""
+DB 커넥션 풀 크기별 처리량 부하 테스트 (실제 PostgreSQL 필요, .env의 POSTGRES_* 사용).
+
+동시 작업 N개가 일정 시간 동안 쿼리를 반복하며, 풀 크기(maxsize)를 바꿔가며
+초당 쿼리 수와 acquire 대기 시간을 잽니다. 쿼리마다 pg_sleep으로 서버 처리 시간을
+흉내 내므로, 풀이 동시 작업 수보다 작으면 대기 시간이 늘고
+처리량은 풀 크기에 비례합니다.
+
+    python -m benchmarks.bench_db_pool
+    python -m benchmarks.bench_db_pool --sizes 1 4 16 --tasks 64 --query-ms 5
+    python -m benchmarks.bench_db_pool --pgbouncer   # statement_cache_size=0 비교
+"""
+
+import argparse
+import asyncio
+import copy
+import time
+
+from benchmarks._env import bootstrap_settings
+
+# app 모듈 import 전에 Settings 필수 값 보정 (실제 PostgreSQL 사용)
+bootstrap_settings(postgres=True)
+
+from tortoise import Tortoise  # noqa: E402
+
+from app.db.database import TORTOISE_ORM  # noqa: E402
+from app.db.pool_metrics import pool_metrics  # noqa: E402
+
+
+def _config(size: int, pgbouncer: bool) -> dict:
+    config = copy.deepcopy(TORTOISE_ORM)
+    credentials = config["connections"]["default"]["credentials"]
+    credentials["minsize"] = size  # 연결 맺는 시간은 측정에서 제외
+    credentials["maxsize"] = size
+    if pgbouncer:
+        credentials["statement_cache_size"] = 0
+    return config
+
+
+async def _worker(deadline: float, query_ms: float) -> int:
+    conn = Tortoise.get_connection("default")
+    sql = "SELECT pg_sleep($1)" if query_ms else "SELECT 1"
+    values = [query_ms / 1000] if query_ms else None
+    done = 0
+    while time.perf_counter() < deadline:
+        await conn.execute_query(sql, values)
+        done += 1
+    return done
+
+
+async def _run(size: int, args: argparse.Namespace) -> dict:
+    pool_metrics.clear()
+    await Tortoise.init(config=_config(size, args.pgbouncer))
+    try:
+        await Tortoise.get_connection("default").execute_query("SELECT 1")
+        started = time.perf_counter()
+        deadline = started + args.seconds
+        counts = await asyncio.gather(
+            *(_worker(deadline, args.query_ms) for _ in range(args.tasks))
+        )
+        elapsed = time.perf_counter() - started
+        stats = pool_metrics["default"].stats()
+    finally:
+        await Tortoise.close_connections()
+    return {"qps": sum(counts) / elapsed, **stats}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="DB connection pool load test")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--tasks", type=int, default=32, help="동시 작업 수")
+    parser.add_argument(
+        "--seconds", type=float, default=3.0, help="풀 크기별 측정 시간"
+    )
+    parser.add_argument(
+        "--query-ms", type=float, default=5.0, help="쿼리당 서버 처리 시간 (pg_sleep)"
+    )
+    parser.add_argument(
+        "--pgbouncer", action="store_true", help="prepared statement 캐시 끄고 측정"
+    )
+    args = parser.parse_args()
+
+    header = ("pool", "queries/s", "avg wait ms", "max wait ms", "peak waiting")
+    print("{:>6} {:>11} {:>12} {:>12} {:>13}".format(*header))
+    for size in args.sizes:
+        r = await _run(size, args)
+        print(
+            f"{size:>6} {r['qps']:>11.1f} {r['avg_wait_ms']:>12.3f} "
+            f"{r['max_wait_ms']:>12.3f} {r['peak_waiting']:>13}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
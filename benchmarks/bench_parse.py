@@ -0,0 +1,83 @@
+# benchmarks/bench_parse.py
+"""
+HTML 파서 백엔드 처리량 벤치마크: BeautifulSoup(lxml) vs 컴파일된 lxml XPath.
+
+benchmarks/fixtures/ 의 저장된 페이지를 반복 파싱해 초당 페이지 수를 잽니다.
+- quotes: quote_scraper의 고정 선택자 파서
+- questions: question_scraper의 사용자 CSS 선택자 파서 (lxml은 cssselect 필요)
+네트워크/DB 없이 실행됩니다.
+
+    python -m benchmarks.bench_parse
+    python -m benchmarks.bench_parse --seconds 3
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from benchmarks._env import bootstrap_settings
+
+# app 모듈 import 전에 Settings 필수 값 보정
+bootstrap_settings()
+
+from app.scraping.parsers import CSSSELECT_AVAILABLE  # noqa: E402
+from app.scraping.question_scraper import HTML_PAGE_PARSERS  # noqa: E402
+from app.scraping.quote_scraper import PAGE_PARSERS  # noqa: E402
+
+FIXTURES = Path(__file__).parent / "fixtures"
+BASE_URL = "https://quotes.toscrape.com/"
+# 같은 페이지를 질문 스크래퍼의 CSS 선택자 모드로 파싱
+QUESTION_SELECTORS = (".quote", "span.text", "li.next > a")
+
+
+def _pages_per_sec(parse, pages, seconds: float) -> float:
+    parse(pages[0])  # 워밍업 (XPath 컴파일 등)
+    done = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < seconds:
+        for html in pages:
+            parse(html)
+        done += len(pages)
+    return done / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML parser backend benchmark")
+    parser.add_argument(
+        "--seconds", type=float, default=2.0, help="측정 시간(백엔드별)"
+    )
+    args = parser.parse_args()
+
+    pages = [p.read_text(encoding="utf-8") for p in sorted(FIXTURES.glob("*.html"))]
+    if not pages:
+        raise SystemExit(f"no fixture pages in {FIXTURES}")
+
+    cases = []
+    for name, fn in PAGE_PARSERS.items():
+        cases.append(("quotes", name, lambda html, fn=fn: fn(html, BASE_URL)))
+    for name, fn in HTML_PAGE_PARSERS.items():
+        if name == "lxml" and not CSSSELECT_AVAILABLE:
+            print("questions/lxml skipped: cssselect not installed")
+            continue
+        cases.append(
+            (
+                "questions",
+                name,
+                lambda html, fn=fn: fn(html, BASE_URL, *QUESTION_SELECTORS),
+            )
+        )
+
+    print(f"{len(pages)} fixture page(s), {args.seconds:.1f}s per backend")
+    print(
+        "{:>10} {:>8} {:>12} {:>9}".format("scraper", "backend", "pages/s", "speedup")
+    )
+    baseline = {}
+    for scraper, name, parse in cases:
+        rate = _pages_per_sec(parse, pages, args.seconds)
+        baseline.setdefault(scraper, rate)
+        speedup = rate / baseline[scraper]
+        print(f"{scraper:>10} {name:>8} {rate:>12.0f} {speedup:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/bench_password_hash.py
+"""
+비밀번호 해시 설정별 로그인 처리량 마이크로 벤치마크.
+
+로그인 1회의 CPU 비용은 verify 1회이므로, 단일 스레드에서 verify 평균 시간을 재서
+"코어당 초당 로그인 수"로 환산합니다.
+
+    python -m benchmarks.bench_password_hash
+    python -m benchmarks.bench_password_hash --bcrypt-rounds 10 11 12 13 --repeat 20
+"""
+
+import argparse
+import time
+
+from benchmarks._env import bootstrap_settings
+
+# app 모듈 import 전에 Settings 필수 값 보정
+bootstrap_settings()
+
+from app.core.security import build_pwd_context  # noqa: E402
+
+PASSWORD = "secret123!"
+
+
+def _bench(label: str, ctx, repeat: int) -> None:
+    hashed = ctx.hash(PASSWORD)
+    ctx.verify(PASSWORD, hashed)  # 워밍업
+    started = time.perf_counter()
+    for _ in range(repeat):
+        ctx.verify(PASSWORD, hashed)
+    per_login = (time.perf_counter() - started) / repeat
+    print(f"{label:<40} {per_login * 1000:>10.1f} ms {1 / per_login:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Password hash cost benchmark")
+    parser.add_argument("--bcrypt-rounds", type=int, nargs="*", default=[10, 11, 12])
+    parser.add_argument(
+        "--argon2",
+        nargs="*",
+        default=["2:19456:1", "3:65536:4"],
+        help="time_cost:memory_cost(KiB):parallelism (argon2-cffi 설치 시)",
+    )
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'setting':<40} {'per login':>13} {'logins/s/core':>12}")
+    for rounds in args.bcrypt_rounds:
+        ctx = build_pwd_context("bcrypt", bcrypt_rounds=rounds)
+        _bench(f"bcrypt rounds={rounds}", ctx, args.repeat)
+
+    for spec in args.argon2:
+        time_cost, memory_cost, parallelism = (int(v) for v in spec.split(":"))
+        try:
+            ctx = build_pwd_context(
+                "argon2",
+                argon2_time_cost=time_cost,
+                argon2_memory_cost=memory_cost,
+                argon2_parallelism=parallelism,
+            )
+        except RuntimeError as e:
+            print(f"argon2 {spec}: 건너뜀 ({e})")
+            continue
+        _bench(
+            f"argon2 t={time_cost} m={memory_cost} p={parallelism}", ctx, args.repeat
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# benchmarks/bench_random_quote.py
+"""
+랜덤 명언 선택 지연 시간 벤치마크: 기존 COUNT + OFFSET vs RandomIdPool.
+
+테이블 크기를 늘려가며 한 번 뽑는 데 걸리는 평균 시간을 잽니다.
+PK 풀 방식은 적재(refresh) 이후 크기와 무관하게 PK 조회 1번이라 평평해야 합니다.
+SQLite 파일 DB를 쓰므로 PostgreSQL 없이 실행됩니다.
+
+    python -m benchmarks.bench_random_quote
+    python -m benchmarks.bench_random_quote --sizes 1000 100000 10000000 --picks 200
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks._env import bootstrap_settings
+
+# app 모듈 import 전에 Settings 필수 값 보정
+bootstrap_settings()
+
+from tortoise import Tortoise  # noqa: E402
+
+from app.models.quote import Quote  # noqa: E402
+from app.repositories.id_pool import RandomIdPool  # noqa: E402
+
+_INSERT_BATCH = 50_000
+
+
+async def _fill(target: int) -> None:
+    conn = Tortoise.get_connection("default")
+    current = await Quote.all().count()
+    while current < target:
+        n = min(_INSERT_BATCH, target - current)
+        await conn.execute_many(
+            'INSERT INTO "quotes" ("content", "author") VALUES (?, ?)',
+            [[f"quote #{current + i}", "bench"] for i in range(n)],
+        )
+        current += n
+
+
+async def _legacy_pick() -> Quote:
+    count = await Quote.all().count()
+    offset = random.randint(0, count - 1)
+    return await Quote.all().offset(offset).limit(1).first()
+
+
+async def _time_avg(fn, picks: int) -> float:
+    started = time.perf_counter()
+    for _ in range(picks):
+        await fn()
+    return (time.perf_counter() - started) / picks * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Random quote selection benchmark")
+    parser.add_argument(
+        "--sizes", type=int, nargs="*", default=[1_000, 10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--picks", type=int, default=200)
+    parser.add_argument(
+        "--skip-legacy", action="store_true", help="COUNT + OFFSET 측정 생략"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.sqlite3"
+        await Tortoise.init(
+            db_url=f"sqlite://{db_path}", modules={"models": ["app.models.quote"]}
+        )
+        await Tortoise.generate_schemas()
+        try:
+            pool = RandomIdPool(Quote, ttl_seconds=3600)
+            header = ("rows", "refresh ms", "pool pick ms", "count+offset ms")
+            print("{:>12} {:>12} {:>14} {:>16}".format(*header))
+            for size in sorted(args.sizes):
+                await _fill(size)
+                started = time.perf_counter()
+                await pool.refresh()
+                refresh_ms = (time.perf_counter() - started) * 1000
+                pool_ms = await _time_avg(pool.pick, args.picks)
+                legacy = (
+                    "-"
+                    if args.skip_legacy
+                    else f"{await _time_avg(_legacy_pick, args.picks):.3f}"
+                )
+                print(f"{size:>12} {refresh_ms:>12.1f} {pool_ms:>14.3f} {legacy:>16}")
+        finally:
+            await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
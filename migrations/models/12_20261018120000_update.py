@@ -0,0 +1,18 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "question_decks" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "seed" BIGINT NOT NULL,
+    "size" INT NOT NULL,
+    "position" INT NOT NULL DEFAULT 0,
+    "user_id" INT NOT NULL UNIQUE REFERENCES "users" ("id") ON DELETE CASCADE
+);
+COMMENT ON TABLE "question_decks" IS '사용자별로 섞어 둔 질문 덱.';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "question_decks";"""
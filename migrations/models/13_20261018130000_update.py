@@ -0,0 +1,16 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    # 기존 행의 text_hash는 정규화 규칙이 파이썬 쪽에 있으므로
+    # `python -m app.scraping.question_scraper --backfill-hashes` 로 채웁니다.
+    return """
+        ALTER TABLE "questions" ADD "text_hash" VARCHAR(64);
+        CREATE UNIQUE INDEX IF NOT EXISTS "uid_questions_text_ha_9f44e9"
+            ON "questions" ("text_hash");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "uid_questions_text_ha_9f44e9";
+        ALTER TABLE "questions" DROP COLUMN "text_hash";"""
@@ -0,0 +1,16 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    # 기존 행의 content_hash는 정규화 규칙이 파이썬 쪽에 있으므로
+    # `python -m app.scraping.quote_scraper --backfill-hashes` 로 채웁니다.
+    return """
+        ALTER TABLE "quotes" ADD "content_hash" VARCHAR(64);
+        CREATE UNIQUE INDEX IF NOT EXISTS "uid_quotes_content_e575f7"
+            ON "quotes" ("content_hash");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "uid_quotes_content_e575f7";
+        ALTER TABLE "quotes" DROP COLUMN "content_hash";"""
@@ -0,0 +1,12 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    # 기존 덱은 max_id=0이라 다음 요청에서 한 번 다시 섞입니다.
+    return """
+        ALTER TABLE "question_decks" ADD "max_id" INT NOT NULL DEFAULT 0;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "question_decks" DROP COLUMN "max_id";"""
@@ -0,0 +1,23 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "token_blacklist" ADD "jti" VARCHAR(64);
+        UPDATE "token_blacklist"
+            SET "jti" = encode(sha256(convert_to("token", 'UTF8')), 'hex');
+        ALTER TABLE "token_blacklist" ALTER COLUMN "jti" SET NOT NULL;
+        ALTER TABLE "token_blacklist" DROP COLUMN "token";
+        CREATE UNIQUE INDEX IF NOT EXISTS "uid_token_black_jti_6fe842"
+            ON "token_blacklist" ("jti");
+        CREATE INDEX IF NOT EXISTS "idx_token_black_expired_f88f50"
+            ON "token_blacklist" ("expired_at");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_token_black_expired_f88f50";
+        DROP INDEX IF EXISTS "uid_token_black_jti_6fe842";
+        DELETE FROM "token_blacklist";
+        ALTER TABLE "token_blacklist" DROP COLUMN "jti";
+        ALTER TABLE "token_blacklist" ADD "token" VARCHAR(500) NOT NULL UNIQUE;"""
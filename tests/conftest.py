@@ -15,6 +15,11 @@ os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
 
 # 라우터 임포트
 from app.api.v1 import auth, diary, question, quote  # noqa: E402
+from app.core.cache import catalog_cache  # noqa: E402
+from app.core.revocation import revocation_index  # noqa: E402
+from app.core.token_cache import token_cache  # noqa: E402
+from app.repositories.question_repo import question_id_pool  # noqa: E402
+from app.repositories.quote_repo import quote_id_pool  # noqa: E402
 
 TEST_TORTOISE_ORM = {
     "connections": {"default": "sqlite://:memory:"},
@@ -28,6 +33,7 @@ TEST_TORTOISE_ORM = {
                 "app.models.bookmark",
                 "app.models.question",
                 "app.models.user_question",
+                "app.models.question_deck",
             ],
             "default_connection": "default",
         }
@@ -46,6 +52,22 @@ async def lifespan(_app: FastAPI):
         await Tortoise.close_connections()
 
 
+# 테스트마다 새 DB를 쓰므로 프로세스 내 캐시도 비워둔다
+@pytest.fixture(autouse=True)
+async def _reset_in_process_caches():
+    await catalog_cache.clear()
+    token_cache.clear()
+    revocation_index.reset()
+    quote_id_pool.invalidate()
+    question_id_pool.invalidate()
+    yield
+    await catalog_cache.clear()
+    token_cache.clear()
+    revocation_index.reset()
+    quote_id_pool.invalidate()
+    question_id_pool.invalidate()
+
+
 @pytest.fixture
 def test_app() -> FastAPI:
     app = FastAPI(lifespan=lifespan)
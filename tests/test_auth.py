@@ -1,7 +1,28 @@
 # tests/test_auth.py
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
 import pytest
+from conftest import _register_and_login
 from httpx import AsyncClient
 
+from app.core import security
+from app.core import token_cache as token_cache_module
+from app.core.revocation import revocation_index
+from app.core.security import (
+    build_pwd_context,
+    decode_token,
+    get_token_id,
+    password_hash_pool,
+)
+from app.core.token_cache import token_cache
+from app.models.token_blacklist import TokenBlacklist
+from app.models.user import User
+from app.services import auth_service
+from app.services.auth_service import prune_expired_blacklist
+
 
 @pytest.mark.asyncio
 async def test_register_login_me_logout(client: AsyncClient):
@@ -57,3 +78,234 @@ async def test_register_login_me_logout(client: AsyncClient):
         "/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"}
     )
     assert r.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_deactivated_user_rejected_after_token_cache_ttl(
+    client: AsyncClient, token_user1: str, monkeypatch: pytest.MonkeyPatch
+):
+    h = {"Authorization": f"Bearer {token_user1}"}
+
+    # 첫 호출로 토큰 검증 결과가 캐시됨
+    r = await client.get("/api/v1/auth/me", headers=h)
+    assert r.status_code == 200
+    user_id = r.json()["id"]
+
+    # DB에서 비활성화해도 캐시 TTL 동안은 그대로 통과
+    await User.filter(id=user_id).update(is_active=False)
+    r = await client.get("/api/v1/auth/me", headers=h)
+    assert r.status_code == 200
+
+    # TTL이 지나면 다시 조회해 403
+    later = time.time() + token_cache.ttl_seconds
+    monkeypatch.setattr(token_cache_module, "time", SimpleNamespace(time=lambda: later))
+    r = await client.get("/api/v1/auth/me", headers=h)
+    assert r.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_logout_with_revocation_index_loaded(
+    client: AsyncClient, token_user1: str
+):
+    h = {"Authorization": f"Bearer {token_user1}"}
+    token_id = get_token_id(token_user1, decode_token(token_user1))
+
+    # 적재 후에는 폐기되지 않은 토큰의 블랙리스트 조회가 생략됨
+    await revocation_index.load()
+    r = await client.get("/api/v1/auth/me", headers=h)
+    assert r.status_code == 200
+    assert not revocation_index.might_be_revoked(token_id)
+
+    r = await client.post("/api/v1/auth/logout", headers=h)
+    assert r.status_code == 204
+    assert revocation_index.might_be_revoked(token_id)
+
+    r = await client.get("/api/v1/auth/me", headers=h)
+    assert r.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_prune_expired_blacklist(client: AsyncClient, token_user1: str):
+    now = datetime.now(timezone.utc)
+    await TokenBlacklist.create(
+        jti="expired", user_id=1, expired_at=now - timedelta(minutes=1)
+    )
+    await TokenBlacklist.create(
+        jti="active", user_id=1, expired_at=now + timedelta(minutes=30)
+    )
+
+    deleted = await prune_expired_blacklist(batch_size=1)
+    assert deleted == 1
+    assert await TokenBlacklist.filter(jti="active").exists()
+
+
+@pytest.mark.asyncio
+async def test_login_rejected_when_hash_pool_saturated(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+):
+    r = await client.post(
+        "/api/v1/auth/register",
+        json={"username": "kim", "email": "kim@example.com", "password": "secret123!"},
+    )
+    assert r.status_code == 201
+
+    # 대기열이 가득 찬 상태 → 이벤트 루프에서 해싱하지 않고 503
+    monkeypatch.setattr(password_hash_pool, "max_pending", 0)
+    r = await client.post(
+        "/api/v1/auth/login",
+        data={"username": "kim", "password": "secret123!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_when_cost_changes(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(security, "pwd_context", build_pwd_context(bcrypt_rounds=4))
+    await _register_and_login(client, "lee", "lee@example.com")
+    user = await User.get(username="lee")
+    assert user.password_hash.startswith("$2b$04$")
+
+    # 비용 상향 후 로그인 → 응답 뒤 백그라운드에서 새 비용으로 재해싱
+    monkeypatch.setattr(security, "pwd_context", build_pwd_context(bcrypt_rounds=5))
+    r = await client.post(
+        "/api/v1/auth/login",
+        data={"username": "lee", "password": "secret123!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200
+    await asyncio.gather(*auth_service._background_tasks)
+
+    user = await User.get(username="lee")
+    assert user.password_hash.startswith("$2b$05$")
+
+
+@pytest.mark.asyncio
+async def test_register_duplicate_username_and_login_by_email(client: AsyncClient):
+    await _register_and_login(client, "park", "park@example.com")
+
+    # 중복 가입(사용자명) 실패
+    r = await client.post(
+        "/api/v1/auth/register",
+        json={"username": "park", "email": "park2@example.com", "password": "x" * 8},
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"] == "이미 사용 중인 사용자명입니다."
+
+    # 로그인(이메일로)
+    r = await client.post(
+        "/api/v1/auth/login",
+        data={"username": "park@example.com", "password": "secret123!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_register_duplicate_email(client: AsyncClient):
+    await _register_and_login(client, "choi", "choi@example.com")
+
+    r = await client.post(
+        "/api/v1/auth/register",
+        json={"username": "choi2", "email": "choi@example.com", "password": "x" * 8},
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"] == "이미 가입된 이메일입니다."
+    assert await User.filter(email="choi@example.com").count() == 1
+
+
+@pytest.mark.asyncio
+async def test_register_conflict_not_found_on_recheck_is_400(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+):
+    await _register_and_login(client, "yoon", "yoon@example.com")
+
+    # INSERT는 unique 위반으로 실패했지만 재조회 시점에는 상대 행이 사라진 경우
+    async def no_conflict(username: str, email: str):
+        return None
+
+    monkeypatch.setattr(auth_service, "find_signup_conflict", no_conflict)
+    r = await client.post(
+        "/api/v1/auth/register",
+        json={"username": "yoon", "email": "yoon2@example.com", "password": "x" * 8},
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"] == "이미 가입된 사용자입니다."
+
+
+@pytest.mark.asyncio
+async def test_revocation_sync_catches_out_of_order_ids(
+    client: AsyncClient, token_user1: str
+):
+    user = await User.get(username="alice")
+    expired_at = datetime.now(timezone.utc) + timedelta(hours=1)
+
+    async def revoke(row_id: int, jti: str):
+        await TokenBlacklist.create(
+            id=row_id, jti=jti, user_id=user.id, expired_at=expired_at
+        )
+
+    await revoke(1, "a")
+    await revocation_index.load()
+
+    # 다른 워커의 로그아웃: id 5가 먼저 커밋되고, 더 작은 id 3이 나중에 커밋됨
+    await revoke(5, "late-high")
+    await revocation_index.sync()
+    await revoke(3, "late-low")
+    assert not revocation_index.might_be_revoked("late-low")
+    await revocation_index.sync()
+    assert revocation_index.might_be_revoked("late-low")
+    assert revocation_index.might_be_revoked("late-high")
+
+    # 다시 훑어도 이미 반영한 행은 중복으로 세지 않음
+    await revocation_index.sync()
+    assert revocation_index.stats()["entries"] == 3
+
+
+@pytest.mark.asyncio
+async def test_revocation_full_reload_catches_ids_outside_overlap(
+    client: AsyncClient, token_user1: str, monkeypatch
+):
+    user = await User.get(username="alice")
+    expired_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    monkeypatch.setattr(revocation_index, "overlap_ids", 2)
+
+    await TokenBlacklist.create(id=10, jti="x", user_id=user.id, expired_at=expired_at)
+    await revocation_index.load()
+    await TokenBlacklist.create(
+        id=2, jti="stale", user_id=user.id, expired_at=expired_at
+    )
+    await revocation_index.sync()
+    assert not revocation_index.might_be_revoked("stale")  # 겹침 창(2) 밖
+
+    # 전체 재적재 주기가 지나면 반영
+    monkeypatch.setattr(revocation_index, "full_reload_seconds", 0.0)
+    await revocation_index.sync()
+    assert revocation_index.might_be_revoked("stale")
+
+
+@pytest.mark.asyncio
+async def test_revocation_reload_keeps_logout_added_mid_reload(
+    client: AsyncClient, token_user1: str, monkeypatch
+):
+    await revocation_index.load()
+    consume = revocation_index._consume
+
+    # 전체 재적재가 DB 스냅샷을 읽은 뒤, 교체 전에 이 워커에서 로그아웃이 일어남
+    async def consume_then_logout(*args, **kwargs):
+        last_id = await consume(*args, **kwargs)
+        revocation_index.add("mid-reload")
+        return last_id
+
+    monkeypatch.setattr(revocation_index, "_consume", consume_then_logout)
+    await revocation_index.load()
+    assert revocation_index.might_be_revoked("mid-reload")
+
+    # 재적재가 끝나면 더는 따로 모으지 않음
+    monkeypatch.setattr(revocation_index, "_consume", consume)
+    revocation_index.add("after-reload")
+    assert revocation_index._added_during_load is None
+    assert revocation_index.might_be_revoked("after-reload")
@@ -0,0 +1,155 @@
+# tests/test_cache.py
+import fnmatch
+import time
+
+import pytest
+
+from app.core.cache import (
+    CacheBackend,
+    CatalogCache,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+)
+from app.models.quote import Quote
+from app.repositories import quote_repo
+from app.scraping.quote_scraper import QuoteItem, upsert_to_db
+
+
+class FakeRedis:
+    """redis.asyncio.Redis에서 캐시가 쓰는 명령만 흉내 낸 인메모리 대역"""
+
+    def __init__(self):
+        self.data = {}  # key → (value, 만료 시각 또는 None)
+        self.fail = False
+        self.closed = False
+
+    def _check(self):
+        if self.fail:
+            raise ConnectionError("redis down")
+
+    async def get(self, key):
+        self._check()
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.data.pop(key)
+            return None
+        return value
+
+    async def set(self, key, value, px=None):
+        self._check()
+        expires_at = time.monotonic() + px / 1000 if px else None
+        self.data[key] = (
+            value if isinstance(value, bytes) else str(value).encode(),
+            expires_at,
+        )
+
+    async def incr(self, key):
+        self._check()
+        value = int(await self.get(key) or 0) + 1
+        self.data[key] = (str(value).encode(), None)
+        return value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def aclose(self):
+        self.closed = True
+
+    async def scan_iter(self, match="*"):
+        for key in list(self.data):
+            if fnmatch.fnmatch(key, match):
+                yield key
+
+
+@pytest.fixture(params=["memory", "redis"])
+def cache(request):
+    if request.param == "memory":
+        backend = MemoryCacheBackend(maxsize=100)
+    else:
+        backend = RedisCacheBackend(FakeRedis())
+    return CatalogCache(backend, ttl_seconds=60)
+
+
+async def test_catalog_cache_hits_and_version_bump(cache):
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return {"n": len(loads)}
+
+    assert await cache.get_or_load("quote", "k", load) == {"n": 1}
+    assert await cache.get_or_load("quote", "k", load) == {"n": 1}
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    # 다른 카탈로그의 bump는 영향 없음
+    await cache.bump("question")
+    assert await cache.get_or_load("quote", "k", load) == {"n": 1}
+
+    before = await cache.version("quote")
+    assert await cache.bump("quote") == before + 1
+    assert await cache.get_or_load("quote", "k", load) == {"n": 2}
+    assert len(loads) == 2
+
+    await cache.clear()
+    assert await cache.get_or_load("quote", "k", load) == {"n": 3}
+
+
+async def test_memory_backend_lru_and_ttl():
+    backend = MemoryCacheBackend(maxsize=2)
+    await backend.set("a", b"1")
+    await backend.set("b", b"2")
+    await backend.get("a")  # a를 최근으로
+    await backend.set("c", b"3")
+    assert await backend.get("b") is None
+    assert await backend.get("a") == b"1"
+
+    await backend.set("t", b"x", ttl=0.01)
+    time.sleep(0.02)
+    assert await backend.get("t") is None
+
+
+async def test_backend_interface_and_close():
+    with pytest.raises(TypeError):
+        CacheBackend()  # 추상 클래스
+
+    fake = FakeRedis()
+    await CatalogCache(RedisCacheBackend(fake), ttl_seconds=60).aclose()
+    assert fake.closed
+    await CatalogCache(None, ttl_seconds=60).aclose()  # 캐시 꺼짐: 아무 일 없음
+
+
+async def test_redis_outage_falls_back_to_db():
+    fake = FakeRedis()
+    cache = CatalogCache(RedisCacheBackend(fake), ttl_seconds=60)
+
+    async def load():
+        return [1, 2]
+
+    fake.fail = True
+    assert await cache.get_or_load("quote", "k", load) == [1, 2]
+    assert await cache.bump("quote") == 0
+    assert cache.stats()["errors"] == 2
+
+    fake.fail = False
+    await cache.get_or_load("quote", "k", load)
+    assert await cache.get_or_load("quote", "k", load) == [1, 2]
+    assert cache.stats()["hits"] == 1
+
+
+async def test_quote_reads_served_from_cache_until_scraper_bump(client):
+    await Quote.create(content="first", author="a")
+    quotes = await quote_repo.list_quotes()
+    assert [q.content for q in quotes] == ["first"]
+    quote_id = quotes[0].id
+
+    # 캐시 밖에서 바뀐 행: 이미 캐시된 목록은 버전이 오르기 전까지 그대로
+    await Quote.filter(id=quote_id).update(content="changed")
+    assert [q.content for q in await quote_repo.list_quotes()] == ["first"]
+    assert (await quote_repo.get_quote_by_id(quote_id)).content == "changed"
+    assert (await quote_repo.get_quote_by_id(quote_id)).content == "changed"
+    assert (await quote_repo.get_random_quote()).content == "changed"
+
+    # 스크래퍼 insert → 카탈로그 버전 증가 → 다음 읽기에 반영
+    assert await upsert_to_db([QuoteItem(content="second", author="b")]) == 1
+    assert [q.content for q in await quote_repo.list_quotes()] == ["second", "changed"]
@@ -0,0 +1,223 @@
+# tests/test_db.py
+import asyncio
+import copy
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from tortoise import Tortoise, connections
+from tortoise.utils import get_schema_sql
+
+from app.core.config import settings
+from app.db.asyncpg_pool import InstrumentedPool
+from app.db.database import (
+    MIGRATIONS_DIR,
+    MigrationMismatch,
+    check_migrations,
+    latest_migration,
+)
+from app.db.pool_metrics import PoolMetrics
+from app.db.routing import REPLICA, read_router
+from app.models.quote import Quote
+from app.repositories import diary_repo, quote_repo, user_repo
+from tests.conftest import TEST_TORTOISE_ORM
+
+
+class _FakePool:
+    """asyncpg.Pool 흉내: size개 연결을 세마포어로 빌려줌"""
+
+    def __init__(self, size: int):
+        self._free = asyncio.Semaphore(size)
+        self._size = size
+
+    async def acquire(self, *, timeout=None):
+        await asyncio.wait_for(self._free.acquire(), timeout)
+        return object()
+
+    async def release(self, connection, *, timeout=None):
+        self._free.release()
+
+    def get_size(self):
+        return self._size
+
+    def get_idle_size(self):
+        return self._free._value
+
+
+async def test_instrumented_pool_tracks_wait_and_saturation():
+    metrics = PoolMetrics()
+    fake = _FakePool(2)
+    metrics.bind(fake, 2)
+    pool = InstrumentedPool(fake, metrics)
+
+    async def query():
+        conn = await pool.acquire()
+        await asyncio.sleep(0.02)
+        await pool.release(conn)
+
+    await asyncio.gather(*(query() for _ in range(6)))
+    stats = metrics.stats()
+    assert stats["acquires"] == 6
+    assert stats["in_use"] == 0 and stats["waiting"] == 0
+    assert stats["peak_in_use"] == 2  # 풀 크기에서 포화
+    assert stats["peak_waiting"] >= 4
+    assert stats["max_wait_ms"] >= 30  # 뒤쪽 작업은 두 바퀴 대기
+    assert stats["idle"] == 2  # 나머지 속성은 원래 풀로 전달
+
+
+async def test_instrumented_pool_acquire_timeout_not_counted():
+    metrics = PoolMetrics()
+    fake = _FakePool(1)
+    metrics.bind(fake, 1)
+    pool = InstrumentedPool(fake, metrics)
+
+    held = await pool.acquire()
+    try:
+        await pool.acquire(timeout=0.01)
+    except asyncio.TimeoutError:
+        pass
+    else:
+        raise AssertionError("acquire should time out")
+    assert metrics.stats()["waiting"] == 0
+    assert metrics.stats()["acquires"] == 1
+    assert metrics.stats()["saturation"] == 1.0
+    await pool.release(held)
+
+
+# ---------- production 기동: 마이그레이션 버전 확인 ----------
+async def _set_aerich_version(version):
+    conn = connections.get("default")
+    await conn.execute_script(
+        "CREATE TABLE IF NOT EXISTS aerich "
+        "(id INTEGER PRIMARY KEY AUTOINCREMENT, version VARCHAR(255), "
+        "app VARCHAR(100), content JSON)"
+    )
+    await conn.execute_query(
+        "INSERT INTO aerich (version, app, content) VALUES (?, 'models', '{}')",
+        [version],
+    )
+
+
+def test_latest_migration_picks_highest_number(tmp_path):
+    for name in ("2_20250101_update.py", "10_20250301_update.py", "9_x.py"):
+        (tmp_path / name).write_text("")
+    (tmp_path / "__init__.py").write_text("")
+    assert latest_migration(tmp_path) == "10_20250301_update.py"
+    assert latest_migration(MIGRATIONS_DIR).startswith("15_")
+
+
+async def test_check_migrations(client, tmp_path):
+    (tmp_path / "3_20250101_update.py").write_text("")
+
+    # aerich 테이블이 없으면 기동 실패
+    with pytest.raises(MigrationMismatch):
+        await check_migrations(tmp_path)
+
+    await _set_aerich_version("2_20241201_update.py")
+    with pytest.raises(MigrationMismatch):
+        await check_migrations(tmp_path)
+
+    await _set_aerich_version("3_20250101_update.py")
+    assert await check_migrations(tmp_path) == "3_20250101_update.py"
+
+    # DB가 앞선 경우(롤링 배포 중 구버전 워커)는 통과
+    await _set_aerich_version("4_20250201_update.py")
+    assert await check_migrations(tmp_path) == "4_20250201_update.py"
+
+
+# ---------- 읽기 복제본 라우팅 ----------
+@pytest.fixture
+async def replica_db(monkeypatch):
+    """primary/replica 각각 별도 인메모리 DB (복제본은 비어 있어 '아직 복제 안 됨')"""
+    config = copy.deepcopy(TEST_TORTOISE_ORM)
+    config["connections"][REPLICA] = "sqlite://:memory:"
+    await Tortoise.init(config=config)
+    await Tortoise.generate_schemas()
+    schema = get_schema_sql(connections.get("default"), safe=True)
+    await connections.get(REPLICA).execute_script(schema)
+    monkeypatch.setattr(settings, "DB_REPLICA_HOST", "replica.test")
+    read_router.reset()
+    try:
+        yield
+    finally:
+        read_router.reset()
+        await Tortoise.close_connections()
+
+
+async def test_reads_go_to_replica_except_after_own_write(replica_db, monkeypatch):
+    user = await user_repo.create_user(
+        username="carol", email="carol@example.com", password_hash="x"
+    )
+    await diary_repo.create_diary(user=user, title="t", content="c")
+    bob = await user_repo.create_user(
+        username="bob", email="bob@example.com", password_hash="x"
+    )
+
+    # 방금 쓴 사용자: primary에서 읽어 자기 글이 보임
+    assert read_router.is_sticky(user.id)
+    assert len(await diary_repo.list_diaries_for_user(user.id)) == 1
+    assert (await user_repo.get_by_id(user.id)).username == "carol"
+
+    # 스티키 창이 지나면 복제본(비어 있음)에서 읽음
+    monkeypatch.setattr(settings, "DB_REPLICA_STICKY_SECONDS", 0.0)
+    read_router.mark_write(bob.id)  # 창이 0이면 바로 만료
+    read_router.reset()
+    assert await diary_repo.list_diaries_for_user(user.id) == []
+    assert await user_repo.get_by_id(bob.id) is None
+    assert await quote_repo.list_quotes() == []
+    # PK 조회(랜덤 명언이 쓰는 로더)도 복제본으로: primary에만 있는 행은 안 보임
+    quote = await Quote.create(content="only on primary", author="a")
+    assert await quote_repo.get_quote_by_id(quote.id) is None
+
+    stats = read_router.stats()
+    assert stats["enabled"] and stats["sticky_users"] == 0
+    assert stats["replica_reads"] == 4 and stats["sticky_reads"] == 2
+
+
+async def test_routing_disabled_without_replica(client):
+    read_router.mark_write(1)
+    assert read_router.read_db(1) is None
+    assert read_router.stats()["sticky_users"] == 0
+
+
+async def test_metrics_endpoint_disabled_by_default():
+    # 테스트 앱이 아닌 실제 앱 기준: 설정을 켜지 않으면 라우트 자체가 없음
+    from app.main import app
+
+    assert not settings.METRICS_ENABLED
+    transport = ASGITransport(app=app)  # lifespan(DB 연결)은 돌리지 않음
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        assert (await ac.get("/")).status_code == 200
+        assert (await ac.get(f"{settings.API_V1_STR}/metrics")).status_code == 404
+
+
+async def test_lifespan_shutdown_awaits_tasks_and_closes_db(monkeypatch):
+    from app import main
+
+    finished = []
+
+    async def init_db():
+        await Tortoise.init(config=TEST_TORTOISE_ORM)
+
+    async def background(*_args):
+        try:
+            await asyncio.sleep(3600)
+        finally:
+            await asyncio.sleep(0)  # 취소 뒤 정리 작업이 있어도 끝까지 기다림
+            finished.append(True)
+
+    monkeypatch.setattr(main, "init_db", init_db)
+    monkeypatch.setattr(main.revocation_index, "run", background)
+    monkeypatch.setattr(main, "run_blacklist_pruner", background)
+    closed = []
+    close_connections = Tortoise.close_connections
+
+    async def record_close():
+        closed.append(len(finished))
+        await close_connections()
+
+    monkeypatch.setattr(Tortoise, "close_connections", record_close)
+
+    async with main.lifespan(main.app):
+        await asyncio.sleep(0)
+    assert finished == [True, True]
+    assert closed == [2]  # 두 작업이 끝난 다음에 연결을 닫음
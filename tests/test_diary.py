@@ -55,3 +55,69 @@ async def test_diary_crud_and_permissions(
     # 다시 조회 → 404
     r = await client.get(f"/api/v1/diary/{diary_id}", headers=h1)
     assert r.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_diary_cursor_pagination(client: AsyncClient, token_user1: str):
+    h1 = {"Authorization": f"Bearer {token_user1}"}
+    created = []
+    for i in range(5):
+        r = await client.post(
+            "/api/v1/diary", json={"title": f"t{i}", "content": "c"}, headers=h1
+        )
+        created.append(r.json()["id"])
+
+    # 첫 페이지는 일반 요청, 이후는 X-Next-Cursor를 따라감
+    seen = []
+    r = await client.get("/api/v1/diary/my?limit=2", headers=h1)
+    while True:
+        assert r.status_code == 200
+        seen.extend(item["id"] for item in r.json())
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        r = await client.get(f"/api/v1/diary/my?limit=2&cursor={cursor}", headers=h1)
+
+    assert seen == list(reversed(created))
+
+    # 잘못된 커서 → 400
+    r = await client.get("/api/v1/diary?cursor=not-a-cursor", headers=h1)
+    assert r.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_diary_list_etag_304(
+    client: AsyncClient, token_user1: str, token_user2: str
+):
+    h1 = {"Authorization": f"Bearer {token_user1}"}
+    r = await client.post(
+        "/api/v1/diary", json={"title": "a", "content": "x"}, headers=h1
+    )
+    diary_id = r.json()["id"]
+
+    r = await client.get("/api/v1/diary", headers=h1)
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+    assert etag.startswith("W/")
+    assert r.headers["cache-control"] == "private, no-cache"
+
+    # 변경 없음 → 본문 없는 304
+    r = await client.get("/api/v1/diary", headers={**h1, "If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+    assert r.headers["etag"] == etag
+
+    # 다른 페이지 파라미터/다른 사용자는 다른 태그
+    r = await client.get("/api/v1/diary?limit=5", headers={**h1, "If-None-Match": etag})
+    assert r.status_code == 200
+    h2 = {"Authorization": f"Bearer {token_user2}"}
+    r = await client.get("/api/v1/diary", headers={**h2, "If-None-Match": etag})
+    assert r.status_code == 200
+
+    # 수정하면 태그가 바뀌어 다시 200
+    r = await client.put(f"/api/v1/diary/{diary_id}", json={"title": "b"}, headers=h1)
+    assert r.status_code == 200
+    r = await client.get("/api/v1/diary", headers={**h1, "If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.json()[0]["title"] == "b"
+    assert r.headers["etag"] != etag
@@ -2,7 +2,10 @@ import pytest
 from httpx import AsyncClient
 
 from app.models.question import Question
+from app.models.question_deck import QuestionDeck
 from app.models.user_question import UserQuestion
+from app.repositories import question_repo
+from app.repositories.question_repo import question_id_pool
 
 
 @pytest.mark.asyncio
@@ -40,3 +43,75 @@ async def test_random_question_and_seen_record(client: AsyncClient, token_user1:
     # UserQuestion 기록이 남는지 간단히 확인
     cnt = await UserQuestion.filter(user_id=1).count()
     assert cnt >= 1
+
+
+@pytest.mark.asyncio
+async def test_question_deck_serves_every_question_once(
+    client: AsyncClient, token_user1: str
+):
+    for i in range(10):
+        await Question.create(question_text=f"질문 {i}")
+    h = {"Authorization": f"Bearer {token_user1}"}
+
+    # 덱을 한 바퀴 도는 동안은 본 질문이 다시 나오지 않음
+    ids = []
+    for _ in range(10):
+        r = await client.get("/api/v1/question/random", headers=h)
+        assert r.status_code == 200
+        ids.append(r.json()["id"])
+    assert len(set(ids)) == 10
+
+    # 모두 본 뒤에도 랜덤 질문은 계속 제공됨
+    r = await client.get("/api/v1/question/random", headers=h)
+    assert r.status_code == 200
+
+    # 새 질문이 추가되면 (덱을 다시 섞고) 그 질문을 찾아 보여줌
+    new_q = await Question.create(question_text="새 질문")
+    question_id_pool.invalidate()
+    r = await client.get("/api/v1/question/random", headers=h)
+    assert r.json()["id"] == new_q.id
+
+
+@pytest.mark.asyncio
+async def test_unseen_question_found_after_delete_and_add(
+    client: AsyncClient, token_user1: str
+):
+    questions = [await Question.create(question_text=f"질문 {i}") for i in range(3)]
+    h = {"Authorization": f"Bearer {token_user1}"}
+    user_id = (await client.get("/api/v1/auth/me", headers=h)).json()["id"]
+
+    # 두 개를 보고, 남은 하나는 삭제 → 덱을 끝까지 소진
+    for q in questions[:2]:
+        await UserQuestion.create(user_id=user_id, question_id=q.id, seen=True)
+    await questions[2].delete()
+    await QuestionDeck.create(
+        user_id=user_id, seed=1, size=3, max_id=questions[2].id, position=3
+    )
+
+    # 개수는 그대로(3)인 채 새 질문 추가: 최대 id가 바뀌어 덱을 다시 섞음
+    new_q = await Question.create(question_text="새 질문")
+    question_id_pool.invalidate()
+    r = await client.get("/api/v1/question/random", headers=h)
+    assert r.status_code == 200
+    assert r.json()["id"] == new_q.id
+
+
+@pytest.mark.asyncio
+async def test_exhausted_deck_skips_anti_join(
+    client: AsyncClient, token_user1: str, monkeypatch: pytest.MonkeyPatch
+):
+    questions = [await Question.create(question_text=f"질문 {i}") for i in range(2)]
+    h = {"Authorization": f"Bearer {token_user1}"}
+    for _ in questions:
+        assert (
+            await client.get("/api/v1/question/random", headers=h)
+        ).status_code == 200
+
+    # 전부 본 상태: 카탈로그가 그대로면 스캔 없이 None → 서비스가 아무 질문이나 제공
+    async def no_scan(*args):
+        raise AssertionError("덱이 끝났는데 anti-join을 실행함")
+
+    monkeypatch.setattr(question_repo, "_random_unseen_by_anti_join", no_scan)
+    r = await client.get("/api/v1/question/random", headers=h)
+    assert r.status_code == 200
+    assert r.json()["id"] in {q.id for q in questions}
@@ -1,8 +1,14 @@
 # tests/test_quote.py
+from types import SimpleNamespace
+
 import pytest
+from fastapi.middleware.cors import CORSMiddleware
 from httpx import AsyncClient
 
+from app.core.pagination import NEXT_CURSOR_HEADER
 from app.models.quote import Quote
+from app.repositories import id_pool
+from app.repositories.id_pool import RandomIdPool
 
 
 @pytest.mark.asyncio
@@ -45,3 +51,122 @@ async def test_random_quote_and_bookmark_flow(client: AsyncClient, token_user1:
     assert r.status_code == 200
     items = r.json()
     assert not any(bm["quote"]["id"] == quote_id for bm in items)
+
+
+@pytest.mark.asyncio
+async def test_bookmark_cursor_pagination(client: AsyncClient, token_user1: str):
+    h = {"Authorization": f"Bearer {token_user1}"}
+    quote_ids = []
+    for i in range(5):
+        q = await Quote.create(content=f"quote {i}", author="someone")
+        r = await client.post(f"/api/v1/quote/{q.id}/bookmark", headers=h)
+        assert r.status_code == 201
+        quote_ids.append(q.id)
+
+    seen = []
+    r = await client.get("/api/v1/quote/bookmarks?limit=2", headers=h)
+    while True:
+        assert r.status_code == 200
+        seen.extend(bm["quote"]["id"] for bm in r.json())
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        r = await client.get(
+            f"/api/v1/quote/bookmarks?limit=2&cursor={cursor}", headers=h
+        )
+
+    assert seen == list(reversed(quote_ids))
+
+
+@pytest.mark.asyncio
+async def test_bookmark_list_etag_304(client: AsyncClient, token_user1: str):
+    q1 = await Quote.create(content="one", author="a")
+    q2 = await Quote.create(content="two", author="b")
+    h = {"Authorization": f"Bearer {token_user1}"}
+    await client.post(f"/api/v1/quote/{q1.id}/bookmark", headers=h)
+
+    r = await client.get("/api/v1/quote/bookmarks", headers=h)
+    etag = r.headers["etag"]
+    r = await client.get(
+        "/api/v1/quote/bookmarks", headers={**h, "If-None-Match": etag}
+    )
+    assert r.status_code == 304
+
+    # 추가/삭제 모두 태그를 바꿈
+    await client.post(f"/api/v1/quote/{q2.id}/bookmark", headers=h)
+    r = await client.get(
+        "/api/v1/quote/bookmarks", headers={**h, "If-None-Match": etag}
+    )
+    assert r.status_code == 200 and len(r.json()) == 2
+    etag = r.headers["etag"]
+    await client.delete(f"/api/v1/quote/{q1.id}/bookmark", headers=h)
+    r = await client.get(
+        "/api/v1/quote/bookmarks", headers={**h, "If-None-Match": etag}
+    )
+    assert r.status_code == 200 and len(r.json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_random_quote_no_etag(client: AsyncClient, token_user1: str):
+    await Quote.create(content="Stay hungry, stay foolish.", author="Steve Jobs")
+    h = {"Authorization": f"Bearer {token_user1}"}
+
+    # 요청마다 랜덤이라 재검증 태그 없이 공유 캐시 저장만 막음
+    r = await client.get("/api/v1/quote/random", headers=h)
+    assert r.status_code == 200
+    assert r.headers["cache-control"] == "private, no-cache"
+    assert "etag" not in r.headers
+
+
+def test_cors_exposes_etag():
+    # 테스트 앱에는 CORS가 없으므로 실제 앱의 미들웨어 설정을 확인
+    from app.main import app
+
+    cors = next(m for m in app.user_middleware if m.cls is CORSMiddleware)
+    assert {"ETag", NEXT_CURSOR_HEADER} <= set(cors.kwargs["expose_headers"])
+
+
+# ---------- RandomIdPool ----------
+@pytest.mark.asyncio
+async def test_id_pool_empty_table_then_loads_new_rows(client: AsyncClient):
+    pool = RandomIdPool(Quote, ttl_seconds=60)
+    assert await pool.pick() is None
+    assert len(pool) == 0
+
+    # 빈 풀은 TTL과 무관하게 다음 호출에서 다시 적재
+    q = await Quote.create(content="first", author="a")
+    assert (await pool.pick()).id == q.id
+
+
+@pytest.mark.asyncio
+async def test_id_pool_refreshes_after_ttl(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+):
+    clock = [1000.0]
+    monkeypatch.setattr(id_pool, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+    pool = RandomIdPool(Quote, ttl_seconds=60)
+    await Quote.create(content="first", author="a")
+    assert len(await pool.ids()) == 1
+
+    # invalidate 없이 추가된 행은 TTL 안에서는 보이지 않음
+    await Quote.create(content="second", author="b")
+    clock[0] += 59
+    assert len(await pool.ids()) == 1
+    clock[0] += 1
+    assert len(await pool.ids()) == 2
+
+
+@pytest.mark.asyncio
+async def test_id_pool_reloads_and_retries_when_picked_row_deleted(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+):
+    gone = await Quote.create(content="gone", author="a")
+    kept = await Quote.create(content="kept", author="b")
+    pool = RandomIdPool(Quote, ttl_seconds=60)
+    assert list(await pool.ids()) == [gone.id, kept.id]
+
+    await Quote.filter(id=gone.id).delete()
+    # 첫 선택은 삭제된 PK → 재적재 후 남은 PK로 다시 시도
+    monkeypatch.setattr(id_pool, "random", SimpleNamespace(choice=lambda ids: ids[0]))
+    assert (await pool.pick()).id == kept.id
+    assert len(pool) == 1
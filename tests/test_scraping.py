@@ -0,0 +1,462 @@
+# tests/test_scraping.py
+import argparse
+import asyncio
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.models.question import Question
+from app.models.quote import Quote
+from app.scraping import orchestrator, question_scraper, quote_scraper
+from app.scraping.crawl_state import (
+    CrawlState,
+    open_state,
+    require_stream_for_resume,
+)
+from app.scraping.dedupe import cluster, minhash, open_near_dup_filter
+from app.scraping.fetch import Fetcher, TokenBucket
+from app.scraping.json_stream import iter_json_field
+from app.scraping.orchestrator import load_manifest, run_sources
+from app.scraping.pipeline import NdjsonWriter, dedupe_stream, run_stream
+from app.scraping.question_scraper import HTML_PAGE_PARSERS, QuestionItem
+from app.scraping.quote_scraper import PAGE_PARSERS, QuoteItem, iter_quote_pages
+
+LAST_PAGE = 5
+
+
+def _quote_page(n: int) -> str:
+    quotes = "".join(
+        f'<div class="quote"><span class="text">“q{n}-{i}”</span>'
+        f'<small class="author">author{n}</small></div>'
+        for i in range(2)
+    )
+    nxt = (
+        f'<li class="next"><a href="/page/{n + 1}/">Next</a></li>'
+        if n < LAST_PAGE
+        else ""
+    )
+    return f"<html><body>{quotes}<ul>{nxt}</ul></body></html>"
+
+
+def _quote_site(request: httpx.Request) -> httpx.Response:
+    path = request.url.path
+    n = 1 if path == "/" else int(path.strip("/").split("/")[1])
+    if n > LAST_PAGE:
+        return httpx.Response(200, text="<html><body>No quotes found!</body></html>")
+    return httpx.Response(200, text=_quote_page(n))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("concurrency", [1, 3])
+async def test_iter_quote_pages_in_order(concurrency: int):
+    async with Fetcher(transport=httpx.MockTransport(_quote_site)) as client:
+        pages = [
+            page
+            async for page in iter_quote_pages(
+                client, "http://quotes.test/", concurrency=concurrency
+            )
+        ]
+    assert [p[0].author for p in pages] == [f"author{n}" for n in range(1, 6)]
+    assert pages[0][0].content == "q1-0"
+
+
+@pytest.mark.asyncio
+async def test_iter_quote_pages_respects_max_pages():
+    async with Fetcher(transport=httpx.MockTransport(_quote_site)) as client:
+        pages = [
+            page
+            async for page in iter_quote_pages(
+                client, "http://quotes.test/", max_pages=3, concurrency=4
+            )
+        ]
+    assert len(pages) == 3
+
+
+@pytest.mark.asyncio
+async def test_run_stream_dedupes_and_commits_in_batches(tmp_path):
+    async def items():
+        for i in [1, 2, 2, 3, 4, 1, 5]:
+            yield str(i)
+
+    committed = []
+
+    async def write_db(batch):
+        committed.append(list(batch))
+        return len(batch)
+
+    path = tmp_path / "out.ndjson"
+    with NdjsonWriter(path) as writer:
+        stats = await run_stream(
+            dedupe_stream(items(), key=lambda s: s),
+            batch_size=2,
+            to_json=lambda s: {"v": s},
+            write_db=write_db,
+            writer=writer,
+        )
+
+    assert committed == [["1", "2"], ["3", "4"], ["5"]]
+    assert (stats.scraped, stats.inserted, stats.batches) == (5, 5, 3)
+    assert path.read_text(encoding="utf-8").splitlines()[0] == '{"v": "1"}'
+
+
+@pytest.mark.asyncio
+async def test_run_stream_propagates_crawler_error():
+    async def items():
+        yield "a"
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await run_stream(items(), batch_size=10, to_json=lambda s: {"v": s})
+
+
+@pytest.mark.asyncio
+async def test_question_bulk_upsert_counts_only_new_rows(client):
+    items = [
+        QuestionItem("오늘 무엇을 배웠나?"),
+        QuestionItem("오늘  무엇을 배웠나? "),  # 공백만 다른 중복
+        QuestionItem("내일 무엇을 할까?"),
+    ]
+    assert await question_scraper.upsert_to_db(items) == 2
+    assert await question_scraper.upsert_to_db(items) == 0
+    assert await Question.all().count() == 2
+
+
+@pytest.mark.asyncio
+async def test_question_backfill_text_hashes(client):
+    await Question.create(question_text="기존 질문")
+    await Question.create(question_text="기존  질문")
+    assert await question_scraper.backfill_text_hashes() == (1, 1)
+    assert await question_scraper.upsert_to_db([QuestionItem("기존 질문")]) == 0
+
+
+@pytest.mark.asyncio
+async def test_quote_upsert_treats_missing_author_as_empty(client):
+    await Quote.create(content="Be yourself.", author="")
+    assert await quote_scraper.backfill_content_hashes() == (1, 0)
+
+    items = [
+        QuoteItem("Be yourself.", None),
+        QuoteItem("Be yourself.", "Oscar Wilde"),
+    ]
+    assert await quote_scraper.upsert_to_db(items) == 1
+    assert await quote_scraper.upsert_to_db(items) == 0
+    assert await Quote.all().count() == 2
+
+
+def _etag_quote_site(request: httpx.Request) -> httpx.Response:
+    resp = _quote_site(request)
+    etag = f'"{request.url.path}"'
+    if request.headers.get("if-none-match") == etag:
+        return httpx.Response(304)
+    resp.headers["ETag"] = etag
+    return resp
+
+
+async def _crawl(state: CrawlState, **kwargs) -> list:
+    async with Fetcher(transport=httpx.MockTransport(_etag_quote_site)) as client:
+        return [
+            page
+            async for page in iter_quote_pages(
+                client, "http://quotes.test/", state=state, **kwargs
+            )
+        ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("concurrency", [1, 3])
+async def test_crawl_state_skips_unchanged_pages(tmp_path, concurrency: int):
+    path = tmp_path / "state.sqlite3"
+    with CrawlState(path, "quotes") as state:
+        assert len(await _crawl(state, concurrency=concurrency)) == LAST_PAGE
+        state.checkpoint()
+
+    with CrawlState(path, "quotes") as state:
+        assert await _crawl(state, concurrency=concurrency) == []
+        assert state.not_modified == LAST_PAGE
+
+    with CrawlState(path, "quotes", use_validators=False) as state:
+        assert len(await _crawl(state, concurrency=concurrency)) == LAST_PAGE
+
+
+@pytest.mark.asyncio
+async def test_crawl_state_resume_and_uncheckpointed_pages(tmp_path):
+    path = tmp_path / "state.sqlite3"
+    with CrawlState(path, "quotes") as state:
+        await _crawl(state, max_pages=2)
+        state.checkpoint()
+        assert state.resume_url() == "http://quotes.test/page/3/"
+
+        # 저장(checkpoint) 전에 중단된 페이지는 다음 실행에서 다시 받는다
+        await _crawl(state, start_url=state.resume_url(), max_pages=1)
+
+    with CrawlState(path, "quotes") as state:
+        pages = await _crawl(state, start_url=state.resume_url())
+        assert [p[0].author for p in pages] == [f"author{n}" for n in range(3, 6)]
+        state.checkpoint()
+        assert state.resume_url() is None
+
+
+@pytest.mark.asyncio
+async def test_crawl_state_is_scoped_to_store(tmp_path):
+    def state_args(store: str) -> argparse.Namespace:
+        return argparse.Namespace(
+            state_file=tmp_path / "state.sqlite3",
+            no_state=False,
+            full=False,
+            store=store,
+        )
+
+    with open_state(state_args("file"), crawl_key="quotes") as state:
+        assert len(await _crawl(state)) == LAST_PAGE
+        state.checkpoint()
+
+    # file 실행이 남긴 기록으로 db 실행이 페이지를 건너뛰면 안 됨
+    with open_state(state_args("db"), crawl_key="quotes") as state:
+        assert len(await _crawl(state)) == LAST_PAGE
+        assert state.not_modified == 0
+
+    with open_state(state_args("file"), crawl_key="quotes") as state:
+        assert await _crawl(state) == []
+
+
+def test_resume_requires_stream():
+    with pytest.raises(SystemExit):
+        require_stream_for_resume(argparse.Namespace(resume=True, stream=False))
+    require_stream_for_resume(argparse.Namespace(resume=True, stream=True))
+    require_stream_for_resume(argparse.Namespace(resume=False, stream=False))
+
+
+@pytest.mark.asyncio
+async def test_fetcher_retries_with_retry_after():
+    calls = []
+
+    def flaky(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) < 3:
+            return httpx.Response(503, headers={"Retry-After": "0"})
+        return httpx.Response(200, text="ok")
+
+    async with Fetcher(transport=httpx.MockTransport(flaky)) as fetcher:
+        r = await fetcher.get("http://flaky.test/")
+    assert r.status_code == 200
+    assert fetcher.stats.retries == 2
+    assert fetcher.stats.statuses == {503: 2, 200: 1}
+
+
+@pytest.mark.asyncio
+async def test_fetcher_gives_up_after_retries():
+    def always_429(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(429, headers={"Retry-After": "0"})
+
+    async with Fetcher(retries=2, transport=httpx.MockTransport(always_429)) as fetcher:
+        r = await fetcher.get("http://busy.test/")
+    assert r.status_code == 429
+    assert fetcher.stats.requests == 3
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=100, burst=1)
+    waited = [await bucket.acquire() for _ in range(5)]
+    assert waited[0] == 0
+    assert sum(waited) >= 0.03
+
+
+FIXTURE_PAGE = Path(__file__).parents[1] / "benchmarks/fixtures/quotes_page1.html"
+
+
+def test_lxml_quote_parser_matches_bs4():
+    html = FIXTURE_PAGE.read_text(encoding="utf-8")
+    items, next_url = PAGE_PARSERS["lxml"](html, "https://quotes.test/")
+    assert (items, next_url) == PAGE_PARSERS["bs4"](html, "https://quotes.test/")
+    assert len(items) == 10 and next_url == "https://quotes.test/page/2/"
+    assert PAGE_PARSERS["lxml"]("", "https://quotes.test/") == ([], None)
+
+
+def test_lxml_question_parser_matches_bs4():
+    pytest.importorskip("cssselect")
+    args = (
+        FIXTURE_PAGE.read_text(encoding="utf-8"),
+        "https://quotes.test/",
+        ".quote",
+        "span.text",
+        "li.next > a",
+    )
+    assert HTML_PAGE_PARSERS["lxml"](*args) == HTML_PAGE_PARSERS["bs4"](*args)
+
+
+def _question_api(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/broken":
+        return httpx.Response(404)
+    texts = {"/a": ["질문 1", "질문 2"], "/b": ["질문 2", "질문 3"]}[request.url.path]
+    return httpx.Response(200, json={"data": [{"text": t} for t in texts]})
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_dedupes_across_sources_and_reports(client, tmp_path):
+    manifest = tmp_path / "sources.json"
+    manifest.write_text(
+        json.dumps(
+            {
+                "defaults": {"mode": "json", "list_path": "data", "field": "text"},
+                "sources": [
+                    {"name": "a", "url": "http://api.test/a"},
+                    {"name": "b", "url": "http://api.test/b"},
+                    {"name": "broken", "url": "http://api.test/broken"},
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    specs = load_manifest(manifest)
+    args = argparse.Namespace(
+        store="db", batch_size=10, concurrency=2, no_state=True, resume=False
+    )
+    async with Fetcher(transport=httpx.MockTransport(_question_api)) as fetcher:
+        results = await run_sources(specs, args, fetcher)
+
+    by_name = {r.spec.name: r for r in results}
+    assert by_name["a"].stats.inserted + by_name["b"].stats.inserted == 3
+    # 소스 안에서만 중복 제거, 소스 간 중복(질문 2)은 DB 해시 제약이 거름
+    assert by_name["a"].stats.scraped + by_name["b"].stats.scraped == 4
+    assert by_name["broken"].error and "404" in by_name["broken"].error
+    assert await Question.all().count() == 3
+
+
+async def _slow_second_source(request: httpx.Request) -> httpx.Response:
+    # 먼저 실패할 소스(a)가 같은 질문을 먼저 읽도록 b는 늦게 응답
+    if request.url.path == "/b":
+        await asyncio.sleep(0.05)
+    return _question_api(request)
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_failed_source_does_not_drop_others_items(
+    client, tmp_path, monkeypatch
+):
+    key, to_json, upsert = orchestrator._SINKS["question"]
+    calls = []
+
+    async def fail_first_write(batch):
+        calls.append(len(batch))
+        if len(calls) == 1:
+            raise RuntimeError("db down")
+        return await upsert(batch)
+
+    monkeypatch.setitem(
+        orchestrator._SINKS, "question", (key, to_json, fail_first_write)
+    )
+    manifest = tmp_path / "sources.json"
+    manifest.write_text(
+        json.dumps(
+            {
+                "defaults": {"mode": "json", "list_path": "data", "field": "text"},
+                "sources": [
+                    {"name": "a", "url": "http://api.test/a"},
+                    {"name": "b", "url": "http://api.test/b"},
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    args = argparse.Namespace(
+        store="db", batch_size=10, concurrency=2, no_state=True, resume=False
+    )
+    async with Fetcher(transport=httpx.MockTransport(_slow_second_source)) as fetcher:
+        results = await run_sources(load_manifest(manifest), args, fetcher)
+
+    by_name = {r.spec.name: r for r in results}
+    assert "db down" in by_name["a"].error
+    # a가 저장하지 못한 질문 2도 b의 배치로 저장됨
+    assert by_name["b"].stats.inserted == 2
+    assert sorted(await Question.all().values_list("question_text", flat=True)) == [
+        "질문 2",
+        "질문 3",
+    ]
+
+
+async def test_fetcher_caps_requests_in_flight():
+    active = peak = 0
+
+    async def slow(request: httpx.Request) -> httpx.Response:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return httpx.Response(200, text="ok")
+
+    async with Fetcher(
+        rate=1000, burst=100, max_in_flight=2, transport=httpx.MockTransport(slow)
+    ) as fetcher:
+        await asyncio.gather(*(fetcher.get(f"http://a.test/{i}") for i in range(8)))
+    assert peak == 2
+
+
+def _cursor_feed(request: httpx.Request) -> httpx.Response:
+    cursor = int(request.url.params.get("cursor", "0"))
+    body = {
+        "meta": {"next": str(cursor + 1) if cursor < 2 else None},
+        "items": [
+            {"q": f"질문 {cursor}-{i}", "nested": {"q": "무시"}} for i in range(3)
+        ],
+    }
+    # 청크 경계가 토큰 중간에 걸리도록 잘게 나눠 보냄
+    raw = json.dumps(body, ensure_ascii=False).encode("utf-8")
+    chunks = [raw[i : i + 7] for i in range(0, len(raw), 7)]
+    return httpx.Response(200, stream=_ChunkStream(chunks))
+
+
+class _ChunkStream(httpx.AsyncByteStream):
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+@pytest.mark.asyncio
+async def test_iter_json_field_streams_items_and_follows_cursor():
+    pytest.importorskip("ijson")
+    async with Fetcher(transport=httpx.MockTransport(_cursor_feed)) as fetcher:
+        values = [
+            v
+            async for v in iter_json_field(
+                fetcher,
+                "http://feed.test/questions",
+                "items",
+                "q",
+                next_path="meta.next",
+                cursor_param="cursor",
+            )
+        ]
+    assert values == [f"질문 {c}-{i}" for c in range(3) for i in range(3)]
+    assert fetcher.stats.requests == 3
+
+
+def test_near_duplicate_clusters_ignore_punctuation_and_quotes():
+    texts = {
+        1: "“Be yourself; everyone else is already taken.”",
+        2: "Be yourself - everyone else is already taken",
+        3: "be  yourself, everyone else is already taken!",
+        4: "A day without sunshine is like, you know, night.",
+    }
+    sigs = [minhash(t) for t in texts.values()]
+    assert cluster(list(texts), sigs, threshold=0.8) == [[1, 2, 3]]
+
+
+@pytest.mark.asyncio
+async def test_near_dup_filter_checks_existing_rows_and_batch(client):
+    await Question.create(question_text="오늘 나를 가장 웃게 만든 일은 무엇인가요?")
+    async with open_near_dup_filter("question", 0.8) as near:
+        items = [
+            QuestionItem("오늘 나를 가장 웃게 만든 일은, 무엇인가요"),
+            QuestionItem("요즘 가장 자주 떠올리는 사람은 누구인가요?"),
+            QuestionItem("요즘 가장 자주 떠올리는 사람은 누구인가요!!"),
+        ]
+        kept = await near.filter(items, lambda it: it.question_text)
+    assert kept == [items[1]]
+    assert near.dropped == 2